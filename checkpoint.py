@@ -0,0 +1,276 @@
+"""
+Checkpoint module for OBS Utils
+Persistent journal that lets interrupted bulk downloads resume
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHECKPOINT_FILE = ".obs_download_checkpoint.jsonl"
+
+# Persist the listing marker after this many keys complete in order
+MARKER_INTERVAL = 1000
+
+
+class DownloadCheckpoint:
+    """
+    Append-only JSON-lines journal of completed download work
+
+    The journal records:
+      * the job (bucket and prefix) it belongs to
+      * a listing marker: every key up to and including it has completed
+      * completed keys past the marker (workers finish out of order)
+      * failed keys, which the marker moves past like completed ones
+      * completed byte ranges of large objects still in progress
+
+    On resume the listing restarts from the marker and the completed keys
+    after it are skipped; failed keys are retried separately, so one
+    failure does not hold the marker (and the listed keys kept in memory
+    behind it) for the rest of the run. The journal is compacted each time
+    it is loaded.
+    """
+
+    def __init__(self, path: str, bucket: str, prefix: str = "", resume: bool = False):
+        """
+        Open (and optionally replay) a checkpoint journal
+
+        Args:
+            path: Journal file path
+            bucket: Bucket the job downloads from
+            prefix: Object prefix of the job
+            resume: Replay an existing journal instead of starting over
+        """
+        self.path = path
+        self.bucket = bucket
+        self.prefix = prefix
+        self.marker: Optional[str] = None
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+        self._failed: Set[str] = set()
+        self._ranges: Dict[str, Dict] = {}
+        self._listed: deque = deque()
+        self._since_marker = 0
+
+        if resume and os.path.exists(path):
+            self._load()
+
+        self._rewrite()
+
+    def _load(self) -> None:
+        """Replay the journal from disk"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line is expected after a crash
+                    logger.warning(f"Ignoring unreadable checkpoint entry at line {line_number}")
+                    continue
+                self._replay(entry)
+
+        if self.marker is not None:
+            self._done = {key for key in self._done if key > self.marker}
+        # Failed keys past the marker are listed, and so retried, again
+        self._failed = {key for key in self._failed if self.marker is not None and key <= self.marker}
+
+        logger.info(
+            f"Resuming from checkpoint {self.path}: marker={self.marker!r}, {len(self._done)} keys past marker, "
+            f"{len(self._failed)} failed keys to retry"
+        )
+
+    def _replay(self, entry: Dict) -> None:
+        """Apply one journal entry"""
+        kind = entry.get("type")
+        if kind == "job":
+            if entry.get("bucket") != self.bucket or entry.get("prefix") != self.prefix:
+                raise ValueError(
+                    f"Checkpoint {self.path} belongs to bucket '{entry.get('bucket')}' "
+                    f"prefix '{entry.get('prefix')}', not '{self.bucket}' prefix '{self.prefix}'"
+                )
+        elif kind == "marker":
+            self.marker = entry["marker"]
+        elif kind == "done":
+            self._done.add(entry["key"])
+            self._failed.discard(entry["key"])
+            self._ranges.pop(entry["key"], None)
+        elif kind == "failed":
+            self._failed.add(entry["key"])
+        elif kind == "range":
+            self._add_range(entry["key"], entry["etag"], entry["size"], entry["start"], entry["end"])
+
+    def _add_range(self, key: str, etag: str, size: int, start: int, end: int) -> None:
+        """Record a completed range, dropping ranges of an older version of the object"""
+        state = self._ranges.get(key)
+        if not state or state["etag"] != etag or state["size"] != size:
+            state = {"etag": etag, "size": size, "ranges": set()}
+            self._ranges[key] = state
+        state["ranges"].add((start, end))
+
+    def _rewrite(self) -> None:
+        """Write a compacted journal and reopen it for appending"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "job", "bucket": self.bucket, "prefix": self.prefix}) + "\n")
+            if self.marker is not None:
+                f.write(json.dumps({"type": "marker", "marker": self.marker}) + "\n")
+            for key in sorted(self._done):
+                f.write(json.dumps({"type": "done", "key": key}) + "\n")
+            for key in sorted(self._failed):
+                f.write(json.dumps({"type": "failed", "key": key}) + "\n")
+            for key, state in self._ranges.items():
+                for start, end in sorted(state["ranges"]):
+                    f.write(json.dumps(self._range_entry(key, state["etag"], state["size"], start, end)) + "\n")
+        os.replace(temp_path, self.path)
+
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _range_entry(key: str, etag: str, size: int, start: int, end: int) -> Dict:
+        return {"type": "range", "key": key, "etag": etag, "size": size, "start": start, "end": end}
+
+    def _append(self, entry: Dict) -> None:
+        """Append one entry; caller holds the lock"""
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def listed(self, key: str) -> None:
+        """Record that the listing produced ``key`` (call in listing order)"""
+        with self._lock:
+            self._listed.append(key)
+            self._advance_marker()
+
+    def is_done(self, key: str) -> bool:
+        """Check whether ``key`` already completed in a previous or current run"""
+        with self._lock:
+            if key in self._failed:
+                return False
+            return key in self._done or (self.marker is not None and key <= self.marker)
+
+    def failed_keys(self) -> List[str]:
+        """Keys that failed in a previous or the current run, to retry on resume"""
+        with self._lock:
+            return sorted(self._failed)
+
+    def mark_failed(self, key: str) -> None:
+        """Record that ``key`` failed, letting the marker move past it"""
+        with self._lock:
+            if key in self._failed:
+                return
+            self._failed.add(key)
+            self._append({"type": "failed", "key": key})
+            self._advance_marker()
+
+    def mark_done(self, key: str) -> None:
+        """Record that ``key`` was downloaded completely"""
+        with self._lock:
+            # A failed key retried by a resumed run
+            self._failed.discard(key)
+            if key in self._done:
+                return
+            self._done.add(key)
+            self._ranges.pop(key, None)
+            self._append({"type": "done", "key": key})
+            self._advance_marker()
+
+    def completed_ranges(self, key: str, etag: str, size: int) -> Set[Tuple[int, int]]:
+        """
+        Get byte ranges of ``key`` completed by a previous run
+
+        Args:
+            key: Object key
+            etag: Current object ETag
+            size: Current object size
+
+        Returns:
+            Set of inclusive (start, end) ranges, empty if the object changed
+        """
+        with self._lock:
+            state = self._ranges.get(key)
+            if not state or state["etag"] != etag or state["size"] != size:
+                return set()
+            return set(state["ranges"])
+
+    def mark_range(self, key: str, etag: str, size: int, start: int, end: int) -> None:
+        """Record that one byte range of a large object was written to disk"""
+        with self._lock:
+            self._add_range(key, etag, size, start, end)
+            self._append(self._range_entry(key, etag, size, start, end))
+
+    def _advance_marker(self) -> None:
+        """Move the marker past the completed head of the listing; caller holds the lock"""
+        advanced = False
+        while self._listed and (self._listed[0] in self._done or self._listed[0] in self._failed):
+            key = self._listed.popleft()
+            self._done.discard(key)
+            self.marker = key
+            self._since_marker += 1
+            advanced = True
+
+        if advanced and self._since_marker >= MARKER_INTERVAL:
+            self._append({"type": "marker", "marker": self.marker})
+            self._since_marker = 0
+
+    def close(self, completed: bool = False) -> None:
+        """
+        Close the journal
+
+        Args:
+            completed: Remove the journal because the job finished without failures
+        """
+        with self._lock:
+            if self.marker is not None:
+                self._append({"type": "marker", "marker": self.marker})
+            self._file.close()
+
+        if completed:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove checkpoint {self.path}: {e}")
+
+    def pending_ranges(self, key: str, etag: str, size: int, part_size: int) -> List[Tuple[int, int]]:
+        """
+        Split an object into parts, leaving out parts already completed
+
+        Args:
+            key: Object key
+            etag: Object ETag
+            size: Object size in bytes
+            part_size: Part size in bytes
+
+        Returns:
+            List of inclusive (start, end) ranges still to download
+        """
+        completed = self.completed_ranges(key, etag, size)
+        return [
+            (start, min(start + part_size, size) - 1)
+            for start in range(0, size, part_size)
+            if (start, min(start + part_size, size) - 1) not in completed
+        ]
@@ -0,0 +1,648 @@
+"""
+Concurrency helpers for OBS Utils
+Bounded worker pools shared by the bulk operations
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import heapq
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+_SENTINEL = object()
+
+
+class TaskStats:
+    """Thread-safe counters for bulk operations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def record(self, result: Optional[bool]) -> None:
+        """
+        Record the outcome of one task
+
+        Args:
+            result: True for success, False for failure, None for skipped
+        """
+        with self._lock:
+            self.processed += 1
+            if result is None:
+                self.skipped += 1
+            elif result:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def add(self, succeeded: int = 0, failed: int = 0, skipped: int = 0) -> None:
+        """Record several outcomes at once (e.g. the keys of one batch request)"""
+        with self._lock:
+            self.processed += succeeded + failed + skipped
+            self.succeeded += succeeded
+            self.failed += failed
+            self.skipped += skipped
+
+    def __repr__(self) -> str:
+        return (
+            f"TaskStats(processed={self.processed}, succeeded={self.succeeded}, "
+            f"failed={self.failed}, skipped={self.skipped})"
+        )
+
+
+def _run_task(worker: Callable[[Any], Optional[bool]], item: Any, stats: TaskStats) -> None:
+    """Run a single task and record its outcome"""
+    try:
+        result = worker(item)
+    except Exception as e:
+        logger.error(f"Unhandled error in worker for {item!r}: {e}")
+        result = False
+    stats.record(result)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Group items into lists of at most ``size`` as they arrive
+
+    Args:
+        items: Iterable of items
+        size: Maximum batch size
+
+    Yields:
+        Lists of items
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_worker_pool(
+    items: Iterable[Any],
+    worker: Callable[[Any], Optional[bool]],
+    workers: int = 1,
+    queue_size: Optional[int] = None,
+    stats: Optional[TaskStats] = None,
+) -> TaskStats:
+    """
+    Process items with a pool of worker threads fed through a bounded queue
+
+    The calling thread consumes ``items`` (typically a paginated listing) and
+    feeds a bounded queue, so listing and processing overlap while memory stays
+    constant. With ``workers <= 1`` items are processed inline.
+
+    Args:
+        items: Iterable of work items
+        worker: Callable returning True (success), False (failure) or None (skipped)
+        workers: Number of worker threads
+        queue_size: Maximum queued items (default: workers * 4)
+        stats: Existing counters to update (optional)
+
+    Returns:
+        Aggregated task counters
+    """
+    if stats is None:
+        stats = TaskStats()
+
+    if workers <= 1:
+        for item in items:
+            _run_task(worker, item, stats)
+        return stats
+
+    work_queue: queue.Queue = queue.Queue(maxsize=queue_size or workers * 4)
+    cancelled = threading.Event()
+
+    def consume():
+        while True:
+            item = work_queue.get()
+            try:
+                if item is _SENTINEL:
+                    return
+                if not cancelled.is_set():
+                    _run_task(worker, item, stats)
+            finally:
+                work_queue.task_done()
+
+    threads = [threading.Thread(target=consume, name=f"obs-worker-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for item in items:
+            work_queue.put(item)
+    except BaseException:
+        # Drop queued work so an interrupted run stops promptly
+        cancelled.set()
+        raise
+    finally:
+        for _ in threads:
+            work_queue.put(_SENTINEL)
+        for thread in threads:
+            thread.join()
+
+    return stats
+
+
+class _SourceFailure:
+    """Exception raised by a source, carried through a queue to the consumer"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _put_until_stopped(target: queue.Queue, entry: Any, stopped: threading.Event) -> bool:
+    """Put ``entry`` on a bounded queue, giving up once ``stopped`` is set"""
+    while not stopped.is_set():
+        try:
+            target.put(entry, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def merge_concurrent(
+    sources: Iterable[Tuple[str, Callable[[], Iterable[Any]]]],
+    workers: int = 4,
+    queue_size: Optional[int] = None,
+    errors: Optional[Dict[str, Exception]] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterate several sources concurrently and merge their items into one stream
+
+    Each source is a ``(name, factory)`` pair; ``factory()`` returns the
+    iterable to consume (typically a paginated listing). At most ``workers``
+    sources are consumed at a time. Items are yielded in arrival order as
+    ``(name, item)``. A source that raises stops on its own and its exception
+    is stored in ``errors`` under its name, so one failing source does not end
+    the others. Closing the generator early stops the producers.
+
+    Args:
+        sources: ``(name, factory)`` pairs
+        workers: Number of sources consumed concurrently
+        queue_size: Maximum buffered items (default: workers * 256)
+        errors: Dictionary receiving the exception of each failed source
+
+    Yields:
+        ``(name, item)`` tuples
+    """
+    if errors is None:
+        errors = {}
+
+    pending: queue.Queue = queue.Queue()
+    for source in sources:
+        pending.put(source)
+    if pending.empty():
+        return
+    workers = max(1, min(workers, pending.qsize()))
+
+    results: queue.Queue = queue.Queue(maxsize=queue_size or workers * 256)
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            while not stopped.is_set():
+                try:
+                    name, factory = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    for item in factory():
+                        if not _put_until_stopped(results, (name, item), stopped):
+                            return
+                except Exception as e:
+                    logger.error(f"Error in source {name}: {e}")
+                    errors[name] = e
+        finally:
+            _put_until_stopped(results, _SENTINEL, stopped)
+
+    threads = [threading.Thread(target=produce, name=f"obs-source-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    finished = 0
+    try:
+        while finished < len(threads):
+            entry = results.get()
+            if entry is _SENTINEL:
+                finished += 1
+                continue
+            yield entry
+    finally:
+        stopped.set()
+        for thread in threads:
+            thread.join()
+
+
+def prefetch_ordered(
+    sources: Iterable[Callable[[], Iterable[Any]]],
+    workers: int = 4,
+    queue_size: int = 1024,
+) -> Iterator[Any]:
+    """
+    Iterate several sources concurrently but yield them one after another
+
+    Up to ``workers`` sources run ahead of the consumer, each buffering into
+    its own bounded queue, while items are yielded source by source in the
+    given order. Concatenating sources that cover ordered, disjoint key
+    ranges therefore stays sorted. An exception raised by a source is raised
+    to the consumer when that source is reached.
+
+    Args:
+        sources: Factories returning the iterables to consume, in output order
+        workers: Number of sources consumed concurrently
+        queue_size: Maximum buffered items per source
+
+    Yields:
+        Items of every source, in source order
+    """
+    sources = list(sources)
+    stopped = threading.Event()
+    buffers: List[queue.Queue] = []
+    threads: List[threading.Thread] = []
+
+    def produce(factory: Callable[[], Iterable[Any]], buffer: queue.Queue):
+        try:
+            for item in factory():
+                if not _put_until_stopped(buffer, item, stopped):
+                    return
+        except Exception as e:
+            _put_until_stopped(buffer, _SourceFailure(e), stopped)
+            return
+        _put_until_stopped(buffer, _SENTINEL, stopped)
+
+    def start_next():
+        if len(buffers) < len(sources):
+            buffer: queue.Queue = queue.Queue(maxsize=queue_size)
+            thread = threading.Thread(
+                target=produce, args=(sources[len(buffers)], buffer), name=f"obs-source-{len(buffers)}", daemon=True
+            )
+            buffers.append(buffer)
+            threads.append(thread)
+            thread.start()
+
+    try:
+        for _ in range(max(1, workers)):
+            start_next()
+
+        for index in range(len(sources)):
+            buffer = buffers[index]
+            while True:
+                item = buffer.get()
+                if item is _SENTINEL:
+                    break
+                if isinstance(item, _SourceFailure):
+                    raise item.error
+                yield item
+            start_next()
+    finally:
+        stopped.set()
+        for thread in threads:
+            thread.join()
+
+
+class RateLimiter:
+    """Token bucket limiting the request rate across threads"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Requests per second
+            burst: Maximum requests issued back to back (default: one second of requests)
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_bucket_limiters: Dict[str, RateLimiter] = {}
+_bucket_limiters_lock = threading.Lock()
+
+
+def bucket_rate_limiter(bucket: str, rate: Optional[float]) -> Optional[RateLimiter]:
+    """
+    Get the rate limiter shared by every operation on a bucket
+
+    Args:
+        bucket: Bucket name
+        rate: Requests per second; None or 0 disables limiting
+
+    Returns:
+        Shared limiter for the bucket, or None when unlimited
+    """
+    if not rate:
+        return None
+
+    with _bucket_limiters_lock:
+        limiter = _bucket_limiters.get(bucket)
+        if limiter is None or limiter.rate != rate:
+            limiter = RateLimiter(rate)
+            _bucket_limiters[bucket] = limiter
+        return limiter
+
+
+class PollSchedule:
+    """
+    Per-item backoff schedule for status polling
+
+    Each item is checked again after its own interval, doubled after every
+    check that finds it unchanged up to ``max_interval``. reset() brings the
+    remaining items back to the base interval.
+    """
+
+    def __init__(self, items: Iterable[Any], interval: float, max_interval: float):
+        """
+        Schedule the first check of every item one interval from now
+
+        Args:
+            items: Items to poll
+            interval: Initial seconds between checks of one item
+            max_interval: Maximum seconds between checks of one item
+        """
+        self.interval = interval
+        self.max_interval = max_interval
+        now = time.monotonic()
+        # (next check time, sequence, current interval, item); the sequence keeps items out of comparisons
+        self._heap: List[Tuple[float, int, float, Any]] = [(now + interval, i, interval, item) for i, item in enumerate(items)]
+        heapq.heapify(self._heap)
+        self._sequence = len(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def wait(self, deadline: float) -> bool:
+        """
+        Sleep until a check is due
+
+        Args:
+            deadline: time.monotonic() value to stop waiting at
+
+        Returns:
+            True if a check is due, False if the deadline passed first
+        """
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+            wait = self._heap[0][0] - now
+            if wait <= 0:
+                return True
+            time.sleep(min(wait, deadline - now))
+
+    def due(self) -> List[Tuple[float, Any]]:
+        """Remove and return the (interval, item) pairs whose check is due"""
+        due = []
+        while self._heap and self._heap[0][0] <= time.monotonic():
+            _, _, interval, item = heapq.heappop(self._heap)
+            due.append((interval, item))
+        return due
+
+    def reschedule(self, interval: float, item: Any, backoff: bool = True) -> None:
+        """Schedule the next check of an item, doubling its interval unless ``backoff`` is False"""
+        interval = min(interval * 2, self.max_interval) if backoff else self.interval
+        self._sequence += 1
+        heapq.heappush(self._heap, (time.monotonic() + interval, self._sequence, interval, item))
+
+    def reset(self) -> None:
+        """Check every remaining item again after the base interval"""
+        now = time.monotonic()
+        self._heap = [(now + self.interval, sequence, self.interval, item) for _, sequence, _, item in self._heap]
+        heapq.heapify(self._heap)
+
+    def items(self) -> List[Any]:
+        """Items still scheduled"""
+        return [item for _, _, _, item in self._heap]
+
+
+# Responses telling the client to slow down
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_ERROR_CODES = ("SlowDown", "TooManyRequests")
+
+
+def is_throttled(resp: Any) -> bool:
+    """Whether an SDK response is a throttling response (429/503 or a SlowDown error code)"""
+    return getattr(resp, "status", None) in THROTTLE_STATUSES or getattr(resp, "errorCode", None) in THROTTLE_ERROR_CODES
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on the requests in flight, shared across threads
+
+    Every healthy response raises the limit by ``increase / limit``, about
+    one more request per round of ``limit`` responses, while the recent
+    error rate and the average latency stay within bounds. A throttling
+    response multiplies the limit by ``decrease``; throttles from requests
+    sent before the last cut belong to the same congestion event and are
+    not cut again. Other errors and slow responses hold the limit.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 64,
+        latency_target: Optional[float] = None,
+        max_error_rate: float = 0.05,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        window: int = 100,
+        history: int = 50,
+    ):
+        """
+        Initialize the controller
+
+        Args:
+            initial: Starting limit
+            minimum: Lowest limit
+            maximum: Highest limit
+            latency_target: Average latency in seconds above which the limit stops growing (optional)
+            max_error_rate: Share of failed recent requests above which the limit stops growing
+            increase: Additive increase per round of ``limit`` healthy responses
+            decrease: Multiplicative decrease on throttling (0 < decrease < 1)
+            window: Number of recent requests the error rate is computed over
+            history: Number of limit changes kept in ``decisions``
+        """
+        if not 1 <= minimum <= maximum:
+            raise ValueError("Concurrency limits must satisfy 1 <= minimum <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("Decrease factor must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency: Optional[float] = None
+        self.throttled = 0
+        self.decisions: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._errors: Deque[bool] = deque(maxlen=window)
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently in flight"""
+        return self._in_flight
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed requests among the recent ones"""
+        return sum(self._errors) / len(self._errors) if self._errors else 0.0
+
+    def _healthy(self) -> bool:
+        if self.error_rate > self.max_error_rate:
+            return False
+        return self.latency_target is None or self.latency is None or self.latency <= self.latency_target
+
+    def _decide(self, action: str, before: int, reason: str) -> None:
+        """Record a change of the integer limit"""
+        self.decisions.append(
+            {
+                "time": time.time(),
+                "action": action,
+                "from": before,
+                "to": self.limit,
+                "reason": reason,
+                "latency": self.latency,
+                "error_rate": self.error_rate,
+            }
+        )
+        if action == "decrease":
+            logger.warning(f"Concurrency limit {before} -> {self.limit} ({reason})")
+        else:
+            logger.debug(f"Concurrency limit {before} -> {self.limit} ({reason})")
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent
+
+        Returns:
+            Start time to pass to release
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            return time.monotonic()
+
+    def release(self, started: float, throttled: bool = False, failed: bool = False) -> None:
+        """
+        Record the outcome of a request and adjust the limit
+
+        Args:
+            started: Value returned by acquire
+            throttled: The response asked the client to slow down
+            failed: The request failed for another reason (5xx or exception)
+        """
+        now = time.monotonic()
+        with self._condition:
+            self._in_flight -= 1
+            latency = now - started
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self._errors.append(throttled or failed)
+            before = self.limit
+
+            if throttled:
+                self.throttled += 1
+                if started > self._last_decrease:
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+                    self._last_decrease = now
+                    self._decide("decrease", before, "throttled")
+            elif not failed and self._healthy():
+                self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+                if self.limit != before:
+                    self._decide("increase", before, "healthy")
+
+            self._condition.notify_all()
+
+    def call(self, request: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Send one SDK request within the limit
+
+        Args:
+            request: SDK method
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The SDK response
+        """
+        started = self.acquire()
+        throttled = False
+        failed = True
+        try:
+            resp = request(*args, **kwargs)
+            status = getattr(resp, "status", None)
+            throttled = is_throttled(resp)
+            failed = not throttled and isinstance(status, int) and status >= 500
+            return resp
+        finally:
+            self.release(started, throttled, failed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state and recent decisions, for inspection"""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "minimum": self.minimum,
+                "maximum": self.maximum,
+                "latency": self.latency,
+                "error_rate": self.error_rate,
+                "throttled": self.throttled,
+                "decisions": list(self.decisions),
+            }
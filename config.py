@@ -29,6 +29,14 @@ from typing import Dict, Optional
 logger = logging.getLogger(__name__)
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean environment variable (1/true/yes/on)"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Config:
     """Configuration manager for OBS Utils with security features"""
 
@@ -129,6 +137,58 @@ class Config:
                 "max_keys": int(os.getenv("OBS_MAX_KEYS", config.get("max_keys", 1000))),
                 "restore_days": int(os.getenv("OBS_RESTORE_DAYS", config.get("restore_days", 30))),
                 "restore_tier": os.getenv("OBS_RESTORE_TIER", config.get("restore_tier", "Expedited")),
+                "download_workers": int(os.getenv("OBS_DOWNLOAD_WORKERS", config.get("download_workers", 1))),
+                "download_part_workers": int(os.getenv("OBS_DOWNLOAD_PART_WORKERS", config.get("download_part_workers", 4))),
+                "download_part_size": int(os.getenv("OBS_DOWNLOAD_PART_SIZE", config.get("download_part_size", 16777216))),
+                "multipart_download_threshold": int(
+                    os.getenv("OBS_MULTIPART_DOWNLOAD_THRESHOLD", config.get("multipart_download_threshold", 67108864))
+                ),
+                "transition_workers": int(os.getenv("OBS_TRANSITION_WORKERS", config.get("transition_workers", 1))),
+                "max_requests_per_second": float(
+                    os.getenv("OBS_MAX_REQUESTS_PER_SECOND", config.get("max_requests_per_second", 0))
+                ),
+                "delete_workers": int(os.getenv("OBS_DELETE_WORKERS", config.get("delete_workers", 4))),
+                "index_path": os.getenv("OBS_INDEX_PATH", config.get("index_path", "obs_index.sqlite3")),
+                "search_workers": int(os.getenv("OBS_SEARCH_WORKERS", config.get("search_workers", 4))),
+                "list_workers": int(os.getenv("OBS_LIST_WORKERS", config.get("list_workers", 1))),
+                "restore_poll_interval": float(
+                    os.getenv("OBS_RESTORE_POLL_INTERVAL", config.get("restore_poll_interval", 30))
+                ),
+                "restore_max_poll_interval": float(
+                    os.getenv("OBS_RESTORE_MAX_POLL_INTERVAL", config.get("restore_max_poll_interval", 600))
+                ),
+                "restore_max_wait": float(os.getenv("OBS_RESTORE_MAX_WAIT", config.get("restore_max_wait", 86400))),
+                "upload_workers": int(os.getenv("OBS_UPLOAD_WORKERS", config.get("upload_workers", 4))),
+                "upload_part_workers": int(os.getenv("OBS_UPLOAD_PART_WORKERS", config.get("upload_part_workers", 4))),
+                "upload_part_size": int(os.getenv("OBS_UPLOAD_PART_SIZE", config.get("upload_part_size", 16777216))),
+                "multipart_upload_threshold": int(
+                    os.getenv("OBS_MULTIPART_UPLOAD_THRESHOLD", config.get("multipart_upload_threshold", 67108864))
+                ),
+                "copy_workers": int(os.getenv("OBS_COPY_WORKERS", config.get("copy_workers", 8))),
+                "copy_part_size": int(os.getenv("OBS_COPY_PART_SIZE", config.get("copy_part_size", 134217728))),
+                "multipart_copy_threshold": int(
+                    os.getenv("OBS_MULTIPART_COPY_THRESHOLD", config.get("multipart_copy_threshold", 1073741824))
+                ),
+                "report_prefix_depth": int(os.getenv("OBS_REPORT_PREFIX_DEPTH", config.get("report_prefix_depth", 1))),
+                "async_concurrency": int(os.getenv("OBS_ASYNC_CONCURRENCY", config.get("async_concurrency", 32))),
+                "adaptive_initial_concurrency": int(
+                    os.getenv("OBS_ADAPTIVE_INITIAL_CONCURRENCY", config.get("adaptive_initial_concurrency", 8))
+                ),
+                "adaptive_max_concurrency": int(
+                    os.getenv("OBS_ADAPTIVE_MAX_CONCURRENCY", config.get("adaptive_max_concurrency", 64))
+                ),
+                "adaptive_latency_target": float(
+                    os.getenv("OBS_ADAPTIVE_LATENCY_TARGET", config.get("adaptive_latency_target", 0))
+                ),
+                "retry_max_attempts": int(os.getenv("OBS_RETRY_MAX_ATTEMPTS", config.get("retry_max_attempts", 5))),
+                "retry_base_delay": float(os.getenv("OBS_RETRY_BASE_DELAY", config.get("retry_base_delay", 0.2))),
+                "retry_max_delay": float(os.getenv("OBS_RETRY_MAX_DELAY", config.get("retry_max_delay", 20))),
+                "retry_max_elapsed": float(os.getenv("OBS_RETRY_MAX_ELAPSED", config.get("retry_max_elapsed", 120))),
+                "connection_pool_size": int(os.getenv("OBS_CONNECTION_POOL_SIZE", config.get("connection_pool_size", 64))),
+                "keep_alive": _env_flag("OBS_KEEP_ALIVE", config.get("keep_alive", True)),
+                "socket_timeout": int(os.getenv("OBS_SOCKET_TIMEOUT", config.get("socket_timeout", 60))),
+                "socket_chunk_size": int(os.getenv("OBS_SOCKET_CHUNK_SIZE", config.get("socket_chunk_size", 262144))),
+                "sdk_max_retry_count": int(os.getenv("OBS_SDK_MAX_RETRY_COUNT", config.get("sdk_max_retry_count", 3))),
             }
         )
         return config
@@ -143,12 +203,72 @@ class Config:
             "max_keys": int(os.getenv("OBS_MAX_KEYS", 1000)),
             "restore_days": int(os.getenv("OBS_RESTORE_DAYS", 30)),
             "restore_tier": os.getenv("OBS_RESTORE_TIER", "Expedited"),
+            "download_workers": int(os.getenv("OBS_DOWNLOAD_WORKERS", 1)),
+            "download_part_workers": int(os.getenv("OBS_DOWNLOAD_PART_WORKERS", 4)),
+            "download_part_size": int(os.getenv("OBS_DOWNLOAD_PART_SIZE", 16777216)),
+            "multipart_download_threshold": int(os.getenv("OBS_MULTIPART_DOWNLOAD_THRESHOLD", 67108864)),
+            "transition_workers": int(os.getenv("OBS_TRANSITION_WORKERS", 1)),
+            "max_requests_per_second": float(os.getenv("OBS_MAX_REQUESTS_PER_SECOND", 0)),
+            "delete_workers": int(os.getenv("OBS_DELETE_WORKERS", 4)),
+            "index_path": os.getenv("OBS_INDEX_PATH", "obs_index.sqlite3"),
+            "search_workers": int(os.getenv("OBS_SEARCH_WORKERS", 4)),
+            "list_workers": int(os.getenv("OBS_LIST_WORKERS", 1)),
+            "restore_poll_interval": float(os.getenv("OBS_RESTORE_POLL_INTERVAL", 30)),
+            "restore_max_poll_interval": float(os.getenv("OBS_RESTORE_MAX_POLL_INTERVAL", 600)),
+            "restore_max_wait": float(os.getenv("OBS_RESTORE_MAX_WAIT", 86400)),
+            "upload_workers": int(os.getenv("OBS_UPLOAD_WORKERS", 4)),
+            "upload_part_workers": int(os.getenv("OBS_UPLOAD_PART_WORKERS", 4)),
+            "upload_part_size": int(os.getenv("OBS_UPLOAD_PART_SIZE", 16777216)),
+            "multipart_upload_threshold": int(os.getenv("OBS_MULTIPART_UPLOAD_THRESHOLD", 67108864)),
+            "copy_workers": int(os.getenv("OBS_COPY_WORKERS", 8)),
+            "copy_part_size": int(os.getenv("OBS_COPY_PART_SIZE", 134217728)),
+            "multipart_copy_threshold": int(os.getenv("OBS_MULTIPART_COPY_THRESHOLD", 1073741824)),
+            "report_prefix_depth": int(os.getenv("OBS_REPORT_PREFIX_DEPTH", 1)),
+            "async_concurrency": int(os.getenv("OBS_ASYNC_CONCURRENCY", 32)),
+            "adaptive_initial_concurrency": int(os.getenv("OBS_ADAPTIVE_INITIAL_CONCURRENCY", 8)),
+            "adaptive_max_concurrency": int(os.getenv("OBS_ADAPTIVE_MAX_CONCURRENCY", 64)),
+            "adaptive_latency_target": float(os.getenv("OBS_ADAPTIVE_LATENCY_TARGET", 0)),
+            "retry_max_attempts": int(os.getenv("OBS_RETRY_MAX_ATTEMPTS", 5)),
+            "retry_base_delay": float(os.getenv("OBS_RETRY_BASE_DELAY", 0.2)),
+            "retry_max_delay": float(os.getenv("OBS_RETRY_MAX_DELAY", 20)),
+            "retry_max_elapsed": float(os.getenv("OBS_RETRY_MAX_ELAPSED", 120)),
+            "connection_pool_size": int(os.getenv("OBS_CONNECTION_POOL_SIZE", 64)),
+            "keep_alive": _env_flag("OBS_KEEP_ALIVE", True),
+            "socket_timeout": int(os.getenv("OBS_SOCKET_TIMEOUT", 60)),
+            "socket_chunk_size": int(os.getenv("OBS_SOCKET_CHUNK_SIZE", 262144)),
+            "sdk_max_retry_count": int(os.getenv("OBS_SDK_MAX_RETRY_COUNT", 3)),
         }
 
     def get(self, key: str, default=None):
         """Get configuration value"""
         return self.config.get(key, default)
 
+    def client_options(self) -> Dict:
+        """
+        Connection keyword arguments for ObsClient
+
+        Without keep-alive the SDK sends ``Connection: close`` and every
+        request pays a new TCP and TLS handshake. The pool should be at least
+        as large as the number of requests in flight (worker threads, async
+        concurrency) or threads queue for a connection; 0 disables pooling.
+        ``sdk_max_retry_count`` only applies without application-level
+        retries: OBSManager sets it to 0 while its retry policy retries, and
+        SecureOBSManager has no retry policy.
+
+        Returns:
+            Keyword arguments for ObsClient
+        """
+        options = {
+            "long_conn_mode": bool(self.config.get("keep_alive", True)),
+            "timeout": self.config.get("socket_timeout", 60),
+            "chunk_size": self.config.get("socket_chunk_size", 262144),
+            "max_retry_count": self.config.get("sdk_max_retry_count", 3),
+        }
+        pool_size = self.config.get("connection_pool_size", 64)
+        if pool_size > 0:
+            options.update({"use_http_conns": True, "pool_size": pool_size})
+        return options
+
     def validate_credentials(self) -> bool:
         """Validate that required credentials are present"""
         required_fields = ["access_key_id", "secret_access_key", "server"]
@@ -167,6 +287,41 @@ class Config:
             "max_keys": 1000,
             "restore_days": 30,
             "restore_tier": "Expedited",
+            "download_workers": 1,
+            "download_part_workers": 4,
+            "download_part_size": 16777216,
+            "multipart_download_threshold": 67108864,
+            "transition_workers": 1,
+            "max_requests_per_second": 0,
+            "delete_workers": 4,
+            "index_path": "obs_index.sqlite3",
+            "search_workers": 4,
+            "list_workers": 1,
+            "restore_poll_interval": 30,
+            "restore_max_poll_interval": 600,
+            "restore_max_wait": 86400,
+            "upload_workers": 4,
+            "upload_part_workers": 4,
+            "upload_part_size": 16777216,
+            "multipart_upload_threshold": 67108864,
+            "copy_workers": 8,
+            "copy_part_size": 134217728,
+            "multipart_copy_threshold": 1073741824,
+            "report_prefix_depth": 1,
+            "async_concurrency": 32,
+            "adaptive_initial_concurrency": 8,
+            "adaptive_max_concurrency": 64,
+            "adaptive_latency_target": 0,
+            "retry_max_attempts": 5,
+            "retry_base_delay": 0.2,
+            "retry_max_delay": 20,
+            "retry_max_elapsed": 120,
+            "connection_pool_size": 64,
+            "keep_alive": True,
+            "socket_timeout": 60,
+            "socket_chunk_size": 262144,
+            "sdk_max_retry_count": 3,
+            "lifecycle_rules": [],
         }
 
         sample_file = f"{self.config_file}.sample"
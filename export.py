@@ -0,0 +1,153 @@
+"""
+Export module for OBS Utils
+Columnar export of listings to Parquet, Arrow IPC and gzipped CSV files
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import csv
+import gzip
+from typing import Any, List, Optional, Sequence
+
+from obs_metadata import LAST_MODIFIED_FORMAT
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    # Only needed for the parquet and arrow formats
+    pa = None
+
+EXPORT_FORMATS = ("parquet", "arrow", "csv.gz")
+EXPORT_COLUMNS = ["key", "size", "last_modified", "etag", "storage_class", "owner"]
+
+
+def export_format_for(path: str) -> Optional[str]:
+    """Export format implied by a file name, or None"""
+    for export_format in EXPORT_FORMATS:
+        if path.endswith(f".{export_format}"):
+            return export_format
+    return None
+
+
+def _owner_name(content: Any) -> Optional[str]:
+    owner = getattr(content, "owner", None)
+    return getattr(owner, "owner_name", None) if owner else None
+
+
+class ListingExporter:
+    """
+    Write listing pages to a file as they arrive
+
+    Each page becomes one record batch (Parquet row group, Arrow IPC batch
+    or a block of CSV rows), built column by column from the SDK objects,
+    so memory is bound by the page size rather than the listing size.
+    ``last_modified`` is stored as a timestamp in the columnar formats.
+    """
+
+    def __init__(self, path: str, export_format: Optional[str] = None):
+        """
+        Open the export file
+
+        Args:
+            path: Output file
+            export_format: parquet, arrow or csv.gz (default: from the file extension)
+        """
+        export_format = export_format or export_format_for(path)
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format for {path}. Use one of {', '.join(EXPORT_FORMATS)}")
+        if export_format != "csv.gz" and pa is None:
+            raise ImportError(f"pyarrow is required for {export_format} exports. Install it: pip install pyarrow")
+
+        self.path = path
+        self.export_format = export_format
+        self.count = 0
+        self._writer: Any = None
+        self._file: Any = None
+
+        if export_format == "csv.gz":
+            self._file = gzip.open(path, "wt", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(EXPORT_COLUMNS)
+        else:
+            self.schema = pa.schema(
+                [
+                    ("key", pa.string()),
+                    ("size", pa.int64()),
+                    ("last_modified", pa.timestamp("ms")),
+                    ("etag", pa.string()),
+                    ("storage_class", pa.string()),
+                    ("owner", pa.string()),
+                ]
+            )
+            if export_format == "parquet":
+                self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+            else:
+                self._file = pa.OSFile(path, "wb")
+                self._writer = pa.ipc.new_file(self._file, self.schema)
+
+    def _batch(self, page: Sequence[Any]) -> Any:
+        """Build a record batch from one listing page"""
+        last_modified = pc.strptime(
+            pa.array([content.lastModified for content in page], pa.string()),
+            format=LAST_MODIFIED_FORMAT,
+            unit="ms",
+            error_is_null=True,
+        )
+        columns: List[Any] = [
+            pa.array([content.key for content in page], pa.string()),
+            pa.array([content.size for content in page], pa.int64()),
+            last_modified,
+            pa.array([content.etag for content in page], pa.string()),
+            pa.array([content.storageClass for content in page], pa.string()),
+            pa.array([_owner_name(content) for content in page], pa.string()),
+        ]
+        return pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def write_page(self, page: Sequence[Any]) -> None:
+        """
+        Write one listing page
+
+        Args:
+            page: Listing entries of one page
+        """
+        if not page:
+            return
+        if self.export_format == "csv.gz":
+            self._writer.writerows(
+                (content.key, content.size, content.lastModified, content.etag, content.storageClass, _owner_name(content))
+                for content in page
+            )
+        else:
+            self._writer.write_batch(self._batch(page))
+        self.count += len(page)
+
+    def close(self) -> None:
+        """Finish and close the file"""
+        if self.export_format != "csv.gz" and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
+
+    def __enter__(self) -> "ListingExporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,172 @@
+"""
+Filters module for OBS Utils
+Key, size, date and storage class filters applied to listings
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import fnmatch
+import re
+import time
+from typing import Any, Iterable, Iterator, List, Optional
+
+from obs_metadata import parse_last_modified
+from planner import DEFAULT_STORAGE_CLASS
+
+# Size suffixes accepted by parse_size (binary multiples)
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S")
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a size such as ``1024``, ``10K``, ``5MB`` or ``2GiB``
+
+    Args:
+        value: Size with an optional binary unit suffix
+
+    Returns:
+        Size in bytes
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_date(value: str) -> float:
+    """
+    Parse a local date such as ``2025-01-31`` or ``2025-01-31T12:00:00``
+
+    Args:
+        value: Date, optionally with a time
+
+    Returns:
+        Seconds since the epoch
+    """
+    for date_format in DATE_FORMATS:
+        try:
+            return time.mktime(time.strptime(value, date_format))
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value!r}. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS")
+
+
+def _glob_pattern(patterns: Optional[List[str]]) -> Optional[re.Pattern]:
+    """Compile several globs into one regular expression"""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+class ObjectFilter:
+    """
+    Select listing entries by key, size, modification date and storage class
+
+    Criteria are combined with AND: an object must match one of the include
+    globs (if any), none of the exclude globs, the regular expression (if
+    any) and every bound. Globs and regexes are compiled once and match the
+    full key; ``*`` also matches ``/``. Cheap key and size checks run before
+    the date is parsed.
+    """
+
+    def __init__(
+        self,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        regex: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_after: Optional[float] = None,
+        modified_before: Optional[float] = None,
+        storage_classes: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the filter
+
+        Args:
+            include: Globs of keys to keep (any of them)
+            exclude: Globs of keys to drop
+            regex: Regular expression searched in the key
+            min_size: Minimum size in bytes (inclusive)
+            max_size: Maximum size in bytes (inclusive)
+            modified_after: Keep objects modified at or after this timestamp
+            modified_before: Keep objects modified before this timestamp
+            storage_classes: Storage classes to keep (STANDARD, WARM, COLD)
+        """
+        self.include = _glob_pattern(include)
+        self.exclude = _glob_pattern(exclude)
+        self.regex = re.compile(regex) if regex else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self.storage_classes = {name.upper() for name in storage_classes} if storage_classes else None
+
+    def __bool__(self) -> bool:
+        """Whether any criterion is set"""
+        return any(
+            criterion is not None
+            for criterion in (
+                self.include,
+                self.exclude,
+                self.regex,
+                self.min_size,
+                self.max_size,
+                self.modified_after,
+                self.modified_before,
+                self.storage_classes,
+            )
+        )
+
+    def matches(self, content: Any) -> bool:
+        """
+        Check one listing entry
+
+        Args:
+            content: Listing entry
+
+        Returns:
+            True if the object passes every criterion
+        """
+        key = content.key
+        if self.include is not None and not self.include.match(key):
+            return False
+        if self.exclude is not None and self.exclude.match(key):
+            return False
+        if self.regex is not None and not self.regex.search(key):
+            return False
+        if self.min_size is not None and (content.size or 0) < self.min_size:
+            return False
+        if self.max_size is not None and (content.size or 0) > self.max_size:
+            return False
+        if self.storage_classes is not None and (content.storageClass or DEFAULT_STORAGE_CLASS) not in self.storage_classes:
+            return False
+        if self.modified_after is not None or self.modified_before is not None:
+            modified = parse_last_modified(content.lastModified)
+            if modified is None:
+                return False
+            if self.modified_after is not None and modified < self.modified_after:
+                return False
+            if self.modified_before is not None and modified >= self.modified_before:
+                return False
+        return True
+
+    def apply(self, contents: Iterable[Any]) -> Iterator[Any]:
+        """Yield the entries of a listing that match"""
+        return (content for content in contents if self.matches(content))
@@ -0,0 +1,157 @@
+"""
+Inventory module for OBS Utils
+Usage report aggregated in one pass over a bucket listing
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from obs_metadata import parse_last_modified
+from planner import DEFAULT_STORAGE_CLASS
+
+# (upper bound in days, label) pairs; the last bin is open-ended
+AGE_BINS: List[Tuple[Optional[int], str]] = [
+    (1, "< 1 day"),
+    (7, "1-7 days"),
+    (30, "7-30 days"),
+    (90, "30-90 days"),
+    (365, "90-365 days"),
+    (None, "> 1 year"),
+]
+UNKNOWN_AGE = "unknown"
+
+# (record field, table label) pairs of the per-prefix rows
+REPORT_FIELDS: List[Tuple[str, str]] = [
+    ("prefix", "Prefix"),
+    ("objects", "Objects"),
+    ("bytes", "Bytes"),
+]
+
+
+def format_bytes(size: int) -> str:
+    """Human readable size, e.g. ``1.5 GiB``"""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if value < 1024 or unit == "TiB":
+            return f"{int(value)} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"
+
+
+class InventoryReport:
+    """
+    Counters for a usage report, updated one listing entry at a time
+
+    Only aggregates are kept, so memory grows with the number of distinct
+    prefixes at the chosen depth, not with the number of objects.
+    """
+
+    def __init__(self, prefix: str = "", depth: int = 1, now: Optional[float] = None):
+        """
+        Initialize the report
+
+        Args:
+            prefix: Object prefix being reported; prefix totals are relative to it
+            depth: Number of path components after ``prefix`` kept in prefix totals
+            now: Reference time for ages (default: current time)
+        """
+        self.prefix = prefix
+        self.depth = max(0, depth)
+        self.now = time.time() if now is None else now
+        self.objects = 0
+        self.bytes = 0
+        self.storage_classes: Dict[str, Dict[str, int]] = {}
+        self.ages: Dict[str, Dict[str, int]] = {label: {"objects": 0, "bytes": 0} for _, label in AGE_BINS}
+        self.prefixes: Dict[str, Dict[str, int]] = {}
+
+    def prefix_of(self, key: str) -> str:
+        """Prefix totals group of a key: ``prefix`` plus at most ``depth`` directories"""
+        directories = key[len(self.prefix) :].split("/")[:-1][: self.depth]
+        return self.prefix + "".join(f"{directory}/" for directory in directories)
+
+    def age_label(self, last_modified: Any) -> str:
+        """Age histogram bin of a ``lastModified`` value"""
+        timestamp = parse_last_modified(last_modified)
+        if timestamp is None:
+            return UNKNOWN_AGE
+        days = (self.now - timestamp) / 86400
+        for limit, label in AGE_BINS:
+            if limit is None or days < limit:
+                return label
+        return UNKNOWN_AGE
+
+    @staticmethod
+    def _add(totals: Dict[str, Dict[str, int]], name: str, size: int) -> None:
+        entry = totals.setdefault(name, {"objects": 0, "bytes": 0})
+        entry["objects"] += 1
+        entry["bytes"] += size
+
+    def add(self, content: Any) -> None:
+        """
+        Count one listing entry
+
+        Args:
+            content: Listing entry (from the paginated listing)
+        """
+        size = content.size or 0
+        self.objects += 1
+        self.bytes += size
+        self._add(self.storage_classes, content.storageClass or DEFAULT_STORAGE_CLASS, size)
+        self._add(self.ages, self.age_label(content.lastModified), size)
+        self._add(self.prefixes, self.prefix_of(content.key), size)
+
+    def prefix_rows(self) -> List[Dict[str, Any]]:
+        """Per-prefix totals as output records, in prefix order"""
+        return [{"prefix": prefix, **totals} for prefix, totals in sorted(self.prefixes.items())]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Report as a JSON-serialisable dictionary"""
+        return {
+            "prefix": self.prefix,
+            "objects": self.objects,
+            "bytes": self.bytes,
+            "storage_classes": dict(sorted(self.storage_classes.items())),
+            "ages": {label: totals for label, totals in self.ages.items() if totals["objects"]},
+            "depth": self.depth,
+            "prefixes": dict(sorted(self.prefixes.items())),
+        }
+
+    def format(self, title: str) -> str:
+        """
+        Render the report for display
+
+        Args:
+            title: First line, e.g. the bucket and prefix
+
+        Returns:
+            Multi-line report
+        """
+
+        def line(name: str, totals: Dict[str, int]) -> str:
+            share = totals["bytes"] * 100 / self.bytes if self.bytes else 0
+            return f"  {name:<30} {totals['objects']:>12,} objects {format_bytes(totals['bytes']):>12} {share:5.1f}%"
+
+        lines = [title, f"  Objects: {self.objects:,}", f"  Size:    {format_bytes(self.bytes)} ({self.bytes:,} bytes)"]
+        lines.append("Storage classes:")
+        lines.extend(line(name, totals) for name, totals in sorted(self.storage_classes.items()))
+        lines.append("Age (last modified):")
+        lines.extend(line(label, totals) for label, totals in self.ages.items() if totals["objects"])
+        lines.append(f"Prefixes (depth {self.depth}):")
+        lines.extend(line(prefix or "/", totals) for prefix, totals in sorted(self.prefixes.items()))
+        return "\n".join(lines)
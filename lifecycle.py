@@ -0,0 +1,164 @@
+"""
+Lifecycle module for OBS Utils
+Age-based storage class policies evaluated against bucket listings
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from inventory import format_bytes
+from obs_metadata import parse_last_modified
+from planner import DEFAULT_STORAGE_CLASS
+
+# Storage classes from warmest to coldest; policies only move objects colder
+STORAGE_CLASS_ORDER = ["STANDARD", "WARM", "COLD"]
+
+
+class LifecycleRule:
+    """Move objects under a prefix to a storage class once they reach an age"""
+
+    def __init__(self, prefix: str, days: int, storage_class: str):
+        """
+        Initialize the rule
+
+        Args:
+            prefix: Object prefix the rule applies to ("" for the whole bucket)
+            days: Minimum age in days, from lastModified
+            storage_class: Target storage class (WARM or COLD)
+        """
+        if storage_class not in STORAGE_CLASS_ORDER[1:]:
+            raise ValueError(f"Lifecycle storage class must be one of: {', '.join(STORAGE_CLASS_ORDER[1:])}")
+        if days < 0:
+            raise ValueError("Lifecycle days must not be negative")
+        self.prefix = prefix
+        self.days = days
+        self.storage_class = storage_class
+
+    @classmethod
+    def from_dict(cls, rule: Dict[str, Any]) -> "LifecycleRule":
+        """Build a rule from a config entry such as {"prefix": "logs/", "days": 90, "storage_class": "COLD"}"""
+        try:
+            return cls(rule.get("prefix", ""), int(rule["days"]), rule["storage_class"])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid lifecycle rule {rule!r}: 'days' and 'storage_class' are required") from e
+
+    def __repr__(self) -> str:
+        return f"LifecycleRule(prefix={self.prefix!r}, days={self.days}, storage_class={self.storage_class!r})"
+
+
+class LifecyclePolicy:
+    """
+    Decide the target storage class of listed objects from a set of rules
+
+    Of the rules whose prefix matches a key and whose age the object has
+    reached, the coldest target wins. Objects already in that class or a
+    colder one are left alone. Counts and bytes per target class are kept
+    for plans and summaries; counters are thread-safe.
+    """
+
+    def __init__(self, rules: List[LifecycleRule], now: Optional[float] = None):
+        """
+        Initialize the policy
+
+        Args:
+            rules: Lifecycle rules
+            now: Reference time for ages (default: current time)
+        """
+        if not rules:
+            raise ValueError("No lifecycle rules configured")
+        self.rules = rules
+        self.now = time.time() if now is None else now
+        self._lock = threading.Lock()
+        self.counts: Counter = Counter()
+        self.bytes: Counter = Counter()
+        self.skipped = 0
+
+    @classmethod
+    def from_config(cls, rules: List[Dict[str, Any]], now: Optional[float] = None) -> "LifecyclePolicy":
+        """Build a policy from the ``lifecycle_rules`` config entry"""
+        return cls([LifecycleRule.from_dict(rule) for rule in rules or []], now)
+
+    def listing_prefix(self) -> str:
+        """Longest prefix shared by every rule, so one listing covers them all"""
+        return os.path.commonprefix([rule.prefix for rule in self.rules])
+
+    def target(self, content: Any) -> Optional[str]:
+        """
+        Storage class an object should move to
+
+        Args:
+            content: Listing entry
+
+        Returns:
+            Target storage class, or None if no rule moves the object
+        """
+        timestamp = parse_last_modified(content.lastModified)
+        if timestamp is None:
+            return None
+        age_days = (self.now - timestamp) / 86400
+
+        target = None
+        for rule in self.rules:
+            if content.key.startswith(rule.prefix) and age_days >= rule.days:
+                if target is None or STORAGE_CLASS_ORDER.index(rule.storage_class) > STORAGE_CLASS_ORDER.index(target):
+                    target = rule.storage_class
+        if target is None:
+            return None
+
+        current = content.storageClass or DEFAULT_STORAGE_CLASS
+        if current in STORAGE_CLASS_ORDER and STORAGE_CLASS_ORDER.index(current) >= STORAGE_CLASS_ORDER.index(target):
+            return None
+        return target
+
+    def plan(self, content: Any) -> Optional[str]:
+        """Like target, also counting the object and its bytes"""
+        target = self.target(content)
+        with self._lock:
+            if target is None:
+                self.skipped += 1
+            else:
+                self.counts[target] += 1
+                self.bytes[target] += content.size or 0
+        return target
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Objects and bytes per target storage class"""
+        with self._lock:
+            return {name: {"objects": self.counts[name], "bytes": self.bytes[name]} for name in sorted(self.counts)}
+
+    def format(self, title: str) -> str:
+        """
+        Render the plan for display
+
+        Args:
+            title: First line, e.g. the bucket
+
+        Returns:
+            Multi-line plan summary
+        """
+        lines = [title]
+        lines.extend(f"  {rule.prefix or '/'}: older than {rule.days} days -> {rule.storage_class}" for rule in self.rules)
+        for name, totals in self.summary().items():
+            lines.append(f"  To {name}: {totals['objects']} objects, {format_bytes(totals['bytes'])}")
+        with self._lock:
+            lines.append(f"  Unchanged: {self.skipped}")
+        return "\n".join(lines)
@@ -0,0 +1,108 @@
+"""
+Listing join module for OBS Utils
+Merge-join two key-ordered listings in constant memory
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+_EXHAUSTED = object()
+
+# Diff statuses of a key, from the left listing to the right one
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+IDENTICAL = "identical"
+
+
+def _ordered(items: Iterable[Any], key: Callable[[Any], str], side: str) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, item) pairs, failing if the keys are not strictly increasing"""
+    previous = None
+    for item in items:
+        current = key(item)
+        if previous is not None and current <= previous:
+            raise ValueError(f"{side} listing is not sorted: {current!r} after {previous!r}")
+        previous = current
+        yield current, item
+
+
+def merge_join(
+    left: Iterable[Any],
+    right: Iterable[Any],
+    left_key: Optional[Callable[[Any], str]] = None,
+    right_key: Optional[Callable[[Any], str]] = None,
+) -> Iterator[Tuple[str, Optional[Any], Optional[Any]]]:
+    """
+    Full outer join of two listings sorted by key
+
+    Both listings are consumed one item at a time, so memory stays constant
+    however many keys they hold. OBS returns keys in binary order, which is
+    also Python's string order, so paginated listings can be joined directly.
+
+    Args:
+        left: Listing entries in key order
+        right: Listing entries in key order
+        left_key: Join key of a left entry (default: its ``key`` attribute)
+        right_key: Join key of a right entry (default: its ``key`` attribute)
+
+    Yields:
+        ``(key, left_item, right_item)`` in key order, with None for the side
+        that lacks the key
+
+    Raises:
+        ValueError: If a listing is not in strictly increasing key order
+    """
+    left_iter = _ordered(left, left_key or (lambda item: item.key), "Left")
+    right_iter = _ordered(right, right_key or (lambda item: item.key), "Right")
+    left_entry = next(left_iter, _EXHAUSTED)
+    right_entry = next(right_iter, _EXHAUSTED)
+
+    while left_entry is not _EXHAUSTED or right_entry is not _EXHAUSTED:
+        if right_entry is _EXHAUSTED or (left_entry is not _EXHAUSTED and left_entry[0] < right_entry[0]):
+            yield left_entry[0], left_entry[1], None
+            left_entry = next(left_iter, _EXHAUSTED)
+        elif left_entry is _EXHAUSTED or right_entry[0] < left_entry[0]:
+            yield right_entry[0], None, right_entry[1]
+            right_entry = next(right_iter, _EXHAUSTED)
+        else:
+            yield left_entry[0], left_entry[1], right_entry[1]
+            left_entry = next(left_iter, _EXHAUSTED)
+            right_entry = next(right_iter, _EXHAUSTED)
+
+
+def diff_status(left: Optional[Any], right: Optional[Any], same: Optional[Callable[[Any, Any], bool]] = None) -> str:
+    """
+    Classify a joined key
+
+    Args:
+        left: Left listing entry, or None
+        right: Right listing entry, or None
+        same: Whether two entries hold the same object (default: equal size and ETag)
+
+    Returns:
+        ADDED (right only), REMOVED (left only), CHANGED or IDENTICAL
+    """
+    if left is None:
+        return ADDED
+    if right is None:
+        return REMOVED
+    if same is None:
+        identical = left.size == right.size and left.etag == right.etag
+    else:
+        identical = same(left, right)
+    return IDENTICAL if identical else CHANGED
@@ -0,0 +1,116 @@
+"""
+Manifest module for OBS Utils
+Local record of mirrored objects used by incremental sync
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterator, Optional
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MANIFEST_FILE = ".obs_manifest.json"
+
+MANIFEST_VERSION = 1
+
+# Write the manifest after this many updates so a crash keeps the work done so far
+SAVE_INTERVAL = 1000
+
+
+class SyncManifest:
+    """
+    JSON manifest of objects mirrored into a local directory
+
+    Each entry is keyed by object key and records what the object looked
+    like when it was last transferred (size, ETag, lastModified) together
+    with the local file's mtime at that point. The file is rewritten
+    every SAVE_INTERVAL updates and on save().
+    """
+
+    def __init__(self, path: str):
+        """
+        Load a manifest, starting empty if it does not exist
+
+        Args:
+            path: Manifest file path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self._since_save = 0
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._entries = data.get("objects", {})
+                logger.info(f"Loaded manifest {path} with {len(self._entries)} entries")
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Could not load manifest {path}, starting empty: {e}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get the entry recorded for ``key``"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def update(self, key: str, **fields) -> None:
+        """Record (or replace) the entry for ``key``"""
+        with self._lock:
+            self._entries[key] = fields
+            self._dirty = True
+            self._since_save += 1
+            if self._since_save >= SAVE_INTERVAL:
+                self._write()
+
+    def remove(self, key: str) -> None:
+        """Forget ``key``"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over a snapshot of the recorded keys"""
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self) -> None:
+        """Atomically write the manifest if it changed"""
+        with self._lock:
+            if self._dirty:
+                self._write()
+
+    def _write(self) -> None:
+        """Atomically write the manifest; caller holds the lock"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "objects": self._entries}, f)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+        self._since_save = 0
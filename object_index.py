@@ -0,0 +1,255 @@
+"""
+Object index module for OBS Utils
+Local SQLite index of object keys and metadata for fast searches
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_INDEX_FILE = "obs_index.sqlite3"
+
+# Rows written per transaction while indexing a listing
+INSERT_BATCH_SIZE = 1000
+
+# Upper bound for a key range query on a prefix
+_MAX_CHAR = "\U0010ffff"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    id INTEGER PRIMARY KEY,
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER,
+    last_modified TEXT,
+    etag TEXT,
+    storage_class TEXT,
+    owner TEXT,
+    generation INTEGER NOT NULL,
+    UNIQUE (bucket, key)
+);
+CREATE TABLE IF NOT EXISTS scans (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    last_key TEXT,
+    refreshed_at REAL,
+    PRIMARY KEY (bucket, prefix)
+);
+"""
+
+# Trigram full-text index for substring matches (SQLite 3.34+)
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS objects_fts USING fts5(
+    key, content='objects', content_rowid='id', tokenize='trigram case_sensitive 0'
+);
+CREATE TRIGGER IF NOT EXISTS objects_ai AFTER INSERT ON objects BEGIN
+    INSERT INTO objects_fts(rowid, key) VALUES (new.id, new.key);
+END;
+CREATE TRIGGER IF NOT EXISTS objects_ad AFTER DELETE ON objects BEGIN
+    INSERT INTO objects_fts(objects_fts, rowid, key) VALUES ('delete', old.id, old.key);
+END;
+"""
+
+
+class ObjectIndex:
+    """
+    On-disk index of bucket listings
+
+    Listings are upserted page by page. A full refresh tags every listed row
+    with a new generation and then removes rows of the prefix that were not
+    seen, so deleted objects drop out of the index. An incremental refresh
+    only lists keys after the last indexed one, which keeps append-only
+    layouts (timestamped logs, backups) current at the cost of a single
+    short listing.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_FILE):
+        """
+        Open (creating if needed) an index database
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text index not available, searches will scan the index: {e}")
+            self.has_fts = False
+        self._conn.commit()
+
+    def _scan(self, bucket: str, prefix: str) -> Optional[sqlite3.Row]:
+        return self._conn.execute("SELECT * FROM scans WHERE bucket = ? AND prefix = ?", (bucket, prefix)).fetchone()
+
+    def last_key(self, bucket: str, prefix: str = "") -> Optional[str]:
+        """
+        Get the last key indexed for a bucket prefix
+
+        Args:
+            bucket: Bucket name
+            prefix: Object prefix
+
+        Returns:
+            Highest indexed key, or None if the prefix was never indexed
+        """
+        scan = self._scan(bucket, prefix)
+        return scan["last_key"] if scan else None
+
+    def refresh(self, bucket: str, prefix: str, contents: Iterable[Any], full: bool = True) -> int:
+        """
+        Upsert a listing into the index
+
+        Args:
+            bucket: Bucket name
+            prefix: Object prefix the listing covers
+            contents: Listing entries (from the paginated listing)
+            full: The listing covers the whole prefix, so unseen rows are removed;
+                  otherwise the rows are only appended or updated, so keys sorting
+                  before the last indexed one, overwrites and deletions are missed
+
+        Returns:
+            Number of entries indexed
+        """
+        scan = self._scan(bucket, prefix)
+        # Generations increase per bucket so overlapping prefixes sweep each other's rows
+        generation = (
+            self._conn.execute(
+                "SELECT MAX(g) FROM (SELECT MAX(generation) AS g FROM objects WHERE bucket = ? "
+                "UNION ALL SELECT MAX(generation) FROM scans WHERE bucket = ?)",
+                (bucket, bucket),
+            ).fetchone()[0]
+            or 0
+        ) + 1
+        last_key = scan["last_key"] if scan and not full else None
+        count = 0
+        rows: List[tuple] = []
+
+        for content in contents:
+            owner = getattr(content.owner, "owner_name", None) if getattr(content, "owner", None) else None
+            rows.append(
+                (
+                    bucket,
+                    content.key,
+                    content.size,
+                    content.lastModified,
+                    content.etag,
+                    content.storageClass,
+                    owner,
+                    generation,
+                )
+            )
+            last_key = content.key if last_key is None or content.key > last_key else last_key
+            count += 1
+            if len(rows) >= INSERT_BATCH_SIZE:
+                self._upsert(rows)
+                rows = []
+        self._upsert(rows)
+
+        if full:
+            self._conn.execute(
+                "DELETE FROM objects WHERE bucket = ? AND key >= ? AND key < ? AND generation < ?",
+                (bucket, prefix, prefix + _MAX_CHAR, generation),
+            )
+
+        self._conn.execute(
+            "INSERT INTO scans (bucket, prefix, generation, last_key, refreshed_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (bucket, prefix) DO UPDATE SET generation = excluded.generation, "
+            "last_key = excluded.last_key, refreshed_at = excluded.refreshed_at",
+            (bucket, prefix, generation, last_key, time.time()),
+        )
+        self._conn.commit()
+
+        logger.info(f"Indexed {count} objects for bucket {bucket}, prefix '{prefix}' ({'full' if full else 'incremental'})")
+        return count
+
+    def _upsert(self, rows: List[tuple]) -> None:
+        if not rows:
+            return
+        self._conn.executemany(
+            "INSERT INTO objects (bucket, key, size, last_modified, etag, storage_class, owner, generation) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (bucket, key) DO UPDATE SET size = excluded.size, last_modified = excluded.last_modified, "
+            "etag = excluded.etag, storage_class = excluded.storage_class, owner = excluded.owner, "
+            "generation = excluded.generation",
+            rows,
+        )
+        self._conn.commit()
+
+    def search(self, search_text: str, bucket: str = "", prefix: str = "") -> List[Dict]:
+        """
+        Find indexed objects whose key contains ``search_text`` (case-insensitive)
+
+        Args:
+            search_text: Text to search for in object keys
+            bucket: Restrict to one bucket (empty for all indexed buckets)
+            prefix: Restrict to keys under this prefix
+
+        Returns:
+            List of matching rows as dictionaries, ordered by bucket and key
+        """
+        conditions = []
+        params: List[Any] = []
+
+        if self.has_fts and len(search_text) >= 3:
+            conditions.append("id IN (SELECT rowid FROM objects_fts WHERE objects_fts MATCH ?)")
+            params.append('"' + search_text.replace('"', '""') + '"')
+        else:
+            escaped = search_text.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("lower(key) LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+
+        if bucket:
+            conditions.append("bucket = ?")
+            params.append(bucket)
+        if prefix:
+            conditions.append("key >= ? AND key < ?")
+            params.extend([prefix, prefix + _MAX_CHAR])
+
+        query = (
+            "SELECT bucket, key, size, last_modified, etag, storage_class, owner FROM objects "
+            f"WHERE {' AND '.join(conditions)} ORDER BY bucket, key"
+        )
+        return [dict(row) for row in self._conn.execute(query, params)]
+
+    def count(self, bucket: str = "") -> int:
+        """Number of indexed objects, optionally for one bucket"""
+        if bucket:
+            return self._conn.execute("SELECT COUNT(*) FROM objects WHERE bucket = ?", (bucket,)).fetchone()[0]
+        return self._conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database"""
+        self._conn.close()
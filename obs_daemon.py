@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Daemon module for OBS Utils
+Long-running server keeping a warm OBS client, and a thin client forwarding CLI calls to it
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import argparse
+import hmac
+import http.client
+import io
+import json
+import os
+import secrets
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+# The client side only uses the standard library so that forwarding a call
+# costs no SDK import, config load or decryption; the server imports the
+# OBS modules when it starts.
+
+LOCALHOST = "127.0.0.1"
+DEFAULT_SOCKET = os.path.join(os.path.expanduser("~"), ".obs_utils.sock")
+DEFAULT_TOKEN_FILE = os.path.join(os.path.expanduser("~"), ".obs_utils.token")
+
+
+def default_socket() -> str:
+    """Unix socket path from OBS_DAEMON_SOCKET, or the default one"""
+    return os.getenv("OBS_DAEMON_SOCKET", DEFAULT_SOCKET)
+
+
+def default_token_file() -> str:
+    """File holding the HTTP mode token, from OBS_DAEMON_TOKEN_FILE, or the default one"""
+    return os.getenv("OBS_DAEMON_TOKEN_FILE", DEFAULT_TOKEN_FILE)
+
+
+def default_port() -> Optional[int]:
+    """Localhost HTTP port from OBS_DAEMON_PORT, or None to use the Unix socket"""
+    port = os.getenv("OBS_DAEMON_PORT")
+    return int(port) if port else None
+
+
+class _EventWriter(io.TextIOBase):
+    """Text stream turning each write into one event of the response"""
+
+    def __init__(self, name: str, emit: Callable[[Dict[str, Any]], None]):
+        self.name = name
+        self.emit = emit
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            self.emit({self.name: text})
+        return len(text)
+
+
+class OBSDaemon:
+    """
+    Run CLI operations with one long-lived OBS manager
+
+    The manager, its ObsClient connection pool, retry policy and adaptive
+    concurrency state are created once and shared by every request.
+    Operations run one at a time: standard output, standard error and the
+    working directory are process-wide, and each operation already spreads
+    its requests over its own workers.
+    """
+
+    def __init__(self, obs_manager: Any):
+        """
+        Initialize the daemon
+
+        Args:
+            obs_manager: Initialized OBSManager
+        """
+        self.obs_manager = obs_manager
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def run(self, argv: List[str], cwd: str, emit: Callable[[Dict[str, Any]], None]) -> int:
+        """
+        Run one obs_utils_improved.py call
+
+        Args:
+            argv: Command line arguments of the call
+            cwd: Working directory relative paths are resolved against
+            emit: Receives ``{"stdout": text}`` and ``{"stderr": text}`` events
+
+        Returns:
+            Exit code of the call
+        """
+        from obs_utils_improved import command_line_mode, create_parser, validate_operation_args
+
+        with self._lock:
+            self.requests += 1
+            previous = os.getcwd()
+            with redirect_stdout(_EventWriter("stdout", emit)), redirect_stderr(_EventWriter("stderr", emit)):
+                try:
+                    args = create_parser().parse_args(argv)
+                    if not args.operation:
+                        print("Error: --operation is required when running through the daemon", file=sys.stderr)
+                        return 2
+                    if args.enable_security_levels:
+                        # Level passwords are asked per session and cannot be shared through the daemon
+                        print("Error: --enable-security-levels is not available through the daemon", file=sys.stderr)
+                        return 1
+                    os.chdir(cwd)
+                    validate_operation_args(args)
+                    command_line_mode(args, self.obs_manager)
+                except SystemExit as e:
+                    if e.code is None or isinstance(e.code, int):
+                        return e.code or 0
+                    print(e.code, file=sys.stderr)
+                    return 1
+                except Exception as e:
+                    print(f"Error: {e}", file=sys.stderr)
+                    return 1
+                finally:
+                    os.chdir(previous)
+            return 0
+
+    def status(self) -> Dict[str, Any]:
+        """Process id, uptime in seconds, requests served and whether an operation is running"""
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "busy": self._lock.locked(),
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP interface of the daemon
+
+    ``POST /run`` takes ``{"argv": [...], "cwd": "..."}`` and streams JSON
+    lines: output events while the operation runs, then ``{"exit_code": n}``.
+    ``GET /status`` returns OBSDaemon.status(). In HTTP mode both require
+    ``Authorization: Bearer <token>`` with the token of the daemon's token file.
+    """
+
+    server_version = "obs-utils-daemon"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # The default writes the client address, which Unix sockets do not have
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        """Check the request's token, answering 401 when it is missing or wrong"""
+        token = self.server.token
+        if token is None:
+            # Unix socket: only its owner can connect
+            return True
+        supplied = self.headers.get("Authorization", "")
+        if hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+            return True
+        self._send_json(401, {"error": "Missing or invalid daemon token"})
+        return False
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return
+        if self.path != "/status":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._send_json(200, self.server.obs_daemon.status())
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return
+        if self.path != "/run":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            argv = request["argv"]
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                raise ValueError("argv must be a list of strings")
+            cwd = request.get("cwd") or os.getcwd()
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        lock = threading.Lock()
+        connected = [True]
+
+        def emit(event: Dict[str, Any]) -> None:
+            # Worker threads of the operation may print at the same time
+            with lock:
+                if not connected[0]:
+                    return
+                try:
+                    self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                except OSError:
+                    # The client went away; let the operation finish on its own
+                    connected[0] = False
+
+        emit({"exit_code": self.server.obs_daemon.run(argv, cwd, emit)})
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server on a Unix socket"""
+
+    daemon_threads = True
+
+
+def _unix_connect(socket_path: str) -> socket.socket:
+    """Connect to a Unix socket"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix socket"""
+
+    def __init__(self, socket_path: str):
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = _unix_connect(self.socket_path)
+
+
+def _write_token(token_file: str) -> str:
+    """Generate a token and store it in a file only its owner can read"""
+    token = secrets.token_urlsafe(32)
+    fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    # An existing file keeps its mode when opened
+    os.chmod(token_file, 0o600)
+    return token
+
+
+def _read_token(token_file: str = None) -> str:
+    """Read the HTTP mode token of a running daemon"""
+    with open(token_file or default_token_file(), encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def create_server(
+    obs_daemon: OBSDaemon, socket_path: str = None, port: int = None, token_file: str = None
+) -> socketserver.BaseServer:
+    """
+    Create the daemon's server
+
+    Any local user can connect to a TCP port, so HTTP mode requires a token
+    generated at start and stored in a file only the daemon's owner can
+    read. The Unix socket is itself private to its owner.
+
+    Args:
+        obs_daemon: Daemon serving the requests
+        socket_path: Unix socket path (default: OBS_DAEMON_SOCKET or ~/.obs_utils.sock)
+        port: Serve HTTP on this localhost port instead of a Unix socket (0 picks a free port)
+        token_file: With port, file the token is written to (default: OBS_DAEMON_TOKEN_FILE or ~/.obs_utils.token)
+
+    Returns:
+        Server ready for serve_forever()
+
+    Raises:
+        RuntimeError: If another daemon is listening on the socket
+        ValueError: If Unix sockets are not available and no port was given
+    """
+    if port is not None:
+        server = ThreadingHTTPServer((LOCALHOST, port), _RequestHandler)
+        server.daemon_threads = True
+        server.token_file = token_file or default_token_file()
+        server.token = _write_token(server.token_file)
+    else:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not available on this platform; use --port")
+        socket_path = socket_path or default_socket()
+        if os.path.exists(socket_path):
+            try:
+                _unix_connect(socket_path).close()
+            except OSError:
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(socket_path)
+            else:
+                raise RuntimeError(f"A daemon is already listening on {socket_path}")
+        # The socket gives access to the daemon's credentials: owner only from the start
+        umask = os.umask(0o177)
+        try:
+            server = _ThreadingUnixHTTPServer(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        server.token = None
+    server.obs_daemon = obs_daemon
+    return server
+
+
+def serve(config_file: str = "obs_config.json", socket_path: str = None, port: int = None, token_file: str = None) -> None:
+    """
+    Run the daemon until interrupted
+
+    Args:
+        config_file: Configuration file path
+        socket_path: Unix socket path (default: OBS_DAEMON_SOCKET or ~/.obs_utils.sock)
+        port: Serve HTTP on this localhost port instead of a Unix socket
+        token_file: With port, file the token is written to (default: OBS_DAEMON_TOKEN_FILE or ~/.obs_utils.token)
+    """
+    from logger import get_logger
+    from obs_manager import OBSManager
+
+    logger = get_logger(__name__)
+    # Console handlers keep the stream they are created with, so create the
+    # CLI's logger before any request redirects the output to its client
+    get_logger("obs_utils_improved")
+    obs_manager = OBSManager(config_file)
+    server = create_server(OBSDaemon(obs_manager), socket_path, port, token_file)
+    if port is not None:
+        address = f"http://{LOCALHOST}:{server.server_address[1]} (token in {server.token_file})"
+    else:
+        address = server.server_address
+    logger.info(f"OBS Utils daemon listening on {address} (pid {os.getpid()})")
+
+    # Stop cleanly on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if port is None and os.path.exists(server.server_address):
+            os.unlink(server.server_address)
+        elif port is not None and os.path.exists(server.token_file):
+            os.unlink(server.token_file)
+        obs_manager.close()
+        logger.info("OBS Utils daemon stopped")
+
+
+def _connection(socket_path: str = None, port: int = None) -> http.client.HTTPConnection:
+    """HTTP connection to the daemon"""
+    if port is not None:
+        return http.client.HTTPConnection(LOCALHOST, port)
+    return _UnixHTTPConnection(socket_path or default_socket())
+
+
+def _auth_headers(port: int = None, token_file: str = None) -> Dict[str, str]:
+    """Authorization header for HTTP mode (read from the daemon's token file)"""
+    return {"Authorization": f"Bearer {_read_token(token_file)}"} if port is not None else {}
+
+
+def forward(
+    argv: List[str],
+    socket_path: str = None,
+    port: int = None,
+    stdout: TextIO = None,
+    stderr: TextIO = None,
+    token_file: str = None,
+) -> int:
+    """
+    Run an obs_utils_improved.py call on the daemon
+
+    Args:
+        argv: Command line arguments of the call
+        socket_path: Unix socket path (default: OBS_DAEMON_SOCKET or ~/.obs_utils.sock)
+        port: Daemon's localhost HTTP port instead of a Unix socket
+        stdout: Stream receiving the call's standard output (default: sys.stdout)
+        stderr: Stream receiving the call's standard error (default: sys.stderr)
+        token_file: With port, the daemon's token file (default: OBS_DAEMON_TOKEN_FILE or ~/.obs_utils.token)
+
+    Returns:
+        Exit code of the call, or 1 if the daemon could not be reached
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    try:
+        headers = _auth_headers(port, token_file)
+    except OSError as e:
+        print(f"Error: could not read the daemon token ({e}); is the daemon running with --port?", file=stderr)
+        return 1
+    headers["Content-Type"] = "application/json"
+    connection = _connection(socket_path, port)
+    try:
+        body = json.dumps({"argv": argv, "cwd": os.getcwd()})
+        connection.request("POST", "/run", body, headers)
+        response = connection.getresponse()
+        if response.status != 200:
+            error = json.loads(response.read() or b"{}").get("error", response.reason)
+            print(f"Error: daemon rejected the request: {error}", file=stderr)
+            return 1
+        for line in response:
+            event = json.loads(line)
+            if "stdout" in event:
+                stdout.write(event["stdout"])
+                stdout.flush()
+            elif "stderr" in event:
+                stderr.write(event["stderr"])
+                stderr.flush()
+            elif "exit_code" in event:
+                return event["exit_code"]
+        print("Error: daemon closed the connection before the operation finished", file=stderr)
+        return 1
+    except OSError as e:
+        print(f"Error: could not reach the daemon ({e}); start it with: python obs_daemon.py serve", file=stderr)
+        return 1
+    finally:
+        connection.close()
+
+
+def status(socket_path: str = None, port: int = None, token_file: str = None) -> Dict[str, Any]:
+    """
+    Ask the daemon for its status
+
+    Args:
+        socket_path: Unix socket path (default: OBS_DAEMON_SOCKET or ~/.obs_utils.sock)
+        port: Daemon's localhost HTTP port instead of a Unix socket
+        token_file: With port, the daemon's token file (default: OBS_DAEMON_TOKEN_FILE or ~/.obs_utils.token)
+
+    Returns:
+        OBSDaemon.status() of the running daemon
+
+    Raises:
+        OSError: If the daemon cannot be reached
+    """
+    headers = _auth_headers(port, token_file)
+    connection = _connection(socket_path, port)
+    try:
+        connection.request("GET", "/status", headers=headers)
+        response = connection.getresponse()
+        body = json.loads(response.read())
+        if response.status != 200:
+            raise PermissionError(body.get("error", response.reason))
+        return body
+    finally:
+        connection.close()
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create argument parser"""
+    common = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    common.add_argument("--socket", help="Unix socket path (default: OBS_DAEMON_SOCKET or ~/.obs_utils.sock)")
+    common.add_argument(
+        "--port", type=int, help="Use HTTP on this localhost port instead of a Unix socket (default: OBS_DAEMON_PORT)"
+    )
+    common.add_argument(
+        "--token-file",
+        help="HTTP mode token file, readable by its owner only (default: OBS_DAEMON_TOKEN_FILE or ~/.obs_utils.token)",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="OBS Utils daemon - keep a warm OBS client between CLI calls",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        allow_abbrev=False,
+        epilog="""
+Examples:
+  # Start the daemon (loads and decrypts the configuration once)
+  python obs_daemon.py serve --config obs_config.json
+
+  # Forward obs_utils_improved.py arguments to it
+  python obs_daemon.py run --operation list --bucket my-bucket --prefix logs/ --quiet
+
+  # Serve on a localhost HTTP port instead of a Unix socket
+  # (requests must carry the token written to ~/.obs_utils.token)
+  python obs_daemon.py serve --port 8765
+  python obs_daemon.py run --port 8765 --operation restore --bucket my-bucket --prefix archived/
+
+  # Show uptime and requests served
+  python obs_daemon.py status
+        """,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", parents=[common], allow_abbrev=False, help="Run the daemon until interrupted")
+    serve_parser.add_argument("--config", default="obs_config.json", help="Configuration file path (default: obs_config.json)")
+
+    commands.add_parser(
+        "run", parents=[common], allow_abbrev=False, help="Forward the remaining obs_utils_improved.py arguments to the daemon"
+    )
+    commands.add_parser("status", parents=[common], allow_abbrev=False, help="Show the daemon's status")
+    return parser
+
+
+def main(argv: List[str] = None) -> None:
+    """Main function"""
+    parser = create_parser()
+    args, cli_args = parser.parse_known_args(argv)
+    if cli_args and args.command != "run":
+        parser.error(f"unrecognized arguments: {' '.join(cli_args)}")
+    port = args.port if args.port is not None else default_port()
+
+    if args.command == "serve":
+        serve(args.config, args.socket, port, args.token_file)
+    elif args.command == "run":
+        sys.exit(forward(cli_args, args.socket, port, token_file=args.token_file))
+    else:
+        try:
+            print(json.dumps(status(args.socket, port, args.token_file), indent=2))
+        except OSError as e:
+            print(f"Daemon not running: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
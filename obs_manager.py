@@ -18,14 +18,126 @@ limitations under the License.
 Contact: contact@ccvass.com
 """
 
+import heapq
+import json
 import os
+import queue
 import sys
-from typing import Any, Dict, Generator, List, Optional, Tuple
-
-from obs import ObsClient, SetObjectMetadataHeader
-
+import threading
+import time
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+from obs import (
+    CompleteMultipartUploadRequest,
+    CompletePart,
+    GetObjectHeader,
+    ObsClient,
+    PutObjectHeader,
+    SetObjectMetadataHeader,
+)
+
+from checkpoint import DEFAULT_CHECKPOINT_FILE, DownloadCheckpoint
+from concurrency import (
+    AdaptiveConcurrency,
+    PollSchedule,
+    RateLimiter,
+    TaskStats,
+    bucket_rate_limiter,
+    merge_concurrent,
+    prefetch_ordered,
+    run_worker_pool,
+)
 from config import Config
+from inventory import REPORT_FIELDS, InventoryReport
+from export import ListingExporter
+from filters import ObjectFilter
+from lifecycle import LifecyclePolicy
+from listing_join import ADDED, CHANGED, IDENTICAL, REMOVED, diff_status, merge_join
 from logger import get_logger
+from manifest import DEFAULT_MANIFEST_FILE, SyncManifest
+from object_index import DEFAULT_INDEX_FILE, ObjectIndex
+from obs_metadata import (
+    RESTORE_COMPLETED,
+    RESTORE_ONGOING,
+    file_md5,
+    md5_base64,
+    md5_from_etag,
+    parse_last_modified,
+    restore_status,
+)
+from output import DIFF_FIELDS, LIST_FIELDS, SEARCH_FIELDS, ObjectWriter, object_record
+from planner import SKIP, TODO, RequestPlanner
+from retry import RetryPolicy
+
+DEFAULT_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+PARTIAL_SUFFIX = ".obspart"
+
+# Multipart upload limit on the number of parts
+MAX_UPLOAD_PARTS = 10000
+
+# Server-side copies above the threshold are split into concurrent part copies
+DEFAULT_MULTIPART_COPY_THRESHOLD = 1024 * 1024 * 1024
+DEFAULT_COPY_PART_SIZE = 128 * 1024 * 1024
+
+# Metadata holding the source ETag of a multipart copy, whose own ETag differs
+SOURCE_ETAG_METADATA = "source-etag"
+
+# Sync directions and the extra action of recording an already identical pair
+SYNC_DOWNLOAD = "download"
+SYNC_UPLOAD = "upload"
+SYNC_BOTH = "both"
+SYNC_RECORD = "record"
+SYNC_DIRECTIONS = (SYNC_DOWNLOAD, SYNC_UPLOAD, SYNC_BOTH)
+
+# Characters used to split a flat key space into marker ranges
+PARTITION_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+# ObsClient options only known to SDK releases with pooled HTTP sessions
+POOL_OPTIONS = ("use_http_conns", "pool_size")
+
+
+def create_obs_client(client_class: Callable[..., Any], client_params: Dict[str, Any], options: Dict[str, Any]) -> Any:
+    """
+    Create an OBS client with connection options
+
+    SDK releases without pooled HTTP sessions reject the pool options; the
+    client is then created with keep-alive connections only.
+
+    Args:
+        client_class: ObsClient class
+        client_params: Credentials, server and region
+        options: Connection options from Config.client_options
+
+    Returns:
+        The OBS client
+    """
+    try:
+        return client_class(**client_params, **options)
+    except TypeError:
+        if not any(name in options for name in POOL_OPTIONS):
+            raise
+        get_logger(__name__).warning(
+            "Installed esdk-obs-python does not support connection pools; upgrade it to use connection_pool_size"
+        )
+        options = {name: value for name, value in options.items() if name not in POOL_OPTIONS}
+        return client_class(**client_params, **options)
+
+
+def _is_transfer_artifact(name: str) -> bool:
+    """Whether a local file name is bookkeeping written by this tool"""
+    return name in (DEFAULT_MANIFEST_FILE, DEFAULT_CHECKPOINT_FILE) or name.endswith(PARTIAL_SUFFIX)
+
+
+def _format_diff(record: Dict[str, Any]) -> str:
+    """Render a diff record in table format"""
+    marker = {ADDED: "+", REMOVED: "-", CHANGED: "~"}[record["status"]]
+    if record["status"] == CHANGED:
+        return f"{marker} {record['key']} ({record['size']} -> {record['dest_size']} bytes)\n"
+    return f"{marker} {record['key']}\n"
 
 
 class OBSManager:
@@ -41,6 +153,13 @@ class OBSManager:
         self.config = Config(config_file)
         self.logger = get_logger(__name__)
         self.client: Optional[ObsClient] = None
+        self.adaptive = self._create_adaptive_concurrency()
+        self.retry = RetryPolicy(
+            max_attempts=self.config.get("retry_max_attempts", 5),
+            base_delay=self.config.get("retry_base_delay", 0.2),
+            max_delay=self.config.get("retry_max_delay", 20),
+            max_elapsed=self.config.get("retry_max_elapsed", 120),
+        )
 
         if not self.config.validate_credentials():
             self.logger.error("Invalid or missing credentials in configuration")
@@ -63,12 +182,51 @@ class OBSManager:
             if region:
                 client_params["region"] = region
 
-            self.client = ObsClient(**client_params)
+            options = self.config.client_options()
+            if self.retry.max_attempts > 1:
+                # The retry policy is the only retry layer: SDK retries would multiply
+                # its attempts and resend at once with a fixed, unjittered backoff
+                options["max_retry_count"] = 0
+            self.client = create_obs_client(ObsClient, client_params, options)
             self.logger.info("OBS client initialized successfully")
         except Exception as e:
             self.logger.error(f"Failed to initialize OBS client: {e}")
             raise
 
+    def _create_adaptive_concurrency(self) -> Optional[AdaptiveConcurrency]:
+        """Build the request concurrency controller from config, or None when disabled"""
+        maximum = self.config.get("adaptive_max_concurrency", 64)
+        if maximum <= 0:
+            return None
+        return AdaptiveConcurrency(
+            initial=self.config.get("adaptive_initial_concurrency", 8),
+            maximum=maximum,
+            latency_target=self.config.get("adaptive_latency_target", 0) or None,
+        )
+
+    def _call(self, operation: str, *args, **kwargs) -> Any:
+        """
+        Send one SDK request
+
+        Every request of every bulk operation goes through here, so the
+        adaptive controller sees all of them and bounds the requests in
+        flight across threads; ``workers`` only caps the thread count.
+        Transient failures are retried by the retry policy, each attempt
+        taking its own slot so that backoff waits do not hold one.
+
+        Args:
+            operation: ObsClient method name
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The SDK response
+        """
+        request = getattr(self.client, operation)
+        if self.adaptive is not None:
+            request = partial(self.adaptive.call, request)
+        return self.retry.call(operation, request, *args, **kwargs)
+
     def _validate_inputs(self, bucket: str, route: str = "") -> Tuple[str, str]:
         """
         Validate and sanitize input parameters
@@ -88,177 +246,483 @@ class OBSManager:
 
         return bucket, route
 
-    def _paginated_list_objects(self, bucket: str, prefix: str = "", max_keys: int = None) -> Generator[Any, None, None]:
+    def _paginated_list_pages(
+        self, bucket: str, prefix: str = "", max_keys: int = None, marker: str = None
+    ) -> Generator[List[Any], None, None]:
         """
-        Generator for paginated object listing
+        Generator for paginated object listing, one page at a time
+
+        A failed page is retried from the last good marker by the retry
+        policy. If it still fails, the error is raised so that a listing
+        never ends early with partial results.
 
         Args:
             bucket: Bucket name
             prefix: Object prefix filter
             max_keys: Maximum keys per request
+            marker: List keys after this one (optional)
 
         Yields:
-            Object content items
+            Lists of object content items, as returned by each request
+
+        Raises:
+            RuntimeError: If a page cannot be listed
         """
         if max_keys is None:
             max_keys = self.config.get("max_keys", 1000)
 
-        marker = None
-
         while True:
             try:
-                resp = self.client.listObjects(bucket, marker=marker, prefix=prefix, max_keys=max_keys)
+                resp = self._call("listObjects", bucket, marker=marker, prefix=prefix, max_keys=max_keys)
+            except Exception as e:
+                raise RuntimeError(f"Failed to list objects in {bucket} after marker {marker!r}: {e}") from e
 
-                if resp.status >= 300:
-                    self.logger.error(f"Failed to list objects: {resp.errorCode} - {resp.errorMessage}")
-                    break
+            if resp.status >= 300:
+                raise RuntimeError(
+                    f"Failed to list objects in {bucket} after marker {marker!r}: {resp.errorCode} - {resp.errorMessage}"
+                )
 
-                for content in resp.body.contents:
-                    yield content
+            yield resp.body.contents
 
-                if not resp.body.is_truncated:
-                    break
+            if not resp.body.is_truncated:
+                break
 
-                marker = resp.body.next_marker
+            marker = resp.body.next_marker
 
-            except Exception as e:
-                self.logger.error(f"Error during object listing: {e}")
-                break
+    def _paginated_list_objects(
+        self,
+        bucket: str,
+        prefix: str = "",
+        max_keys: int = None,
+        marker: str = None,
+        key_filter: ObjectFilter = None,
+    ) -> Generator[Any, None, None]:
+        """
+        Generator for paginated object listing
+
+        Args:
+            bucket: Bucket name
+            prefix: Object prefix filter
+            max_keys: Maximum keys per request
+            marker: List keys after this one (optional)
+            key_filter: Only yield objects matching this filter (optional)
+
+        Yields:
+            Object content items
+        """
+        for page in self._paginated_list_pages(bucket, prefix, max_keys, marker):
+            yield from key_filter.apply(page) if key_filter else page
+
+    def _list_partition(
+        self, bucket: str, prefix: str, marker: Optional[str], end: Optional[str]
+    ) -> Generator[Any, None, None]:
+        """Yield the keys of ``prefix`` after ``marker`` up to and including ``end``"""
+        for content in self._paginated_list_objects(bucket, prefix, marker=marker):
+            if end is not None and content.key > end:
+                return
+            yield content
+
+    def _plan_partitions(self, bucket: str, prefix: str, partitions: int) -> Tuple[List[Tuple], List[Any]]:
+        """
+        Split a prefix into independently listable partitions
+
+        A single delimiter request finds the top-level prefixes; when they fit
+        in one page each one becomes a partition. Otherwise the key space is
+        split into marker ranges on the first character after ``prefix``.
+
+        Args:
+            bucket: Bucket name
+            prefix: Object prefix
+            partitions: Number of ranges for a flat key space
+
+        Returns:
+            Tuple of (partitions as (prefix, marker, end) in key order,
+            objects directly under ``prefix`` already returned by the delimiter request)
+        """
+        resp = self._call("listObjects", bucket, prefix=prefix, delimiter="/", max_keys=self.config.get("max_keys", 1000))
+        if resp.status >= 300:
+            raise RuntimeError(f"Failed to list objects: {resp.errorCode} - {resp.errorMessage}")
+
+        common_prefixes = sorted(item.prefix for item in (resp.body.commonPrefixs or []))
+        if not resp.body.is_truncated and len(common_prefixes) > 1:
+            return [(common, None, None) for common in common_prefixes], list(resp.body.contents or [])
+
+        step = max(1, len(PARTITION_ALPHABET) // max(1, partitions))
+        bounds = [prefix + char for char in PARTITION_ALPHABET[step::step]]
+        # Partition i covers keys in (bounds[i - 1], bounds[i]]
+        markers = [None] + bounds
+        ends = bounds + [None]
+        return [(prefix, marker, end) for marker, end in zip(markers, ends)], []
+
+    def _parallel_list_objects(
+        self,
+        bucket: str,
+        prefix: str = "",
+        workers: int = None,
+        sort: bool = False,
+        partitions: int = None,
+        key_filter: ObjectFilter = None,
+    ) -> Generator[Any, None, None]:
+        """
+        Generator listing a prefix with several concurrent marker chains
+
+        The prefix is split into partitions (top-level prefixes, or character
+        ranges for flat key spaces) that are paged concurrently. Unsorted
+        output yields objects as they arrive; sorted output yields partitions
+        in key order while later partitions are prefetched.
+
+        Args:
+            bucket: Bucket name
+            prefix: Object prefix filter
+            workers: Partitions listed concurrently (default: config list_workers)
+            sort: Yield objects in key order
+            partitions: Number of character ranges for flat key spaces (default: workers * 4)
+            key_filter: Only yield objects matching this filter (optional)
 
-    def list_objects(self, bucket: str, route: str = "") -> int:
+        Yields:
+            Object content items
+        """
+        if key_filter:
+            # Filter the merged stream: partitions must see every key to stop at their range end
+            yield from key_filter.apply(self._parallel_list_objects(bucket, prefix, workers, sort, partitions))
+            return
+
+        if workers is None:
+            workers = self.config.get("list_workers", 1)
+        if workers <= 1:
+            yield from self._paginated_list_objects(bucket, prefix)
+            return
+
+        plan, direct = self._plan_partitions(bucket, prefix, partitions or workers * 4)
+        self.logger.info(f"Listing {bucket}/{prefix} in {len(plan)} partitions with {workers} workers")
+        factories = [partial(self._list_partition, bucket, *partition) for partition in plan]
+
+        if sort:
+            key = lambda content: content.key  # noqa: E731
+            yield from heapq.merge(direct, prefetch_ordered(factories, workers=workers), key=key)
+            return
+
+        yield from direct
+        errors: Dict[str, Exception] = {}
+        sources = [(f"{part_prefix}|{marker or ''}", factory) for (part_prefix, marker, _), factory in zip(plan, factories)]
+        yield from (content for _, content in merge_concurrent(sources, workers=workers, errors=errors))
+        if errors:
+            raise RuntimeError(f"Failed to list {len(errors)} of {len(plan)} partitions of {bucket}/{prefix}")
+
+    def list_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        workers: int = None,
+        sort: bool = True,
+        output: str = "table",
+        quiet: bool = False,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         List objects in bucket
 
         Args:
             bucket: Bucket name
             route: Object route/prefix
+            workers: Partitions listed concurrently (default: config list_workers)
+            sort: Keep key order when listing concurrently
+            output: Output format (table, jsonl, csv or tsv)
+            quiet: Only count objects, without printing them
+            key_filter: Only list objects matching this filter (optional)
 
         Returns:
             Number of objects processed
         """
         bucket, route = self._validate_inputs(bucket, route)
-        count = 0
+        writer = ObjectWriter(LIST_FIELDS, output, quiet=quiet)
+
+        if workers is None:
+            workers = self.config.get("list_workers", 1)
 
         try:
             self.logger.info(f"Listing objects in bucket: {bucket}, prefix: {route}")
 
-            for content in self._paginated_list_objects(bucket, route):
-                print(f"Key: {content.key}")
-                print(f"Last Modified: {content.lastModified}")
-                print(f"Size: {content.size}")
-                print(f"Owner: {content.owner.owner_name}")
-                print(f"Storage Class: {content.storageClass}")
-                print("-" * 50)
-                count += 1
+            if workers > 1:
+                listing = self._parallel_list_objects(bucket, route, workers=workers, sort=sort, key_filter=key_filter)
+            else:
+                listing = self._paginated_list_objects(bucket, route, key_filter=key_filter)
+
+            for content in listing:
+                writer.write(object_record(content))
 
-            self.logger.info(f"Listed {count} objects")
+            self.logger.info(f"Listed {writer.count} objects")
 
         except Exception as e:
             self.logger.error(f"Error listing objects: {e}")
             raise
+        finally:
+            writer.close()
 
-        return count
+        return writer.count
+
+    def export_objects(self, bucket: str, route: str, path: str, export_format: str = None) -> int:
+        """
+        Export a listing to a Parquet, Arrow IPC or gzipped CSV file
+
+        Pages are written as record batches as they arrive, so the export
+        runs in the memory of one page however large the listing is.
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            path: Output file
+            export_format: parquet, arrow or csv.gz (default: from the file extension)
+
+        Returns:
+            Number of objects exported
+        """
+        bucket, route = self._validate_inputs(bucket, route)
+
+        try:
+            self.logger.info(f"Exporting objects in bucket: {bucket}, prefix: {route} to {path}")
+
+            with ListingExporter(path, export_format) as exporter:
+                for page in self._paginated_list_pages(bucket, route):
+                    exporter.write_page(page)
+
+            self.logger.info(f"Exported {exporter.count} objects to {path} ({exporter.export_format})")
+
+        except Exception as e:
+            self.logger.error(f"Error exporting objects: {e}")
+            raise
+
+        return exporter.count
+
+    def _set_storage_class(
+        self, bucket: str, object_key: str, storage_class: str, limiter: Optional[RateLimiter] = None
+    ) -> bool:
+        """
+        Change the storage class of one object
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            storage_class: Target storage class
+            limiter: Per-bucket request rate limiter (optional)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if limiter:
+                limiter.acquire()
+
+            headers = SetObjectMetadataHeader(storageClass=storage_class)
+            resp = self._call("setObjectMetadata", bucket, object_key, headers=headers)
+
+            if resp.status < 300:
+                self.logger.info(f"Successfully changed storage class for: {object_key}")
+                print(f"✓ {object_key} -> {storage_class}")
+                return True
+
+            self.logger.warning(f"Failed to change storage class for {object_key}: {resp.errorCode} - {resp.errorMessage}")
+            print(f"✗ Failed: {object_key}")
+            return False
+
+        except Exception as e:
+            self.logger.error(f"Error changing storage class for {object_key}: {e}")
+            print(f"✗ Error: {object_key} - {e}")
+            return False
 
-    def change_storage_class(self, bucket: str, route: str = "", storage_class: str = "COLD") -> int:
+    def change_storage_class(
+        self,
+        bucket: str,
+        route: str = "",
+        storage_class: str = "COLD",
+        workers: int = None,
+        rate_limit: float = None,
+        plan_only: bool = False,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         Change storage class for objects
 
+        Objects already in the target class are skipped without a request.
+
         Args:
             bucket: Bucket name
             route: Object route/prefix
             storage_class: Target storage class (COLD, WARM, STANDARD)
+            workers: Number of concurrent requests (default: config transition_workers)
+            rate_limit: Maximum requests per second on the bucket (default: config max_requests_per_second)
+            plan_only: Only print how many objects would be changed or skipped
+            key_filter: Only process objects matching this filter (optional)
 
         Returns:
-            Number of objects processed
+            Number of objects processed (objects to change with plan_only)
         """
         bucket, route = self._validate_inputs(bucket, route)
 
         if storage_class not in ["COLD", "WARM", "STANDARD"]:
             raise ValueError("Storage class must be one of: COLD, WARM, STANDARD")
 
-        count = 0
-        success_count = 0
+        if workers is None:
+            workers = self.config.get("transition_workers", 1)
+        if rate_limit is None:
+            rate_limit = self.config.get("max_requests_per_second", 0)
+        limiter = bucket_rate_limiter(bucket, rate_limit)
+        planner = RequestPlanner()
+
+        if plan_only:
+            for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
+                planner.plan_transition(content, storage_class)
+            print(planner.format(f"Plan for changing {bucket}/{route} to {storage_class}:"))
+            return planner.summary()["todo"]
+
+        def transition(content: Any) -> Optional[bool]:
+            if planner.plan_transition(content, storage_class) == SKIP:
+                return None
+            return self._set_storage_class(bucket, content.key, storage_class, limiter)
 
         try:
-            self.logger.info(f"Changing storage class to {storage_class} for bucket: {bucket}, prefix: {route}")
+            self.logger.info(
+                f"Changing storage class to {storage_class} for bucket: {bucket}, prefix: {route}, workers: {workers}"
+            )
 
-            for content in self._paginated_list_objects(bucket, route):
-                count += 1
+            stats = run_worker_pool(
+                self._paginated_list_objects(bucket, route, key_filter=key_filter), transition, workers=workers
+            )
 
-                try:
-                    metadata = {"storageClass": storage_class}
-                    headers = SetObjectMetadataHeader()
+            self.logger.info(
+                f"Processed {stats.processed} objects, {stats.succeeded} successful, {stats.failed} failed, "
+                f"{stats.skipped} already {storage_class}"
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error changing storage class: {e}")
+            raise
+
+        return stats.processed
+
+    def apply_lifecycle(
+        self,
+        bucket: str,
+        route: str = None,
+        workers: int = None,
+        rate_limit: float = None,
+        plan_only: bool = False,
+        rules: List[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Apply age-based storage class rules in one listing pass
+
+        Every listed object is matched against all rules and moved to the
+        coldest class it qualifies for; objects already there (or colder)
+        get no request. Transitions share one pool of concurrent requests.
+
+        Args:
+            bucket: Bucket name
+            route: Restrict the pass to this prefix (default: the prefix shared by all rules)
+            workers: Number of concurrent requests (default: config transition_workers)
+            rate_limit: Maximum requests per second on the bucket (default: config max_requests_per_second)
+            plan_only: Only print how many objects and bytes would move to each class
+            rules: Lifecycle rules (default: config lifecycle_rules)
 
-                    resp = self.client.setObjectMetadata(bucket, content.key, metadata, headers)
+        Returns:
+            Number of objects processed (objects to move with plan_only)
+        """
+        policy = LifecyclePolicy.from_config(rules if rules is not None else self.config.get("lifecycle_rules", []))
+        bucket, route = self._validate_inputs(bucket, policy.listing_prefix() if route is None else route)
+
+        if workers is None:
+            workers = self.config.get("transition_workers", 1)
+        if rate_limit is None:
+            rate_limit = self.config.get("max_requests_per_second", 0)
+        limiter = bucket_rate_limiter(bucket, rate_limit)
+
+        # Concurrent partitions when list_workers > 1
+        listing = self._parallel_list_objects(bucket, route)
+
+        if plan_only:
+            for content in listing:
+                policy.plan(content)
+            print(policy.format(f"Lifecycle plan for {bucket}/{route}:"))
+            return sum(totals["objects"] for totals in policy.summary().values())
+
+        def transition(content: Any) -> Optional[bool]:
+            target = policy.plan(content)
+            if target is None:
+                return None
+            return self._set_storage_class(bucket, content.key, target, limiter)
 
-                    if resp.status < 300:
-                        self.logger.info(f"Successfully changed storage class for: {content.key}")
-                        success_count += 1
-                        print(f"✓ {content.key} -> {storage_class}")
-                    else:
-                        self.logger.warning(f"Failed to change storage class for: {content.key}")
-                        print(f"✗ Failed: {content.key}")
+        try:
+            self.logger.info(f"Applying {len(policy.rules)} lifecycle rules to bucket: {bucket}, prefix: {route}")
 
-                except Exception as e:
-                    self.logger.error(f"Error changing storage class for {content.key}: {e}")
-                    print(f"✗ Error: {content.key} - {e}")
+            stats = run_worker_pool(listing, transition, workers=workers)
 
-            self.logger.info(f"Processed {count} objects, {success_count} successful")
+            moved = ", ".join(
+                f"{totals['objects']} to {name} ({totals['bytes']} bytes)" for name, totals in policy.summary().items()
+            )
+            self.logger.info(
+                f"Processed {stats.processed} objects, {stats.succeeded} successful, {stats.failed} failed, "
+                f"{stats.skipped} unchanged. Planned: {moved or 'nothing'}"
+            )
 
         except Exception as e:
-            self.logger.error(f"Error changing storage class: {e}")
+            self.logger.error(f"Error applying lifecycle rules: {e}")
             raise
 
-        return count
-
-    def restore_objects(self, bucket: str, route: str = "", days: int = None, tier: str = None) -> int:
+        return stats.processed
+
+    def restore_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        days: int = None,
+        tier: str = None,
+        plan_only: bool = False,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         Restore archived objects
 
+        Objects that are not archived, already restored or being restored
+        are skipped without a restore request.
+
         Args:
             bucket: Bucket name
             route: Object route/prefix
             days: Number of days to keep restored
             tier: Restore tier (Expedited, Standard, Bulk)
+            plan_only: Only print how many objects would be restored, are pending or skipped
+            key_filter: Only process objects matching this filter (optional)
 
         Returns:
-            Number of objects processed
+            Number of objects processed (objects to restore with plan_only)
         """
         bucket, route = self._validate_inputs(bucket, route)
 
-        if days is None:
-            days = self.config.get("restore_days", 30)
-        if tier is None:
-            tier = self.config.get("restore_tier", "Expedited")
-
-        if tier not in ["Expedited", "Standard", "Bulk"]:
-            raise ValueError("Restore tier must be one of: Expedited, Standard, Bulk")
+        days, tier = self._restore_request_settings(days, tier)
 
         count = 0
         success_count = 0
+        planner = RequestPlanner(partial(self._restore_state, bucket))
+
+        if plan_only:
+            for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
+                planner.plan_restore(content)
+            print(planner.format(f"Plan for restoring {bucket}/{route}:"))
+            return planner.summary()["todo"]
 
         try:
             self.logger.info(f"Restoring objects for {days} days with {tier} tier in bucket: {bucket}, prefix: {route}")
 
-            for content in self._paginated_list_objects(bucket, route):
+            for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
                 count += 1
+                if planner.plan_restore(content) == TODO and self._restore_object(bucket, content.key, days, tier):
+                    success_count += 1
 
-                try:
-                    resp = self.client.restoreObject(bucket, content.key, days, tier)
-
-                    if resp.status < 300:
-                        self.logger.info(f"Successfully initiated restore for: {content.key}")
-                        success_count += 1
-                        print(f"✓ Restore initiated: {content.key}")
-                    else:
-                        self.logger.warning(f"Failed to restore: {content.key}")
-                        print(f"✗ Failed: {content.key}")
-
-                except Exception as e:
-                    self.logger.error(f"Error restoring {content.key}: {e}")
-                    print(f"✗ Error: {content.key} - {e}")
-
-            self.logger.info(f"Processed {count} objects, {success_count} restore requests initiated")
+            summary = planner.summary()
+            self.logger.info(
+                f"Processed {count} objects, {success_count} restore requests initiated, "
+                f"{summary['pending']} already in progress, {summary['skipped']} skipped"
+            )
 
         except Exception as e:
             self.logger.error(f"Error restoring objects: {e}")
@@ -266,164 +730,1713 @@ class OBSManager:
 
         return count
 
-    def download_objects(self, bucket: str, route: str = "", download_path: str = None) -> int:
+    def _restore_object(self, bucket: str, object_key: str, days: int, tier: str) -> bool:
         """
-        Download objects from bucket
+        Send the restore request for one object
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            days: Number of days to keep restored
+            tier: Restore tier
+
+        Returns:
+            True if the restore was initiated (or is already in progress), False otherwise
+        """
+        try:
+            resp = self._call("restoreObject", bucket, object_key, days, tier)
+
+            if resp.status < 300:
+                self.logger.info(f"Successfully initiated restore for: {object_key}")
+                print(f"✓ Restore initiated: {object_key}")
+                return True
+            if resp.status == 409:
+                self.logger.info(f"Restore already in progress for: {object_key}")
+                return True
+
+            self.logger.warning(f"Failed to restore: {object_key}")
+            print(f"✗ Failed: {object_key}")
+
+        except Exception as e:
+            self.logger.error(f"Error restoring {object_key}: {e}")
+            print(f"✗ Error: {object_key} - {e}")
+
+        return False
+
+    def _restore_state(self, bucket: str, object_key: str) -> Optional[str]:
+        """
+        Get the restore state of one object from its metadata
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+
+        Returns:
+            RESTORE_ONGOING, RESTORE_COMPLETED, or None if no restore was requested
+        """
+        resp = self._call("getObjectMetadata", bucket, object_key)
+        if resp.status >= 300:
+            raise RuntimeError(f"Failed to get metadata for {object_key}: {resp.errorCode} - {resp.errorMessage}")
+        return restore_status(getattr(resp.body, "restore", None))
+
+    def restore_download_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        download_path: str = None,
+        days: int = None,
+        tier: str = None,
+        workers: int = None,
+        part_workers: int = None,
+        poll_interval: float = None,
+        max_poll_interval: float = None,
+        max_wait: float = None,
+        plan_only: bool = False,
+        key_filter: ObjectFilter = None,
+    ) -> int:
+        """
+        Restore archived objects and download each one as soon as it is readable
+
+        Restore requests are sent concurrently while objects that are not
+        archived, or are already restored, go straight to the download pool.
+        Restores already in progress are only polled. Pending restores are then
+        polled through object metadata with exponential backoff per object;
+        when one restore completes, the remaining objects are checked again
+        at the base interval since restores of a batch tend to finish
+        together. Each restored object is downloaded immediately.
 
         Args:
             bucket: Bucket name
             route: Object route/prefix
-            download_path: Local download path (optional)
+            download_path: Local download directory (optional)
+            days: Number of days to keep restored (default: config restore_days)
+            tier: Restore tier (default: config restore_tier)
+            workers: Concurrent restore requests, status checks and downloads
+                     (default: config download_workers)
+            part_workers: Concurrent ranged GETs for large objects (default: config download_part_workers)
+            poll_interval: Initial seconds between status checks (default: config restore_poll_interval)
+            max_poll_interval: Maximum seconds between status checks (default: config restore_max_poll_interval)
+            max_wait: Seconds to wait for restores before giving up (default: config restore_max_wait)
+            plan_only: Only print how many objects need a restore, are pending or readable
+            key_filter: Only process objects matching this filter (optional)
 
         Returns:
-            Number of objects downloaded
+            Number of objects downloaded (objects to restore with plan_only)
         """
         bucket, route = self._validate_inputs(bucket, route)
-        count = 0
-        success_count = 0
+
+        days, tier = self._restore_request_settings(days, tier)
+        if workers is None:
+            workers = self.config.get("download_workers", 1)
+        poll_interval, max_poll_interval, max_wait = self._restore_poll_settings(poll_interval, max_poll_interval, max_wait)
+
+        planner = RequestPlanner(partial(self._restore_state, bucket))
+        if plan_only:
+            return self._plan_restores(planner, bucket, route, key_filter, "restoring and downloading")
+
+        download_stats = TaskStats()
+        download_queue: queue.Queue = queue.Queue()
+        downloader = self._start_download_pool(bucket, download_queue, download_path, workers, part_workers, download_stats)
+        pending: List[Any] = []
+        pending_lock = threading.Lock()
+
+        def request_restore(content: Any) -> Optional[bool]:
+            decision = planner.plan_restore(content)
+            if decision == SKIP:
+                download_queue.put(content)
+                return None
+            if decision == TODO and not self._restore_object(bucket, content.key, days, tier):
+                return False
+            with pending_lock:
+                pending.append(content)
+            return True
 
         try:
-            self.logger.info(f"Downloading objects from bucket: {bucket}, prefix: {route}")
+            self.logger.info(f"Restoring and downloading objects from bucket: {bucket}, prefix: {route}, tier: {tier}")
+
+            restore_stats = run_worker_pool(
+                self._paginated_list_objects(bucket, route, key_filter=key_filter), request_restore, workers=workers
+            )
+            summary = planner.summary()
+            self.logger.info(
+                f"Restore requested for {summary['todo']} objects ({restore_stats.failed} failed), "
+                f"{summary['pending']} already in progress, {restore_stats.skipped} readable without restore"
+            )
+
+            timed_out = self._await_restores(
+                bucket, pending, download_queue.put, workers, poll_interval, max_poll_interval, max_wait
+            )
+            for content in timed_out:
+                print(f"✗ Restore not completed within {max_wait}s: {content.key}")
+
+        finally:
+            download_queue.put(None)
+            downloader.join()
+
+        self.logger.info(f"Downloaded {download_stats.succeeded} objects, {download_stats.failed} downloads failed")
+        return download_stats.succeeded
+
+    def _start_download_pool(
+        self,
+        bucket: str,
+        download_queue: queue.Queue,
+        download_path: Optional[str],
+        workers: int,
+        part_workers: Optional[int],
+        stats: TaskStats,
+    ) -> threading.Thread:
+        """
+        Start a thread downloading the listing entries put on a queue until it receives None
 
-            for content in self._paginated_list_objects(bucket, route):
-                count += 1
+        Returns:
+            The started thread; join it after putting None on the queue
+        """
 
-                try:
-                    local_path = download_path or content.key
+        def download(content: Any) -> bool:
+            return self._download_object(
+                bucket,
+                content.key,
+                self._local_path_for(content.key, download_path),
+                size=content.size,
+                etag=content.etag,
+                part_workers=part_workers,
+            )
+
+        downloader = threading.Thread(
+            target=run_worker_pool,
+            args=(iter(download_queue.get, None), download),
+            kwargs={"workers": workers, "stats": stats},
+            name="obs-restore-downloads",
+            daemon=True,
+        )
+        downloader.start()
+        return downloader
+
+    def _restore_request_settings(self, days: Optional[int], tier: Optional[str]) -> Tuple[int, str]:
+        """Fill in the restore duration and tier from the configuration, rejecting unknown tiers"""
+        if days is None:
+            days = self.config.get("restore_days", 30)
+        if tier is None:
+            tier = self.config.get("restore_tier", "Expedited")
+        if tier not in ["Expedited", "Standard", "Bulk"]:
+            raise ValueError("Restore tier must be one of: Expedited, Standard, Bulk")
+        return days, tier
+
+    def _restore_poll_settings(
+        self, poll_interval: Optional[float], max_poll_interval: Optional[float], max_wait: Optional[float]
+    ) -> Tuple[float, float, float]:
+        """Fill in restore polling settings not given from the configuration"""
+        if poll_interval is None:
+            poll_interval = self.config.get("restore_poll_interval", 30)
+        if max_poll_interval is None:
+            max_poll_interval = self.config.get("restore_max_poll_interval", 600)
+        if max_wait is None:
+            max_wait = self.config.get("restore_max_wait", 86400)
+        return poll_interval, max_poll_interval, max_wait
+
+    def _plan_restores(
+        self, planner: RequestPlanner, bucket: str, route: str, key_filter: Optional[ObjectFilter], action: str
+    ) -> int:
+        """Print how many listed objects need a restore, are pending or readable, returning the restores needed"""
+        for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
+            planner.plan_restore(content)
+        print(planner.format(f"Plan for {action} {bucket}/{route}:"))
+        return planner.summary()["todo"]
+
+    def _await_restores(
+        self,
+        bucket: str,
+        pending: List[Any],
+        on_restored: Callable[[Any], None],
+        workers: int,
+        poll_interval: float,
+        max_poll_interval: float,
+        max_wait: float,
+    ) -> List[Any]:
+        """
+        Poll restore status until every object is restored or ``max_wait`` expires
 
-                    # Create directory if needed
-                    local_dir = os.path.dirname(local_path)
-                    if local_dir and not os.path.exists(local_dir):
-                        os.makedirs(local_dir)
+        Args:
+            bucket: Bucket name
+            pending: Listing entries with a restore in progress
+            on_restored: Callable receiving each entry once its restore completes
+            workers: Concurrent status checks
+            poll_interval: Initial seconds between checks of one object
+            max_poll_interval: Maximum seconds between checks of one object
+            max_wait: Seconds to wait before giving up
 
-                    resp = self.client.getObject(bucket, content.key, downloadPath=local_path)
+        Returns:
+            Entries whose restore did not complete in time
+        """
+        deadline = time.monotonic() + max_wait
+        schedule = PollSchedule(pending, poll_interval, max_poll_interval)
 
-                    if resp.status < 300:
-                        self.logger.info(f"Successfully downloaded: {content.key}")
-                        success_count += 1
-                        print(f"✓ Downloaded: {content.key} -> {local_path}")
-                    else:
-                        self.logger.warning(f"Failed to download: {content.key}")
-                        print(f"✗ Failed: {content.key}")
+        while schedule and schedule.wait(deadline):
+            restored, still_pending = self._check_restores(bucket, schedule.due(), workers)
 
-                except Exception as e:
-                    self.logger.error(f"Error downloading {content.key}: {e}")
-                    print(f"✗ Error: {content.key} - {e}")
+            for content in restored:
+                self.logger.info(f"Restore completed: {content.key}")
+                on_restored(content)
 
-            self.logger.info(f"Processed {count} objects, {success_count} downloaded successfully")
+            if restored:
+                # Restores of one batch finish close together: check the rest sooner
+                schedule.reset()
+            for interval, content in still_pending:
+                schedule.reschedule(interval, content, backoff=not restored)
 
-        except Exception as e:
-            self.logger.error(f"Error downloading objects: {e}")
-            raise
+        return schedule.items()
 
-        return count
+    def _check_restores(
+        self, bucket: str, due: List[Tuple[float, Any]], workers: int
+    ) -> Tuple[List[Any], List[Tuple[float, Any]]]:
+        """
+        Check the restore status of a batch of entries concurrently
+
+        Args:
+            bucket: Bucket name
+            due: (interval, entry) pairs to check
+            workers: Concurrent status checks
 
-    def download_single_file(self, bucket: str, object_key: str, download_path: str = None) -> bool:
+        Returns:
+            Tuple of (restored entries, (interval, entry) pairs still pending)
         """
-        Download a single file
+        restored: List[Any] = []
+        still_pending: List[Tuple[float, Any]] = []
+        lock = threading.Lock()
+
+        def check(entry: Tuple[float, Any]) -> bool:
+            interval, content = entry
+            try:
+                state = self._restore_state(bucket, content.key)
+            except Exception as e:
+                self.logger.warning(f"Could not check restore status of {content.key}: {e}")
+                state = RESTORE_ONGOING
+            with lock:
+                if state == RESTORE_COMPLETED:
+                    restored.append(content)
+                else:
+                    still_pending.append((interval, content))
+            return True
+
+        run_worker_pool(due, check, workers=workers)
+        return restored, still_pending
+
+    def _local_path_for(self, object_key: str, download_path: str = None) -> str:
+        """
+        Build the local file path for an object key
+
+        Args:
+            object_key: Object key
+            download_path: Local download directory (optional)
+
+        Returns:
+            Local file path
+        """
+        if not download_path:
+            return object_key
+        return os.path.join(download_path, object_key.replace("/", os.sep))
+
+    def _download_object(
+        self,
+        bucket: str,
+        object_key: str,
+        local_path: str,
+        size: int = None,
+        etag: str = None,
+        part_workers: int = None,
+        checkpoint: Optional[DownloadCheckpoint] = None,
+    ) -> bool:
+        """
+        Download one object to a local path
+
+        Objects larger than ``multipart_download_threshold`` are fetched with
+        parallel ranged GETs when ``part_workers`` is greater than one.
 
         Args:
             bucket: Bucket name
             object_key: Object key to download
-            download_path: Local download path (optional)
+            local_path: Local file path
+            size: Object size in bytes, if known from the listing
+            etag: Object ETag, if known from the listing
+            part_workers: Concurrent ranged GETs per object (default: config download_part_workers)
+            checkpoint: Journal to record completed work in (optional)
 
         Returns:
             True if successful, False otherwise
         """
-        bucket, object_key = self._validate_inputs(bucket, object_key)
+        if part_workers is None:
+            part_workers = self.config.get("download_part_workers", 4)
 
         try:
-            local_path = download_path or object_key
-
             # Create directory if needed
             local_dir = os.path.dirname(local_path)
-            if local_dir and not os.path.exists(local_dir):
-                os.makedirs(local_dir)
-
-            resp = self.client.getObject(bucket, object_key, downloadPath=local_path)
+            if local_dir:
+                os.makedirs(local_dir, exist_ok=True)
 
-            if resp.status < 300:
+            threshold = self.config.get("multipart_download_threshold", DEFAULT_MULTIPART_THRESHOLD)
+            if part_workers > 1 and size is not None and size > threshold:
+                success = self._download_ranged(bucket, object_key, local_path, size, etag, part_workers, checkpoint)
+            else:
+                resp = self._call("getObject", bucket, object_key, downloadPath=local_path)
+                success = resp.status < 300
+                if not success:
+                    self.logger.warning(f"Failed to download {object_key}: {resp.errorCode} - {resp.errorMessage}")
+
+            if success:
+                if checkpoint:
+                    checkpoint.mark_done(object_key)
                 self.logger.info(f"Successfully downloaded: {object_key}")
                 print(f"✓ Downloaded: {object_key} -> {local_path}")
-                return True
             else:
-                self.logger.error(f"Failed to download {object_key}: {resp.errorCode} - {resp.errorMessage}")
                 print(f"✗ Failed: {object_key}")
-                return False
+            return success
 
         except Exception as e:
             self.logger.error(f"Error downloading {object_key}: {e}")
             print(f"✗ Error: {object_key} - {e}")
             return False
 
-    def search_objects(self, search_text: str, bucket: str = "", route: str = "") -> int:
+    def _checkpointed_listing(
+        self, bucket: str, route: str, checkpoint: Optional[DownloadCheckpoint], key_filter: ObjectFilter = None
+    ) -> Generator[Any, None, None]:
+        """List objects to download, resuming after the checkpoint's marker and retrying the keys that failed"""
+        if checkpoint is None:
+            yield from self._paginated_list_objects(bucket, route, key_filter=key_filter)
+            return
+
+        marker = checkpoint.marker
+        # Failed keys behind the marker are not listed again
+        yield from self._retry_entries(bucket, checkpoint.failed_keys())
+        for content in self._paginated_list_objects(bucket, route, marker=marker, key_filter=key_filter):
+            checkpoint.listed(content.key)
+            yield content
+
+    def _retry_entries(self, bucket: str, keys: List[str]) -> Generator[Any, None, None]:
         """
-        Search for objects by name
-
-        Args:
-            search_text: Text to search for in object names
-            bucket: Bucket name (empty to search all buckets)
-            route: Object route/prefix
+        Build listing-like entries for keys to download again, from their metadata
 
-        Returns:
-            Number of matching objects found
+        An entry whose metadata cannot be read keeps an unknown size and ETag,
+        so its download is still attempted (and reported) with a plain GET.
         """
-        if not search_text:
-            raise ValueError("Search text is required")
-
-        search_text = search_text.lower()
-        count = 0
-
-        try:
-            if not bucket:
-                # Search in all buckets
-                resp = self.client.listBuckets(True)
+        for key in keys:
+            size = etag = None
+            try:
+                resp = self._call("getObjectMetadata", bucket, key)
                 if resp.status < 300:
-                    for bucket_info in resp.body.buckets:
-                        count += self._search_in_bucket(bucket_info.name, route, search_text)
-                else:
-                    self.logger.error(f"Failed to list buckets: {resp.errorCode} - {resp.errorMessage}")
-            else:
-                # Search in specific bucket
-                bucket, route = self._validate_inputs(bucket, route)
-                count = self._search_in_bucket(bucket, route, search_text)
-
-            self.logger.info(f"Search completed. Found {count} matching objects")
-
-        except Exception as e:
-            self.logger.error(f"Error during search: {e}")
-            raise
-
-        return count
+                    size = int(resp.body.contentLength)
+                    etag = resp.body.etag
+            except Exception as e:
+                self.logger.warning(f"Could not read metadata of {key} to retry it: {e}")
+            yield SimpleNamespace(key=key, size=size, etag=etag)
 
-    def _search_in_bucket(self, bucket: str, route: str, search_text: str) -> int:
+    def _download_range(self, bucket: str, object_key: str, temp_path: str, byte_range: Tuple[int, int], etag: str) -> bool:
         """
-        Search for objects in a specific bucket
+        Download one byte range of an object into a preallocated file
 
         Args:
             bucket: Bucket name
-            route: Object route/prefix
-            search_text: Text to search for (lowercase)
+            object_key: Object key
+            temp_path: Preallocated temporary file
+            byte_range: Inclusive (start, end) byte offsets
+            etag: Expected ETag, sent as If-Match so every part comes from the same version
 
         Returns:
-            Number of matching objects found
+            True if the full range was written, False otherwise
         """
-        count = 0
-
+        start, end = byte_range
         try:
+            headers = GetObjectHeader(range=f"{start}-{end}", if_match=etag)
+            resp = self._call("getObject", bucket, object_key, headers=headers)
+
+            if resp.status >= 300:
+                self.logger.warning(
+                    f"Failed to download range {start}-{end} of {object_key}: {resp.errorCode} - {resp.errorMessage}"
+                )
+                return False
+
+            chunk_size = self.config.get("chunk_size", DEFAULT_CHUNK_SIZE)
+            stream = resp.body.response
+            written = 0
+            try:
+                with open(temp_path, "r+b") as f:
+                    f.seek(start)
+                    while True:
+                        chunk = stream.read(chunk_size)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        written += len(chunk)
+            finally:
+                stream.close()
+
+            if written != end - start + 1:
+                self.logger.warning(f"Short read for range {start}-{end} of {object_key}: {written} bytes")
+                return False
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error downloading range {start}-{end} of {object_key}: {e}")
+            return False
+
+    def _download_ranged(
+        self,
+        bucket: str,
+        object_key: str,
+        local_path: str,
+        size: int,
+        etag: str = None,
+        part_workers: int = 4,
+        checkpoint: Optional[DownloadCheckpoint] = None,
+    ) -> bool:
+        """
+        Download a large object with concurrent ranged GETs
+
+        Parts are written at their offsets into a preallocated temporary file,
+        which is renamed into place only after its size and ETag check out.
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            local_path: Final local file path
+            size: Object size in bytes
+            etag: Object ETag (optional)
+            part_workers: Concurrent ranged GETs
+            checkpoint: Journal of completed ranges, kept across interrupted runs (optional)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        part_size = self.config.get("download_part_size", DEFAULT_PART_SIZE)
+        temp_path = f"{local_path}{PARTIAL_SUFFIX}"
+
+        if checkpoint and os.path.exists(temp_path) and os.path.getsize(temp_path) == size:
+            ranges = checkpoint.pending_ranges(object_key, etag, size, part_size)
+        else:
+            with open(temp_path, "wb") as f:
+                f.truncate(size)
+            ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+        self.logger.info(f"Downloading {object_key} in {len(ranges)} parts with {part_workers} workers")
+
+        def fetch(byte_range: Tuple[int, int]) -> bool:
+            success = self._download_range(bucket, object_key, temp_path, byte_range, etag)
+            if success and checkpoint:
+                checkpoint.mark_range(object_key, etag, size, *byte_range)
+            return success
+
+        stats = run_worker_pool(ranges, fetch, workers=part_workers)
+
+        if stats.failed:
+            self.logger.warning(f"Ranged download of {object_key} failed ({stats.failed} of {len(ranges)} parts failed)")
+            # Keep completed parts on disk when a checkpoint can resume them
+            if not checkpoint:
+                os.remove(temp_path)
+            return False
+
+        if not self._verify_download(temp_path, object_key, size, etag):
+            os.remove(temp_path)
+            return False
+
+        os.replace(temp_path, local_path)
+        return True
+
+    def _verify_download(self, file_path: str, object_key: str, size: int, etag: str = None) -> bool:
+        """
+        Verify a downloaded file against the object's size and ETag
+
+        Only single-part ETags are plain MD5 digests; multipart ETags are
+        covered by the If-Match condition on every ranged request.
+
+        Args:
+            file_path: Local file to verify
+            object_key: Object key (for logging)
+            size: Expected size in bytes
+            etag: Expected ETag (optional)
+
+        Returns:
+            True if the file matches, False otherwise
+        """
+        actual_size = os.path.getsize(file_path)
+        if actual_size != size:
+            self.logger.error(f"Size mismatch for {object_key}: expected {size}, got {actual_size}")
+            return False
+
+        expected_md5 = md5_from_etag(etag)
+        if expected_md5:
+            actual_md5 = file_md5(file_path)
+            if actual_md5 != expected_md5:
+                self.logger.error(f"ETag mismatch for {object_key}: expected {expected_md5}, got {actual_md5}")
+                return False
+
+        return True
+
+    def download_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        download_path: str = None,
+        workers: int = None,
+        part_workers: int = None,
+        resume: bool = False,
+        checkpoint_path: str = None,
+        key_filter: ObjectFilter = None,
+    ) -> int:
+        """
+        Download objects from bucket
+
+        The listing feeds a bounded queue consumed by ``workers`` threads that
+        share this manager's ObsClient. When downloading into a directory,
+        progress is journaled to a checkpoint file so that an interrupted run
+        can continue with ``resume=True`` from the last listing marker. Keys
+        that failed are recorded too and retried first when resuming.
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            download_path: Local download directory (optional)
+            workers: Number of concurrent downloads (default: config download_workers)
+            part_workers: Concurrent ranged GETs for large objects (default: config download_part_workers)
+            resume: Skip work recorded in an existing checkpoint
+            checkpoint_path: Checkpoint file (default: download_path/.obs_download_checkpoint.jsonl)
+            key_filter: Only download objects matching this filter (optional)
+
+        Returns:
+            Number of objects processed
+        """
+        bucket, route = self._validate_inputs(bucket, route)
+
+        if workers is None:
+            workers = self.config.get("download_workers", 1)
+
+        checkpoint = None
+        if checkpoint_path is None and download_path and self.config.get("download_checkpoint", True):
+            checkpoint_path = os.path.join(download_path, DEFAULT_CHECKPOINT_FILE)
+        if checkpoint_path:
+            checkpoint = DownloadCheckpoint(checkpoint_path, bucket, route, resume=resume)
+
+        def download(content: Any) -> Optional[bool]:
+            if checkpoint and checkpoint.is_done(content.key):
+                return None
+            success = self._download_object(
+                bucket,
+                content.key,
+                self._local_path_for(content.key, download_path),
+                size=content.size,
+                etag=content.etag,
+                part_workers=part_workers,
+                checkpoint=checkpoint,
+            )
+            if not success and checkpoint:
+                checkpoint.mark_failed(content.key)
+            return success
+
+        stats = None
+        try:
+            self.logger.info(f"Downloading objects from bucket: {bucket}, prefix: {route}, workers: {workers}")
+
+            stats = run_worker_pool(
+                self._checkpointed_listing(bucket, route, checkpoint, key_filter), download, workers=workers
+            )
+
+            self.logger.info(
+                f"Processed {stats.processed} objects, {stats.succeeded} downloaded successfully, "
+                f"{stats.skipped} already completed"
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error downloading objects: {e}")
+            raise
+
+        finally:
+            if checkpoint:
+                completed = stats is not None and stats.failed == 0
+                checkpoint.close(completed=completed)
+                if not completed:
+                    print(f"Checkpoint saved to {checkpoint.path}. Run again with --resume to continue.")
+
+        return stats.processed
+
+    def download_single_file(self, bucket: str, object_key: str, download_path: str = None, part_workers: int = None) -> bool:
+        """
+        Download a single file
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key to download
+            download_path: Local download path (optional)
+            part_workers: Concurrent ranged GETs for large objects (default: config download_part_workers)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        bucket, object_key = self._validate_inputs(bucket, object_key)
+
+        if part_workers is None:
+            part_workers = self.config.get("download_part_workers", 4)
+
+        size = etag = None
+        try:
+            if part_workers > 1:
+                resp = self._call("getObjectMetadata", bucket, object_key)
+                if resp.status < 300:
+                    size = int(resp.body.contentLength)
+                    etag = resp.body.etag
+                else:
+                    self.logger.error(f"Failed to get metadata for {object_key}: {resp.errorCode} - {resp.errorMessage}")
+                    print(f"✗ Failed: {object_key}")
+                    return False
+        except Exception as e:
+            self.logger.error(f"Error downloading {object_key}: {e}")
+            print(f"✗ Error: {object_key} - {e}")
+            return False
+
+        local_path = download_path or object_key
+        return self._download_object(bucket, object_key, local_path, size=size, etag=etag, part_workers=part_workers)
+
+    def _sync_action(
+        self, content: Any, local_path: str, entry: Optional[Dict], direction: str, prefer: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Decide how to reconcile a listed object with its local file
+
+        A local file whose size and mtime match the manifest is unchanged
+        without reading it; otherwise it is rehashed and compared with the
+        recorded MD5, so touched but identical files are not transferred.
+        The remote side changed when its ETag differs from the manifest.
+        Without a manifest entry, a file with the listing's size and mtime
+        (or a single-part ETag's MD5) is taken as identical.
+
+        Args:
+            content: Listing entry
+            local_path: Local file path
+            entry: Manifest entry for the key (optional)
+            direction: SYNC_DOWNLOAD, SYNC_UPLOAD or SYNC_BOTH
+            prefer: Conflict resolution when both sides changed (newer, local or remote)
+
+        Returns:
+            Tuple of (SYNC_DOWNLOAD, SYNC_UPLOAD, SYNC_RECORD or None for nothing to do,
+            local MD5 if known)
+        """
+        try:
+            stat = os.stat(local_path)
+        except OSError:
+            return (SYNC_DOWNLOAD if direction != SYNC_UPLOAD else None), None
+
+        if entry is None:
+            remote_mtime = parse_last_modified(content.lastModified)
+            if stat.st_size == content.size and remote_mtime is not None and int(stat.st_mtime) == int(remote_mtime):
+                return SYNC_RECORD, md5_from_etag(content.etag)
+            md5 = file_md5(local_path)
+            if md5 == md5_from_etag(content.etag):
+                return SYNC_RECORD, md5
+            local_changed = remote_changed = True
+        else:
+            remote_changed = entry.get("etag") != content.etag
+            if entry.get("size") == stat.st_size and entry.get("mtime") == int(stat.st_mtime):
+                md5 = entry.get("md5")
+                local_changed = False
+                if not remote_changed:
+                    return None, md5
+            else:
+                md5 = file_md5(local_path)
+                local_changed = md5 != entry.get("md5")
+
+        return self._choose_sync_action(content, stat.st_mtime, local_changed, remote_changed, direction, prefer), md5
+
+    def _choose_sync_action(
+        self, content: Any, local_mtime: float, local_changed: bool, remote_changed: bool, direction: str, prefer: str
+    ) -> str:
+        """Pick the transfer for a key from which sides changed since the last sync"""
+        if direction == SYNC_DOWNLOAD:
+            return SYNC_DOWNLOAD if local_changed or remote_changed else SYNC_RECORD
+        if direction == SYNC_UPLOAD:
+            return SYNC_UPLOAD if local_changed or remote_changed else SYNC_RECORD
+        if local_changed and remote_changed:
+            return self._resolve_conflict(content, local_mtime, prefer)
+        if local_changed:
+            return SYNC_UPLOAD
+        if remote_changed:
+            return SYNC_DOWNLOAD
+        return SYNC_RECORD
+
+    def _resolve_conflict(self, content: Any, local_mtime: float, prefer: str) -> str:
+        """Pick the side that wins when an object changed both locally and in the bucket"""
+        if prefer == "local":
+            action = SYNC_UPLOAD
+        elif prefer == "remote":
+            action = SYNC_DOWNLOAD
+        else:
+            remote_mtime = parse_last_modified(content.lastModified) or 0
+            action = SYNC_UPLOAD if local_mtime > remote_mtime else SYNC_DOWNLOAD
+        kept = "local" if action == SYNC_UPLOAD else "remote"
+        self.logger.warning(f"Conflict on {content.key}: changed on both sides, keeping the {kept} copy")
+        return action
+
+    def _find_orphans(self, download_path: str, route: str, listed_keys: set) -> List[str]:
+        """
+        Find local files under the synced prefix that no longer exist in the bucket
+
+        Args:
+            download_path: Local mirror directory
+            route: Object route/prefix that was synced
+            listed_keys: Keys returned by the listing
+
+        Returns:
+            List of orphaned local file paths
+        """
+        orphans = []
+        for root, _, files in os.walk(download_path):
+            for name in files:
+                if _is_transfer_artifact(name):
+                    continue
+                local_path = os.path.join(root, name)
+                key = os.path.relpath(local_path, download_path).replace(os.sep, "/")
+                if key.startswith(route) and key not in listed_keys:
+                    orphans.append(local_path)
+        return orphans
+
+    @staticmethod
+    def _validate_sync_options(direction: str, prefer: str, delete_orphans: bool) -> None:
+        """Reject unknown sync directions and conflict preferences"""
+        if direction not in SYNC_DIRECTIONS:
+            raise ValueError(f"Sync direction must be one of: {', '.join(SYNC_DIRECTIONS)}")
+        if prefer not in ("newer", "local", "remote"):
+            raise ValueError("Conflict preference must be one of: newer, local, remote")
+        if delete_orphans and direction != SYNC_DOWNLOAD:
+            raise ValueError("delete_orphans is only supported when syncing in the download direction")
+
+    def _sync_local_only(self, download_path: str, route: str, direction: str) -> Dict[str, Tuple[str, int]]:
+        """
+        Plan uploads: local files under the prefix, keyed by object key
+
+        Keys found by the listing are removed as it runs, leaving the files
+        that do not exist in the bucket yet. Empty in the download direction.
+        """
+        local_only: Dict[str, Tuple[str, int]] = {}
+        if direction != SYNC_DOWNLOAD and os.path.isdir(download_path):
+            for local_path, size in self._local_files(download_path):
+                key = self._key_for(local_path, download_path)
+                if key.startswith(route):
+                    local_only[key] = (local_path, size)
+        return local_only
+
+    @staticmethod
+    def _record_synced(
+        manifest: SyncManifest, key: str, local_path: str, md5: Optional[str], etag: str, last_modified: Optional[str]
+    ) -> None:
+        """Record the state of a key both sides agree on"""
+        stat = os.stat(local_path)
+        manifest.update(
+            key,
+            size=stat.st_size,
+            etag=etag,
+            last_modified=last_modified,
+            mtime=int(stat.st_mtime),
+            md5=md5 or file_md5(local_path),
+        )
+
+    def _sync_upload(self, bucket: str, key: str, local_path: str, md5: Optional[str], manifest: SyncManifest) -> bool:
+        """Upload one file during a sync and record it"""
+        etag = self._upload_file(bucket, key, local_path, md5=md5)
+        if etag is None:
+            return False
+        self._record_synced(manifest, key, local_path, md5, etag, None)
+        return True
+
+    def _sync_object(
+        self, bucket: str, content: Any, download_path: str, manifest: SyncManifest, direction: str, prefer: str
+    ) -> Optional[bool]:
+        """
+        Reconcile one listed object with its local file
+
+        Returns:
+            True if transferred, False if the transfer failed, None if nothing was transferred
+        """
+        local_path = self._local_path_for(content.key, download_path)
+        action, md5 = self._sync_action(content, local_path, manifest.get(content.key), direction, prefer)
+
+        if action is None:
+            return None
+        if action == SYNC_RECORD:
+            self._record_synced(manifest, content.key, local_path, md5, content.etag, content.lastModified)
+            return None
+        if action == SYNC_UPLOAD:
+            return self._sync_upload(bucket, content.key, local_path, md5, manifest)
+
+        if not self._download_object(bucket, content.key, local_path, size=content.size, etag=content.etag):
+            return False
+
+        remote_mtime = parse_last_modified(content.lastModified)
+        if remote_mtime is not None:
+            os.utime(local_path, (remote_mtime, remote_mtime))
+        self._record_synced(manifest, content.key, local_path, md5_from_etag(content.etag), content.etag, content.lastModified)
+        return True
+
+    def _sync_orphans(
+        self, download_path: str, route: str, listed_keys: set, manifest: SyncManifest, delete_orphans: bool
+    ) -> int:
+        """
+        Report (and optionally delete) local files whose objects no longer exist
+
+        Returns:
+            Number of orphans found
+        """
+        orphans = self._find_orphans(download_path, route, listed_keys)
+        for local_path in orphans:
+            key = os.path.relpath(local_path, download_path).replace(os.sep, "/")
+            if delete_orphans:
+                os.remove(local_path)
+                manifest.remove(key)
+                print(f"✓ Deleted orphan: {local_path}")
+            else:
+                print(f"! Orphan (kept): {local_path}")
+        return len(orphans)
+
+    def sync_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        download_path: str = "downloads",
+        delete_orphans: bool = False,
+        workers: int = None,
+        manifest_path: str = None,
+        direction: str = SYNC_DOWNLOAD,
+        prefer: str = "newer",
+    ) -> int:
+        """
+        Incrementally keep a prefix and a local directory in step
+
+        Only the difference is transferred. A local manifest records, per
+        key, the size, mtime and MD5 of the local file and the ETag of the
+        object at the last transfer, so later runs only rehash files whose
+        stat changed. Downloaded files get the object's lastModified as
+        their mtime. The local directory mirrors object keys (including the
+        prefix). Deletions are not propagated to the bucket. The manifest is
+        written periodically while the sync runs, so an interrupted sync
+        keeps the hashes computed so far.
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            download_path: Local mirror directory
+            delete_orphans: Delete local files whose objects no longer exist (download direction only)
+            workers: Number of concurrent transfers (default: config download_workers)
+            manifest_path: Manifest file (default: download_path/.obs_manifest.json)
+            direction: download (bucket to directory), upload (directory to bucket) or both
+            prefer: With both, which copy wins when a key changed on both sides: newer, local or remote
+
+        Returns:
+            Number of objects transferred
+        """
+        bucket, route = self._validate_inputs(bucket, route)
+        self._validate_sync_options(direction, prefer, delete_orphans)
+        if workers is None:
+            workers = self.config.get("download_workers", 1)
+
+        manifest = SyncManifest(manifest_path or os.path.join(download_path, DEFAULT_MANIFEST_FILE))
+        listed_keys = set()
+        local_only = self._sync_local_only(download_path, route, direction)
+
+        def listing() -> Generator[Any, None, None]:
             for content in self._paginated_list_objects(bucket, route):
-                if search_text in content.key.lower():
-                    count += 1
-                    print(f"Bucket: {bucket}")
-                    print(f"File: {content.key}")
-                    print(f"Last Modified: {content.lastModified}")
-                    print(f"Size: {content.size}")
-                    print(f"Owner: {content.owner.owner_name}")
-                    print(f"Storage Class: {content.storageClass}")
-                    print("-" * 50)
+                listed_keys.add(content.key)
+                local_only.pop(content.key, None)
+                yield content
+
+        try:
+            self.logger.info(f"Syncing bucket: {bucket}, prefix: {route} <-> {download_path} ({direction})")
+
+            stats = run_worker_pool(
+                listing(),
+                lambda content: self._sync_object(bucket, content, download_path, manifest, direction, prefer),
+                workers=workers,
+            )
+
+            if local_only:
+                # Files that do not exist in the bucket yet
+                run_worker_pool(
+                    sorted(local_only.items()),
+                    lambda item: self._sync_upload(bucket, item[0], item[1][0], None, manifest),
+                    workers=workers,
+                    stats=stats,
+                )
+
+            orphans = 0
+            if direction == SYNC_DOWNLOAD:
+                orphans = self._sync_orphans(download_path, route, listed_keys, manifest, delete_orphans)
+
+            self.logger.info(
+                f"Sync processed {stats.processed} objects: {stats.succeeded} transferred, "
+                f"{stats.skipped} unchanged, {stats.failed} failed, {orphans} orphans"
+                f"{' deleted' if delete_orphans else ''}"
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error syncing objects: {e}")
+            raise
+
+        finally:
+            manifest.save()
+
+        return stats.succeeded
+
+    def _key_for(self, local_path: str, local_dir: str, prefix: str = "") -> str:
+        """
+        Build the object key for a local file
+
+        Args:
+            local_path: Local file path
+            local_dir: Directory being uploaded
+            prefix: Object prefix
+
+        Returns:
+            Object key (prefix joined with the relative path using "/")
+        """
+        relative = os.path.relpath(local_path, local_dir).replace(os.sep, "/")
+        return f"{prefix.rstrip('/')}/{relative}" if prefix else relative
+
+    def _local_files(self, local_dir: str) -> Generator[Tuple[str, int], None, None]:
+        """Yield (path, size) for the files under a directory, in sorted order"""
+        for root, dirs, files in os.walk(local_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if _is_transfer_artifact(name):
+                    continue
+                local_path = os.path.join(root, name)
+                yield local_path, os.path.getsize(local_path)
+
+    def _upload_file(
+        self,
+        bucket: str,
+        object_key: str,
+        local_path: str,
+        size: int = None,
+        part_workers: int = None,
+        md5: str = None,
+    ) -> Optional[str]:
+        """
+        Upload one local file
+
+        Files larger than ``multipart_upload_threshold`` are uploaded as
+        multipart uploads with concurrent parts. Every request carries a
+        Content-MD5 header, so OBS rejects corrupted bodies.
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            local_path: Local file path
+            size: File size in bytes (optional)
+            part_workers: Concurrent part uploads per file (default: config upload_part_workers)
+            md5: MD5 hex digest of the file, if already known
+
+        Returns:
+            ETag of the uploaded object, or None if the upload failed
+        """
+        if size is None:
+            size = os.path.getsize(local_path)
+        if part_workers is None:
+            part_workers = self.config.get("upload_part_workers", 4)
+
+        try:
+            threshold = self.config.get("multipart_upload_threshold", DEFAULT_MULTIPART_THRESHOLD)
+            if size > threshold:
+                etag = self._upload_multipart(bucket, object_key, local_path, size, part_workers)
+            else:
+                md5 = md5 or file_md5(local_path)
+                resp = self._call("putFile", bucket, object_key, local_path, headers=PutObjectHeader(md5=md5_base64(md5)))
+                etag = (resp.body.etag or "") if resp.status < 300 else None
+                if etag is None:
+                    self.logger.warning(f"Failed to upload {object_key}: {resp.errorCode} - {resp.errorMessage}")
+                elif md5_from_etag(etag) not in (None, md5):
+                    self.logger.error(f"Checksum mismatch after uploading {object_key}")
+                    etag = None
+
+            if etag is not None:
+                self.logger.info(f"Successfully uploaded: {object_key}")
+                print(f"✓ Uploaded: {local_path} -> {object_key}")
+            else:
+                print(f"✗ Failed: {local_path}")
+            return etag
+
+        except Exception as e:
+            self.logger.error(f"Error uploading {local_path}: {e}")
+            print(f"✗ Error: {local_path} - {e}")
+            return None
+
+    def _upload_multipart(self, bucket: str, object_key: str, local_path: str, size: int, part_workers: int) -> Optional[str]:
+        """
+        Upload a file as a multipart upload, aborting it on any failure
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            local_path: Local file path
+            size: File size in bytes
+            part_workers: Concurrent part uploads
+
+        Returns:
+            ETag of the completed object, or None if the upload failed
+        """
+        part_size = max(self.config.get("upload_part_size", DEFAULT_PART_SIZE), -(-size // MAX_UPLOAD_PARTS))
+        parts = [(number, offset, min(part_size, size - offset)) for number, offset in enumerate(range(0, size, part_size), 1)]
+
+        resp = self._call("initiateMultipartUpload", bucket, object_key)
+        if resp.status >= 300:
+            self.logger.warning(f"Failed to start multipart upload of {object_key}: {resp.errorCode} - {resp.errorMessage}")
+            return None
+        upload_id = resp.body.uploadId
+
+        etags: Dict[int, str] = {}
+
+        def upload_part(part: Tuple[int, int, int]) -> bool:
+            number, offset, length = part
+            resp = self._call(
+                "uploadPart",
+                bucket,
+                object_key,
+                number,
+                upload_id,
+                object=local_path,
+                isFile=True,
+                partSize=length,
+                offset=offset,
+                isAttachMd5=True,
+            )
+            if resp.status >= 300:
+                self.logger.warning(f"Failed to upload part {number} of {object_key}: {resp.errorCode} - {resp.errorMessage}")
+                return False
+            etags[number] = resp.body.etag
+            return True
+
+        completed = False
+        try:
+            self.logger.info(f"Uploading {object_key} in {len(parts)} parts with {part_workers} workers")
+            stats = run_worker_pool(parts, upload_part, workers=part_workers)
+            if stats.failed:
+                return None
+
+            complete = CompleteMultipartUploadRequest(
+                parts=[CompletePart(partNum=number, etag=etags[number]) for number, _, _ in parts]
+            )
+            resp = self._call("completeMultipartUpload", bucket, object_key, upload_id, complete)
+            if resp.status >= 300:
+                self.logger.warning(f"Failed to complete upload of {object_key}: {resp.errorCode} - {resp.errorMessage}")
+                return None
+            completed = True
+            return resp.body.etag or ""
+
+        finally:
+            if not completed:
+                self._abort_upload(bucket, object_key, upload_id)
+
+    def _abort_upload(self, bucket: str, object_key: str, upload_id: str) -> None:
+        """Abort a multipart upload so its parts do not linger in the bucket"""
+        try:
+            resp = self._call("abortMultipartUpload", bucket, object_key, upload_id)
+            if resp.status < 300:
+                self.logger.info(f"Aborted multipart upload of {object_key}")
+            else:
+                self.logger.warning(f"Failed to abort upload {upload_id} of {object_key}: {resp.errorMessage}")
+        except Exception as e:
+            self.logger.error(f"Error aborting upload {upload_id} of {object_key}: {e}")
+
+    def upload_objects(
+        self, local_dir: str, bucket: str, prefix: str = "", workers: int = None, part_workers: int = None
+    ) -> int:
+        """
+        Upload the files of a local directory under a prefix
+
+        Files are fed to a shared pool of ``workers`` threads; large files
+        additionally upload their parts concurrently.
+
+        Args:
+            local_dir: Local directory to upload
+            bucket: Bucket name
+            prefix: Object prefix the relative paths are placed under
+            workers: Concurrent file uploads (default: config upload_workers)
+            part_workers: Concurrent part uploads per large file (default: config upload_part_workers)
+
+        Returns:
+            Number of files processed
+        """
+        bucket, prefix = self._validate_inputs(bucket, prefix)
+
+        if not os.path.isdir(local_dir):
+            raise ValueError(f"Local directory not found: {local_dir}")
+        if workers is None:
+            workers = self.config.get("upload_workers", 4)
+
+        def upload(item: Tuple[str, int]) -> bool:
+            local_path, size = item
+            key = self._key_for(local_path, local_dir, prefix)
+            return self._upload_file(bucket, key, local_path, size=size, part_workers=part_workers) is not None
+
+        try:
+            self.logger.info(f"Uploading {local_dir} to bucket: {bucket}, prefix: {prefix}, workers: {workers}")
+
+            stats = run_worker_pool(self._local_files(local_dir), upload, workers=workers)
+
+            self.logger.info(f"Processed {stats.processed} files, {stats.succeeded} uploaded, {stats.failed} failed")
+
+        except Exception as e:
+            self.logger.error(f"Error uploading objects: {e}")
+            raise
+
+        return stats.processed
+
+    def _copy_source(self, bucket: str, object_key: str) -> str:
+        """Copy source header value for an object (the SDK URL-encodes it)"""
+        return f"{bucket}/{object_key}"
+
+    def _join_listings(
+        self, bucket: str, route: str, dest_bucket: str, dest_prefix: str
+    ) -> Generator[Tuple[str, Optional[Any], Optional[Any]], None, None]:
+        """
+        Merge-join the listings of two locations by key relative to their prefixes
+
+        Args:
+            bucket: Left bucket name
+            route: Left object prefix
+            dest_bucket: Right bucket name
+            dest_prefix: Right object prefix
+
+        Yields:
+            ``(key, left entry, right entry)`` with keys under ``route``, None for a missing side
+        """
+        yield from merge_join(
+            self._paginated_list_objects(bucket, route),
+            self._paginated_list_objects(dest_bucket, dest_prefix),
+            # Map right keys onto the left prefix; order is kept as they share one prefix
+            right_key=lambda content: route + content.key[len(dest_prefix) :],
+        )
+
+    def _copy_matches(self, dest_bucket: str, dest_key: str, source: Any, existing: Any) -> bool:
+        """
+        Check whether a destination object already holds the source object
+
+        Args:
+            dest_bucket: Destination bucket name
+            dest_key: Destination object key
+            source: Source listing entry
+            existing: Destination listing entry
+
+        Returns:
+            True if size and ETag match
+        """
+        if existing.size != source.size:
+            return False
+        if existing.etag == source.etag:
+            return True
+        if source.size <= self.config.get("multipart_copy_threshold", DEFAULT_MULTIPART_COPY_THRESHOLD):
+            return False
+
+        # Multipart copies get a new ETag, the source one is kept in their metadata
+        resp = self._call("getObjectMetadata", dest_bucket, dest_key)
+        if resp.status >= 300:
+            return False
+        return dict(resp.header or []).get(SOURCE_ETAG_METADATA) == source.etag.strip('"')
+
+    def _copy_object(self, source_bucket: str, source: Any, dest_bucket: str, dest_key: str, part_workers: int) -> bool:
+        """
+        Copy one object on the server side
+
+        Args:
+            source_bucket: Source bucket name
+            source: Source listing entry
+            dest_bucket: Destination bucket name
+            dest_key: Destination object key
+            part_workers: Concurrent part copies for large objects
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if source.size > self.config.get("multipart_copy_threshold", DEFAULT_MULTIPART_COPY_THRESHOLD):
+                copied = self._copy_multipart(source_bucket, source, dest_bucket, dest_key, part_workers)
+            else:
+                resp = self._call("copyObject", source_bucket, source.key, dest_bucket, dest_key)
+                copied = resp.status < 300
+                if not copied:
+                    self.logger.warning(f"Failed to copy {source.key}: {resp.errorCode} - {resp.errorMessage}")
+
+            if copied:
+                self.logger.info(f"Successfully copied: {source_bucket}/{source.key} -> {dest_bucket}/{dest_key}")
+                print(f"✓ Copied: {source.key} -> {dest_bucket}/{dest_key}")
+            else:
+                print(f"✗ Failed: {source.key}")
+            return copied
+
+        except Exception as e:
+            self.logger.error(f"Error copying {source.key}: {e}")
+            print(f"✗ Error: {source.key} - {e}")
+            return False
+
+    def _copy_multipart(self, source_bucket: str, source: Any, dest_bucket: str, dest_key: str, part_workers: int) -> bool:
+        """
+        Copy a large object as concurrent part copies, aborting on any failure
+
+        The content type of the source is kept and its ETag is stored in the
+        metadata of the copy, so later runs recognise it as up to date.
+
+        Args:
+            source_bucket: Source bucket name
+            source: Source listing entry
+            dest_bucket: Destination bucket name
+            dest_key: Destination object key
+            part_workers: Concurrent part copies
+
+        Returns:
+            True if successful, False otherwise
+        """
+        size = source.size
+        part_size = max(self.config.get("copy_part_size", DEFAULT_COPY_PART_SIZE), -(-size // MAX_UPLOAD_PARTS))
+        parts = [(number, offset, min(part_size, size - offset)) for number, offset in enumerate(range(0, size, part_size), 1)]
+        copy_source = self._copy_source(source_bucket, source.key)
+
+        head = self._call("getObjectMetadata", source_bucket, source.key)
+        content_type = head.body.contentType if head.status < 300 else None
+        resp = self._call(
+            "initiateMultipartUpload",
+            dest_bucket,
+            dest_key,
+            metadata={SOURCE_ETAG_METADATA: source.etag.strip('"')},
+            contentType=content_type,
+        )
+        if resp.status >= 300:
+            self.logger.warning(f"Failed to start multipart copy of {source.key}: {resp.errorCode} - {resp.errorMessage}")
+            return False
+        upload_id = resp.body.uploadId
+
+        etags: Dict[int, str] = {}
+
+        def copy_part(part: Tuple[int, int, int]) -> bool:
+            number, offset, length = part
+            resp = self._call(
+                "copyPart",
+                dest_bucket,
+                dest_key,
+                number,
+                upload_id,
+                copy_source,
+                copySourceRange=f"{offset}-{offset + length - 1}",
+            )
+            if resp.status >= 300:
+                self.logger.warning(f"Failed to copy part {number} of {source.key}: {resp.errorCode} - {resp.errorMessage}")
+                return False
+            etags[number] = resp.body.etag
+            return True
+
+        completed = False
+        try:
+            self.logger.info(f"Copying {source.key} in {len(parts)} parts with {part_workers} workers")
+            stats = run_worker_pool(parts, copy_part, workers=part_workers)
+            if stats.failed:
+                return False
+
+            complete = CompleteMultipartUploadRequest(
+                parts=[CompletePart(partNum=number, etag=etags[number]) for number, _, _ in parts]
+            )
+            resp = self._call("completeMultipartUpload", dest_bucket, dest_key, upload_id, complete)
+            if resp.status >= 300:
+                self.logger.warning(f"Failed to complete copy of {source.key}: {resp.errorCode} - {resp.errorMessage}")
+                return False
+            completed = True
+            return True
+
+        finally:
+            if not completed:
+                self._abort_upload(dest_bucket, dest_key, upload_id)
+
+    def copy_objects(
+        self,
+        source_bucket: str,
+        route: str,
+        dest_bucket: str,
+        dest_prefix: str = None,
+        workers: int = None,
+        part_workers: int = None,
+    ) -> int:
+        """
+        Copy a prefix to another bucket on the server side
+
+        The source and destination listings are merge-joined in key order, so
+        keys whose size and ETag already match at the destination are skipped
+        without holding either listing in memory. No object data passes
+        through this host. Destination keys missing from the source are kept.
+
+        Args:
+            source_bucket: Source bucket name
+            route: Source object route/prefix
+            dest_bucket: Destination bucket name
+            dest_prefix: Prefix replacing ``route`` in destination keys (default: same keys)
+            workers: Concurrent object copies (default: config copy_workers)
+            part_workers: Concurrent part copies per large object (default: config upload_part_workers)
+
+        Returns:
+            Number of objects processed
+        """
+        source_bucket, route = self._validate_inputs(source_bucket, route)
+        dest_bucket, dest_prefix = self._validate_inputs(dest_bucket, route if dest_prefix is None else dest_prefix)
+
+        if source_bucket == dest_bucket and (dest_prefix.startswith(route) or route.startswith(dest_prefix)):
+            raise ValueError("Source and destination prefixes must not overlap within the same bucket")
+        if workers is None:
+            workers = self.config.get("copy_workers", 8)
+        if part_workers is None:
+            part_workers = self.config.get("upload_part_workers", 4)
+
+        def dest_key_for(key: str) -> str:
+            return dest_prefix + key[len(route) :]
+
+        def copy(entry: Tuple[str, Any, Optional[Any]]) -> Optional[bool]:
+            _, source, existing = entry
+            dest_key = dest_key_for(source.key)
+            if existing is not None and self._copy_matches(dest_bucket, dest_key, source, existing):
+                return None
+            return self._copy_object(source_bucket, source, dest_bucket, dest_key, part_workers)
+
+        try:
+            self.logger.info(f"Copying {source_bucket}/{route} to {dest_bucket}/{dest_prefix}, workers: {workers}")
+
+            joined = self._join_listings(source_bucket, route, dest_bucket, dest_prefix)
+            entries = (entry for entry in joined if entry[1] is not None)
+            stats = run_worker_pool(entries, copy, workers=workers)
+
+            self.logger.info(
+                f"Processed {stats.processed} objects, {stats.succeeded} copied, {stats.failed} failed, "
+                f"{stats.skipped} already up to date"
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error copying objects: {e}")
+            raise
+
+        return stats.processed
+
+    def diff_objects(
+        self,
+        bucket: str,
+        route: str,
+        dest_bucket: str,
+        dest_prefix: str = None,
+        output: str = "table",
+        quiet: bool = False,
+    ) -> int:
+        """
+        Compare a prefix with another location
+
+        Both listings are streamed and merge-joined in key order, so memory
+        stays constant whatever their size. Keys only in the destination are
+        added, keys only in the source are removed, and keys on both sides
+        whose size or ETag differ are changed. Multipart copies made by
+        copy_objects count as identical through their source ETag metadata.
+
+        Args:
+            bucket: Source bucket name
+            route: Source object route/prefix
+            dest_bucket: Destination bucket name
+            dest_prefix: Destination prefix matched against ``route`` (default: same keys)
+            output: Output format (table, jsonl, csv or tsv)
+            quiet: Only count differences, without printing them
+
+        Returns:
+            Number of added, removed and changed keys
+        """
+        bucket, route = self._validate_inputs(bucket, route)
+        dest_bucket, dest_prefix = self._validate_inputs(dest_bucket, route if dest_prefix is None else dest_prefix)
+        writer = ObjectWriter(DIFF_FIELDS, output, quiet=quiet, table_formatter=_format_diff)
+        counts = {ADDED: 0, REMOVED: 0, CHANGED: 0, IDENTICAL: 0}
+
+        def same(source: Any, existing: Any) -> bool:
+            return self._copy_matches(dest_bucket, dest_prefix + source.key[len(route) :], source, existing)
+
+        try:
+            self.logger.info(f"Comparing {bucket}/{route} with {dest_bucket}/{dest_prefix}")
+
+            for key, source, existing in self._join_listings(bucket, route, dest_bucket, dest_prefix):
+                status = diff_status(source, existing, same)
+                counts[status] += 1
+                if status == IDENTICAL:
+                    continue
+                writer.write(
+                    {
+                        "status": status,
+                        "key": key,
+                        "size": source.size if source else None,
+                        "dest_size": existing.size if existing else None,
+                        "etag": source.etag if source else None,
+                        "dest_etag": existing.etag if existing else None,
+                    }
+                )
+            writer.flush()
+
+            summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+            self.logger.info(f"Diff completed: {summary}")
+            if not quiet:
+                # Keep machine-readable output clean
+                print(f"Diff: {summary}", file=sys.stdout if output == "table" else sys.stderr)
+
+        except Exception as e:
+            self.logger.error(f"Error comparing objects: {e}")
+            raise
+        finally:
+            writer.close()
+
+        return writer.count
+
+    def report_objects(
+        self, bucket: str, route: str = "", depth: int = None, workers: int = None, output: str = "table"
+    ) -> int:
+        """
+        Print a usage report for a prefix from one listing pass
+
+        The report holds the object count, total bytes, storage class
+        distribution, an age histogram from ``lastModified`` and totals per
+        prefix down to ``depth`` directories below ``route``. Table output
+        prints the whole report, jsonl prints it as one JSON document, and
+        csv/tsv print the per-prefix totals.
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            depth: Directories below ``route`` kept in prefix totals (default: config report_prefix_depth)
+            workers: Partitions listed concurrently (default: config list_workers)
+            output: Output format (table, jsonl, csv or tsv)
+
+        Returns:
+            Number of objects counted
+        """
+        bucket, route = self._validate_inputs(bucket, route)
+
+        if depth is None:
+            depth = self.config.get("report_prefix_depth", 1)
+        if workers is None:
+            workers = self.config.get("list_workers", 1)
+        report = InventoryReport(route, depth)
+
+        try:
+            self.logger.info(f"Building report for bucket: {bucket}, prefix: {route}, depth: {depth}")
+
+            if workers > 1:
+                listing = self._parallel_list_objects(bucket, route, workers=workers)
+            else:
+                listing = self._paginated_list_objects(bucket, route)
+            for content in listing:
+                report.add(content)
+
+            if output == "table":
+                print(report.format(f"Report for {bucket}/{route}:"))
+            elif output == "jsonl":
+                print(json.dumps({"bucket": bucket, **report.to_dict()}))
+            else:
+                with ObjectWriter(REPORT_FIELDS, output) as writer:
+                    for row in report.prefix_rows():
+                        writer.write(row)
+
+            self.logger.info(f"Reported {report.objects} objects, {report.bytes} bytes")
+
+        except Exception as e:
+            self.logger.error(f"Error building report: {e}")
+            raise
+
+        return report.objects
+
+    def _list_bucket_names(self) -> List[str]:
+        """
+        List the names of all buckets
+
+        Returns:
+            Bucket names (empty if the request fails)
+        """
+        resp = self._call("listBuckets", True)
+        if resp.status < 300:
+            return [bucket_info.name for bucket_info in resp.body.buckets]
+
+        self.logger.error(f"Failed to list buckets: {resp.errorCode} - {resp.errorMessage}")
+        return []
+
+    def build_index(self, bucket: str = "", route: str = "", full: bool = True, index_path: str = None) -> int:
+        """
+        Build or refresh the local object index
+
+        Args:
+            bucket: Bucket name (empty to index all buckets)
+            route: Object route/prefix
+            full: Re-list the whole prefix and drop deleted objects; otherwise only
+                  append keys after the last indexed one (append-only: earlier new keys,
+                  overwrites and deletions are not picked up)
+            index_path: Index database (default: config index_path)
+
+        Returns:
+            Number of objects indexed
+        """
+        index = ObjectIndex(index_path or self.config.get("index_path", DEFAULT_INDEX_FILE))
+        try:
+            return self._refresh_index(index, bucket, route, full)
+        finally:
+            index.close()
+
+    def _refresh_index(self, index: ObjectIndex, bucket: str, route: str, full: bool) -> int:
+        """Refresh the index for one bucket, or every bucket when none is given"""
+        route = route.strip() if route else ""
+        if bucket:
+            bucket, route = self._validate_inputs(bucket, route)
+            buckets = [bucket]
+        else:
+            buckets = self._list_bucket_names()
+
+        if not full:
+            self.logger.info(
+                "Incremental index refresh only appends keys after the last indexed one; "
+                "run index without --incremental to pick up deletions, overwrites and earlier keys"
+            )
+
+        count = 0
+        for name in buckets:
+            marker = None if full else index.last_key(name, route)
+            count += index.refresh(name, route, self._paginated_list_objects(name, route, marker=marker), full=full)
+
+        self.logger.info(f"Indexed {count} objects in {len(buckets)} bucket(s)")
+        return count
+
+    def search_objects(
+        self,
+        search_text: str,
+        bucket: str = "",
+        route: str = "",
+        use_index: bool = False,
+        refresh_index: bool = False,
+        index_path: str = None,
+        workers: int = None,
+        output: str = "table",
+        quiet: bool = False,
+    ) -> int:
+        """
+        Search for objects by name
+
+        Args:
+            search_text: Text to search for in object names
+            bucket: Bucket name (empty to search all buckets)
+            route: Object route/prefix
+            use_index: Query the local object index instead of listing buckets
+            refresh_index: Append keys after the last indexed one before querying the index
+                           (does not pick up deletions, overwrites or earlier keys)
+            index_path: Index database (default: config index_path)
+            workers: Buckets scanned concurrently when searching all buckets
+                     (default: config search_workers)
+            output: Output format (table, jsonl, csv or tsv)
+            quiet: Only count matches, without printing them
+
+        Returns:
+            Number of matching objects found
+        """
+        if not search_text:
+            raise ValueError("Search text is required")
+
+        search_text = search_text.lower()
+        writer = ObjectWriter(SEARCH_FIELDS, output, quiet=quiet)
+        count = 0
+
+        try:
+            if use_index:
+                index = ObjectIndex(index_path or self.config.get("index_path", DEFAULT_INDEX_FILE))
+                try:
+                    if refresh_index:
+                        self._refresh_index(index, bucket, route, full=False)
+                    for row in index.search(search_text, bucket.strip() if bucket else "", route.strip() if route else ""):
+                        count += 1
+                        writer.write(row)
+                finally:
+                    index.close()
+            elif not bucket:
+                # Search in all buckets
+                count = self._search_all_buckets(route.strip() if route else "", search_text, workers, writer)
+            else:
+                # Search in specific bucket
+                bucket, route = self._validate_inputs(bucket, route)
+                count = self._search_in_bucket(bucket, route, search_text, writer)
+
+            self.logger.info(f"Search completed. Found {count} matching objects")
+
+        except Exception as e:
+            self.logger.error(f"Error during search: {e}")
+            raise
+        finally:
+            writer.close()
+
+        return count
+
+    def _matching_objects(self, bucket: str, route: str, search_text: str) -> Generator[Any, None, None]:
+        """Yield the objects of a bucket whose key contains ``search_text`` (lowercase)"""
+        for content in self._paginated_list_objects(bucket, route):
+            if search_text in content.key.lower():
+                yield content
+
+    def _search_all_buckets(
+        self, route: str, search_text: str, workers: int = None, writer: Optional[ObjectWriter] = None
+    ) -> int:
+        """
+        Search every bucket, scanning several buckets concurrently
+
+        Matches from all buckets are written as they arrive; buckets that fail
+        are reported individually once the search ends.
+
+        Args:
+            route: Object route/prefix
+            search_text: Text to search for (lowercase)
+            workers: Buckets scanned concurrently (default: config search_workers)
+            writer: Output writer (default: table on stdout)
+
+        Returns:
+            Number of matching objects found
+        """
+        if workers is None:
+            workers = self.config.get("search_workers", 4)
+
+        sources = [(name, partial(self._matching_objects, name, route, search_text)) for name in self._list_bucket_names()]
+        errors: Dict[str, Exception] = {}
+        writer = writer or ObjectWriter(SEARCH_FIELDS)
+        count = 0
+
+        for bucket, content in merge_concurrent(sources, workers=workers, errors=errors):
+            count += 1
+            writer.write(object_record(content, bucket))
+        writer.flush()
+
+        # Keep machine-readable output clean
+        error_stream = sys.stdout if writer.output == "table" and not writer.quiet else sys.stderr
+        for bucket in sorted(errors):
+            print(f"✗ Error searching in bucket {bucket}: {errors[bucket]}", file=error_stream)
+        if errors:
+            self.logger.warning(f"Search failed in {len(errors)} of {len(sources)} buckets")
+
+        return count
+
+    def _search_in_bucket(self, bucket: str, route: str, search_text: str, writer: Optional[ObjectWriter] = None) -> int:
+        """
+        Search for objects in a specific bucket
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            search_text: Text to search for (lowercase)
+            writer: Output writer (default: table on stdout)
+
+        Returns:
+            Number of matching objects found
+        """
+        writer = writer or ObjectWriter(SEARCH_FIELDS)
+        count = 0
+
+        try:
+            for content in self._matching_objects(bucket, route, search_text):
+                count += 1
+                writer.write(object_record(content, bucket))
 
         except Exception as e:
             self.logger.error(f"Error searching in bucket {bucket}: {e}")
+        finally:
+            writer.flush()
 
         return count
 
@@ -0,0 +1,367 @@
+"""
+Async OBS Manager - asyncio interface for Huawei Cloud OBS operations
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+
+from concurrency import TaskStats, bucket_rate_limiter
+from filters import ObjectFilter
+from logger import get_logger
+from obs_manager import OBSManager
+from planner import SKIP, TODO, RequestPlanner
+
+
+async def _aiter(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    """Iterate a plain or asynchronous iterable asynchronously"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class AsyncOBSManager:
+    """
+    asyncio interface to OBS operations
+
+    The OBS SDK only offers blocking calls, so each request runs on a
+    dedicated executor whose size equals ``concurrency`` and is admitted by
+    a semaphore of the same size. Every call in flight therefore holds one
+    pooled connection of the shared ObsClient, and no more requests are
+    started than there are connections to carry them. Large objects are
+    transferred in one request chain (no per-object part threads) so the
+    bound stays one connection per call.
+
+    Each request also passes OBSManager's adaptive controller, whose limit
+    starts at ``adaptive_initial_concurrency`` and grows up to
+    ``adaptive_max_concurrency``. ``concurrency`` is capped at that maximum;
+    calls beyond the current adaptive limit wait in their executor thread.
+    """
+
+    def __init__(self, config_file: str = "obs_config.json", concurrency: int = None):
+        """
+        Initialize the async manager
+
+        Args:
+            config_file: Path to configuration file
+            concurrency: Maximum requests in flight (default: config async_concurrency,
+                         capped at adaptive_max_concurrency when adaptive concurrency is enabled)
+        """
+        self.manager = OBSManager(config_file)
+        self.config = self.manager.config
+        self.logger = get_logger(__name__)
+        concurrency = max(1, concurrency or self.config.get("async_concurrency", 32))
+        if self.manager.adaptive is not None and concurrency > self.manager.adaptive.maximum:
+            # Threads past the adaptive maximum could only wait for a request slot
+            concurrency = self.manager.adaptive.maximum
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="obs-async")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run one blocking SDK call without blocking the event loop
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The callable's result
+        """
+        if self._semaphore is None:
+            # Created on first use so it belongs to the running loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def fan_out(
+        self,
+        items: Union[Iterable[Any], AsyncIterable[Any]],
+        worker: Callable[[Any], Awaitable[Optional[bool]]],
+    ) -> TaskStats:
+        """
+        Run ``worker`` for every item with at most ``concurrency`` tasks alive
+
+        Items are pulled from ``items`` only when a slot frees up, so a
+        listing is consumed at the pace of the work it feeds.
+
+        Args:
+            items: Plain or asynchronous iterable of work items
+            worker: Coroutine function returning True, False or None (skipped)
+
+        Returns:
+            Outcome counters
+        """
+        stats = TaskStats()
+        pending = set()
+
+        async def run(item: Any) -> None:
+            try:
+                result = await worker(item)
+            except Exception as e:
+                self.logger.error(f"Unhandled error in worker for {item!r}: {e}")
+                result = False
+            stats.record(result)
+
+        try:
+            async for item in _aiter(items):
+                if len(pending) >= self.concurrency:
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.add(asyncio.ensure_future(run(item)))
+            if pending:
+                await asyncio.wait(pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        return stats
+
+    async def list_pages(self, bucket: str, route: str = "", key_filter: ObjectFilter = None) -> AsyncIterator[List[Any]]:
+        """
+        List objects one page at a time
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            key_filter: Only yield objects matching this filter (optional)
+
+        Yields:
+            Listing pages (lists of object content items)
+        """
+        bucket, route = self.manager._validate_inputs(bucket, route)
+        pages = self.manager._paginated_list_pages(bucket, route)
+        while True:
+            page = await self._call(next, pages, None)
+            if page is None:
+                return
+            yield list(key_filter.apply(page)) if key_filter else page
+
+    async def list_objects(self, bucket: str, route: str = "", key_filter: ObjectFilter = None) -> AsyncIterator[Any]:
+        """
+        List objects, for use with ``async for``
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            key_filter: Only yield objects matching this filter (optional)
+
+        Yields:
+            Object content items
+        """
+        async for page in self.list_pages(bucket, route, key_filter):
+            for content in page:
+                yield content
+
+    async def download_file(self, bucket: str, object_key: str, local_path: str, size: int = None, etag: str = None) -> bool:
+        """
+        Download one object
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            local_path: Local file path
+            size: Object size in bytes, if known
+            etag: Object ETag, if known
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return await self._call(
+            self.manager._download_object, bucket, object_key, local_path, size=size, etag=etag, part_workers=1
+        )
+
+    async def download_objects(
+        self, bucket: str, route: str = "", download_path: str = None, key_filter: ObjectFilter = None
+    ) -> int:
+        """
+        Download objects from bucket
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            download_path: Local download directory (optional)
+            key_filter: Only download objects matching this filter (optional)
+
+        Returns:
+            Number of objects processed
+        """
+        bucket, route = self.manager._validate_inputs(bucket, route)
+
+        async def download(content: Any) -> bool:
+            local_path = self.manager._local_path_for(content.key, download_path)
+            return await self.download_file(bucket, content.key, local_path, size=content.size, etag=content.etag)
+
+        self.logger.info(f"Downloading objects from bucket: {bucket}, prefix: {route}, concurrency: {self.concurrency}")
+        stats = await self.fan_out(self.list_objects(bucket, route, key_filter), download)
+        self.logger.info(f"Processed {stats.processed} objects, {stats.succeeded} downloaded successfully")
+        return stats.processed
+
+    async def upload_file(self, bucket: str, object_key: str, local_path: str) -> Optional[str]:
+        """
+        Upload one local file
+
+        Args:
+            bucket: Bucket name
+            object_key: Object key
+            local_path: Local file path
+
+        Returns:
+            ETag of the uploaded object, or None if the upload failed
+        """
+        return await self._call(self.manager._upload_file, bucket, object_key, local_path, part_workers=1)
+
+    async def _local_files(self, local_dir: str) -> AsyncIterator[Tuple[str, int]]:
+        """
+        Walk a local directory one file at a time
+
+        Args:
+            local_dir: Local directory
+
+        Yields:
+            Tuples of (local path, size in bytes)
+        """
+        files = self.manager._local_files(local_dir)
+        while True:
+            item = await self._call(next, files, None)
+            if item is None:
+                return
+            yield item
+
+    async def upload_objects(self, local_dir: str, bucket: str, prefix: str = "") -> int:
+        """
+        Upload the files of a local directory under a prefix
+
+        Args:
+            local_dir: Local directory to upload
+            bucket: Bucket name
+            prefix: Object prefix the relative paths are placed under
+
+        Returns:
+            Number of files processed
+        """
+        bucket, prefix = self.manager._validate_inputs(bucket, prefix)
+
+        async def upload(item: Tuple[str, int]) -> bool:
+            local_path, _ = item
+            key = self.manager._key_for(local_path, local_dir, prefix)
+            return await self.upload_file(bucket, key, local_path) is not None
+
+        self.logger.info(f"Uploading {local_dir} to bucket: {bucket}, prefix: {prefix}, concurrency: {self.concurrency}")
+        stats = await self.fan_out(self._local_files(local_dir), upload)
+        self.logger.info(f"Processed {stats.processed} files, {stats.succeeded} uploaded, {stats.failed} failed")
+        return stats.processed
+
+    async def change_storage_class(
+        self, bucket: str, route: str = "", storage_class: str = "COLD", key_filter: ObjectFilter = None
+    ) -> int:
+        """
+        Change storage class for objects
+
+        Objects already in the target class are skipped without a request.
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            storage_class: Target storage class (COLD, WARM, STANDARD)
+            key_filter: Only process objects matching this filter (optional)
+
+        Returns:
+            Number of objects processed
+        """
+        bucket, route = self.manager._validate_inputs(bucket, route)
+
+        if storage_class not in ["COLD", "WARM", "STANDARD"]:
+            raise ValueError("Storage class must be one of: COLD, WARM, STANDARD")
+
+        planner = RequestPlanner()
+        limiter = bucket_rate_limiter(bucket, self.config.get("max_requests_per_second", 0))
+
+        async def transition(content: Any) -> Optional[bool]:
+            if planner.plan_transition(content, storage_class) == SKIP:
+                return None
+            return await self._call(self.manager._set_storage_class, bucket, content.key, storage_class, limiter)
+
+        stats = await self.fan_out(self.list_objects(bucket, route, key_filter), transition)
+        self.logger.info(
+            f"Processed {stats.processed} objects, {stats.succeeded} successful, {stats.failed} failed, "
+            f"{stats.skipped} already {storage_class}"
+        )
+        return stats.processed
+
+    async def restore_objects(
+        self, bucket: str, route: str = "", days: int = None, tier: str = None, key_filter: ObjectFilter = None
+    ) -> int:
+        """
+        Restore archived objects
+
+        Objects that are not archived, already restored or being restored
+        are skipped without a restore request.
+
+        Args:
+            bucket: Bucket name
+            route: Object route/prefix
+            days: Number of days to keep restored (default: config restore_days)
+            tier: Restore tier (default: config restore_tier)
+            key_filter: Only process objects matching this filter (optional)
+
+        Returns:
+            Number of objects processed
+        """
+        bucket, route = self.manager._validate_inputs(bucket, route)
+
+        if days is None:
+            days = self.config.get("restore_days", 30)
+        if tier is None:
+            tier = self.config.get("restore_tier", "Expedited")
+        if tier not in ["Expedited", "Standard", "Bulk"]:
+            raise ValueError("Restore tier must be one of: Expedited, Standard, Bulk")
+
+        planner = RequestPlanner(partial(self.manager._restore_state, bucket))
+
+        async def restore(content: Any) -> Optional[bool]:
+            # Planning may read the object's restore state, which is a request too
+            if await self._call(planner.plan_restore, content) != TODO:
+                return None
+            return await self._call(self.manager._restore_object, bucket, content.key, days, tier)
+
+        stats = await self.fan_out(self.list_objects(bucket, route, key_filter), restore)
+        summary = planner.summary()
+        self.logger.info(
+            f"Processed {stats.processed} objects, {stats.succeeded} restore requests initiated, "
+            f"{summary['pending']} already in progress, {summary['skipped']} skipped"
+        )
+        return stats.processed
+
+    async def close(self) -> None:
+        """Wait for calls in flight and close the OBS client"""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self.manager.close()
+
+    async def __aenter__(self) -> "AsyncOBSManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
@@ -6,12 +6,19 @@ Enhanced version of OBSManager with security level verification
 
 import logging
 import os
-from typing import Generator, Optional, Tuple
+from functools import partial
+from typing import Generator, List, Optional, Tuple
 
-from obs import ObsClient
+from obs import CopyObjectHeader, DeleteObjectsRequest, Object, ObsClient
 
+from concurrency import RateLimiter, TaskStats, batched, bucket_rate_limiter, run_worker_pool
 from config import Config
+from filters import ObjectFilter
 from logger import get_logger
+from obs_manager import create_obs_client
+from obs_metadata import restore_status
+from output import LIST_FIELDS, SEARCH_FIELDS, ObjectWriter, object_record
+from planner import PENDING, SKIP, TODO, RequestPlanner
 
 # Try to import security levels (optional)
 try:
@@ -24,6 +31,30 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# Maximum keys accepted by a single deleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+
+def _format_listed_object(record: dict) -> str:
+    """Render a listed object in table format"""
+    return (
+        f"📄 Key: {record['key']}\n"
+        f"   Last Modified: {record['last_modified']}\n"
+        f"   Size: {record['size']} bytes\n"
+        f"   Owner: {record['owner']}\n"
+        f"   Storage Class: {record['storage_class']}\n" + "-" * 50 + "\n"
+    )
+
+
+def _format_found_object(record: dict) -> str:
+    """Render a search match in table format"""
+    return (
+        f"🔍 Found: {record['bucket']}/{record['key']}\n"
+        f"   Size: {record['size']} bytes\n"
+        f"   Modified: {record['last_modified']}\n"
+        f"   Storage Class: {record['storage_class']}\n\n"
+    )
+
 
 class SecureOBSManager:
     """Enhanced OBS Manager with multi-level security"""
@@ -57,12 +88,13 @@ class SecureOBSManager:
             if not self.config.validate_credentials():
                 raise ValueError("Invalid or missing credentials in configuration")
 
-            self.obs_client = ObsClient(
-                access_key_id=self.config.get("access_key_id"),
-                secret_access_key=self.config.get("secret_access_key"),
-                server=self.config.get("server"),
-                region=self.config.get("region", "sa-peru-1"),
-            )
+            client_params = {
+                "access_key_id": self.config.get("access_key_id"),
+                "secret_access_key": self.config.get("secret_access_key"),
+                "server": self.config.get("server"),
+                "region": self.config.get("region", "sa-peru-1"),
+            }
+            self.obs_client = create_obs_client(ObsClient, client_params, self.config.client_options())
 
             self.logger.info("OBS client initialized successfully")
 
@@ -96,8 +128,10 @@ class SecureOBSManager:
 
         return True
 
-    def _paginated_list_objects(self, bucket: str, prefix: str = "", max_keys: int = None) -> Generator:
-        """Generator for paginated object listing"""
+    def _paginated_list_objects(
+        self, bucket: str, prefix: str = "", max_keys: int = None, key_filter: ObjectFilter = None
+    ) -> Generator:
+        """Generator for paginated object listing, optionally keeping only objects matching ``key_filter``"""
         if max_keys is None:
             max_keys = self.config.get("max_keys", 1000)
 
@@ -109,6 +143,8 @@ class SecureOBSManager:
 
                 if resp.status < 300:
                     contents = resp.body.contents if resp.body.contents else []
+                    if key_filter:
+                        contents = key_filter.apply(contents)
 
                     for content in contents:
                         yield content
@@ -126,13 +162,23 @@ class SecureOBSManager:
                 self.logger.error(f"Error during object listing: {e}")
                 break
 
-    def list_objects(self, bucket: str, route: str = "") -> int:
+    def list_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        output: str = "table",
+        quiet: bool = False,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         List objects in bucket (READ_ONLY level)
 
         Args:
             bucket: Bucket name
             route: Object route/prefix
+            output: Output format (table, jsonl, csv or tsv)
+            quiet: Only count objects, without printing them
+            key_filter: Only list objects matching this filter (optional)
 
         Returns:
             Number of objects processed
@@ -143,31 +189,75 @@ class SecureOBSManager:
             return 0
 
         bucket, route = self._validate_inputs(bucket, route)
-        count = 0
+        writer = ObjectWriter(LIST_FIELDS, output, quiet=quiet, table_formatter=_format_listed_object)
 
         try:
             self.logger.info(f"Listing objects in bucket: {bucket}, prefix: {route}")
 
-            for content in self._paginated_list_objects(bucket, route):
-                print(f"📄 Key: {content.key}")
-                print(f"   Last Modified: {content.lastModified}")
-                print(f"   Size: {content.size} bytes")
-                print(f"   Owner: {content.owner.owner_name}")
-                print(f"   Storage Class: {content.storageClass}")
-                print("-" * 50)
-                count += 1
+            for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
+                writer.write(object_record(content))
+            writer.close()
 
-            self.logger.info(f"Listed {count} objects")
-            print(f"✅ Total objects listed: {count}")
+            self.logger.info(f"Listed {writer.count} objects")
+            if output == "table" and not quiet:
+                print(f"✅ Total objects listed: {writer.count}")
 
         except Exception as e:
+            writer.close()
             self.logger.error(f"Error listing objects: {e}")
             print(f"❌ Error listing objects: {e}")
             return 0
 
-        return count
+        return writer.count
+
+    def _copy_storage_class(
+        self,
+        bucket: str,
+        content,
+        storage_class: str,
+        limiter: Optional[RateLimiter] = None,
+        planner: Optional[RequestPlanner] = None,
+    ) -> Optional[bool]:
+        """Rewrite one object in place with a new storage class"""
+        try:
+            # Skip if already in target storage class
+            if (planner or RequestPlanner()).plan_transition(content, storage_class) == SKIP:
+                print(f"⏭️  Skipping {content.key} (already {storage_class})")
+                return None
+
+            if limiter:
+                limiter.acquire()
+
+            # Copy object with new storage class
+            resp = self.obs_client.copyObject(
+                sourceBucketName=bucket,
+                sourceObjectKey=content.key,
+                destBucketName=bucket,
+                destObjectKey=content.key,
+                headers=CopyObjectHeader(storageClass=storage_class),
+            )
 
-    def change_storage_class(self, bucket: str, route: str = "", storage_class: str = "COLD") -> int:
+            if resp.status < 300:
+                print(f"✅ Changed {content.key} to {storage_class}")
+                return True
+
+            print(f"❌ Failed to change {content.key}: {resp.errorMessage}")
+            return False
+
+        except Exception as e:
+            print(f"❌ Error processing {content.key}: {e}")
+            return False
+
+    def change_storage_class(
+        self,
+        bucket: str,
+        route: str = "",
+        storage_class: str = "COLD",
+        workers: int = None,
+        rate_limit: float = None,
+        plan_only: bool = False,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         Change storage class for objects (STANDARD level)
 
@@ -175,6 +265,10 @@ class SecureOBSManager:
             bucket: Bucket name
             route: Object route/prefix
             storage_class: Target storage class (COLD, WARM, STANDARD)
+            workers: Number of concurrent requests (default: config transition_workers)
+            rate_limit: Maximum requests per second on the bucket (default: config max_requests_per_second)
+            plan_only: Only print how many objects would be changed or skipped
+            key_filter: Only process objects matching this filter (optional)
 
         Returns:
             Number of objects processed
@@ -189,38 +283,33 @@ class SecureOBSManager:
             return 0
 
         bucket, route = self._validate_inputs(bucket, route)
-        count = 0
 
-        try:
-            self.logger.info(f"Changing storage class to {storage_class} in bucket: {bucket}, prefix: {route}")
+        if workers is None:
+            workers = self.config.get("transition_workers", 1)
+        if rate_limit is None:
+            rate_limit = self.config.get("max_requests_per_second", 0)
+        limiter = bucket_rate_limiter(bucket, rate_limit)
+        planner = RequestPlanner()
 
-            for content in self._paginated_list_objects(bucket, route):
-                try:
-                    # Skip if already in target storage class
-                    if content.storageClass == storage_class:
-                        print(f"⏭️  Skipping {content.key} (already {storage_class})")
-                        continue
+        if plan_only:
+            for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
+                planner.plan_transition(content, storage_class)
+            print(planner.format(f"📋 Plan for changing {bucket}/{route} to {storage_class}:"))
+            return planner.summary()["todo"]
 
-                    # Copy object with new storage class
-                    resp = self.obs_client.copyObject(
-                        sourceBucketName=bucket,
-                        sourceObjectKey=content.key,
-                        destBucketName=bucket,
-                        destObjectKey=content.key,
-                        storageClass=storage_class,
-                    )
+        count = 0
 
-                    if resp.status < 300:
-                        print(f"✅ Changed {content.key} to {storage_class}")
-                        count += 1
-                    else:
-                        print(f"❌ Failed to change {content.key}: {resp.errorMessage}")
+        try:
+            self.logger.info(f"Changing storage class to {storage_class} in bucket: {bucket}, prefix: {route}")
 
-                except Exception as e:
-                    print(f"❌ Error processing {content.key}: {e}")
-                    continue
+            stats = run_worker_pool(
+                self._paginated_list_objects(bucket, route, key_filter=key_filter),
+                lambda content: self._copy_storage_class(bucket, content, storage_class, limiter, planner),
+                workers=workers,
+            )
+            count = stats.succeeded
 
-            self.logger.info(f"Changed storage class for {count} objects")
+            self.logger.info(f"Changed storage class for {count} objects ({stats.skipped} skipped, {stats.failed} failed)")
             print(f"✅ Total objects processed: {count}")
 
         except Exception as e:
@@ -230,7 +319,22 @@ class SecureOBSManager:
 
         return count
 
-    def restore_objects(self, bucket: str, route: str = "", days: int = None, tier: str = None) -> int:
+    def _restore_state(self, bucket: str, object_key: str) -> Optional[str]:
+        """Get the restore state of one object from its metadata"""
+        resp = self.obs_client.getObjectMetadata(bucket, object_key)
+        if resp.status >= 300:
+            raise RuntimeError(f"Failed to get metadata for {object_key}: {resp.errorMessage}")
+        return restore_status(getattr(resp.body, "restore", None))
+
+    def restore_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        days: int = None,
+        tier: str = None,
+        plan_only: bool = False,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         Restore archived objects (STANDARD level)
 
@@ -239,6 +343,8 @@ class SecureOBSManager:
             route: Object route/prefix
             days: Days to keep restored
             tier: Restore tier (Expedited, Standard, Bulk)
+            plan_only: Only print how many objects would be restored, are pending or skipped
+            key_filter: Only process objects matching this filter (optional)
 
         Returns:
             Number of objects processed
@@ -260,16 +366,29 @@ class SecureOBSManager:
         if tier is None:
             tier = self.config.get("restore_tier", "Expedited")
 
+        planner = RequestPlanner(partial(self._restore_state, bucket))
+
+        if plan_only:
+            for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
+                planner.plan_restore(content)
+            print(planner.format(f"📋 Plan for restoring {bucket}/{route}:"))
+            return planner.summary()["todo"]
+
         count = 0
 
         try:
             self.logger.info(f"Restoring objects in bucket: {bucket}, prefix: {route}, days: {days}, tier: {tier}")
 
-            for content in self._paginated_list_objects(bucket, route):
+            for content in self._paginated_list_objects(bucket, route, key_filter=key_filter):
                 try:
-                    # Only restore COLD storage objects
-                    if content.storageClass != "COLD":
-                        print(f"⏭️  Skipping {content.key} (not in COLD storage)")
+                    # Only restore COLD objects without a restore in progress or done
+                    decision = planner.plan_restore(content)
+                    if decision == PENDING:
+                        print(f"⏭️  Skipping {content.key} (restore in progress)")
+                        continue
+                    if decision != TODO:
+                        reason = "not in COLD storage" if content.storageClass != "COLD" else "already restored"
+                        print(f"⏭️  Skipping {content.key} ({reason})")
                         continue
 
                     resp = self.obs_client.restoreObject(bucketName=bucket, objectKey=content.key, days=days, tier=tier)
@@ -294,7 +413,36 @@ class SecureOBSManager:
 
         return count
 
-    def download_objects(self, bucket: str, route: str = "", download_path: str = None) -> int:
+    def _download_object(self, bucket: str, object_key: str, local_file: str) -> bool:
+        """Download one object to a local file"""
+        try:
+            # Create directory if needed
+            local_dir = os.path.dirname(local_file)
+            if local_dir:
+                os.makedirs(local_dir, exist_ok=True)
+
+            # Download object
+            resp = self.obs_client.getObject(bucketName=bucket, objectKey=object_key, downloadPath=local_file)
+
+            if resp.status < 300:
+                print(f"✅ Downloaded {object_key} to {local_file}")
+                return True
+
+            print(f"❌ Failed to download {object_key}: {resp.errorMessage}")
+            return False
+
+        except Exception as e:
+            print(f"❌ Error downloading {object_key}: {e}")
+            return False
+
+    def download_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        download_path: str = None,
+        workers: int = None,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         Download objects from bucket (READ_ONLY level)
 
@@ -302,6 +450,8 @@ class SecureOBSManager:
             bucket: Bucket name
             route: Object route/prefix
             download_path: Local download path
+            workers: Number of concurrent downloads (default: config download_workers)
+            key_filter: Only download objects matching this filter (optional)
 
         Returns:
             Number of objects downloaded
@@ -321,6 +471,8 @@ class SecureOBSManager:
 
         if download_path is None:
             download_path = f"./downloads_{bucket}"
+        if workers is None:
+            workers = self.config.get("download_workers", 1)
 
         # Create download directory
         os.makedirs(download_path, exist_ok=True)
@@ -328,30 +480,16 @@ class SecureOBSManager:
         count = 0
 
         try:
-            self.logger.info(f"Downloading objects from bucket: {bucket}, prefix: {route}")
-
-            for content in self._paginated_list_objects(bucket, route):
-                try:
-                    # Create local file path
-                    local_file = os.path.join(download_path, content.key.replace("/", os.sep))
-                    local_dir = os.path.dirname(local_file)
-
-                    # Create directory if needed
-                    if local_dir:
-                        os.makedirs(local_dir, exist_ok=True)
-
-                    # Download object
-                    resp = self.obs_client.getObject(bucketName=bucket, objectKey=content.key, downloadPath=local_file)
-
-                    if resp.status < 300:
-                        print(f"✅ Downloaded {content.key} to {local_file}")
-                        count += 1
-                    else:
-                        print(f"❌ Failed to download {content.key}: {resp.errorMessage}")
-
-                except Exception as e:
-                    print(f"❌ Error downloading {content.key}: {e}")
-                    continue
+            self.logger.info(f"Downloading objects from bucket: {bucket}, prefix: {route}, workers: {workers}")
+
+            stats = run_worker_pool(
+                self._paginated_list_objects(bucket, route, key_filter=key_filter),
+                lambda content: self._download_object(
+                    bucket, content.key, os.path.join(download_path, content.key.replace("/", os.sep))
+                ),
+                workers=workers,
+            )
+            count = stats.succeeded
 
             self.logger.info(f"Downloaded {count} objects")
             print(f"✅ Total objects downloaded: {count}")
@@ -363,7 +501,9 @@ class SecureOBSManager:
 
         return count
 
-    def search_objects(self, search_text: str, bucket: str = "", route: str = "") -> int:
+    def search_objects(
+        self, search_text: str, bucket: str = "", route: str = "", output: str = "table", quiet: bool = False
+    ) -> int:
         """
         Search objects by name (READ_ONLY level)
 
@@ -371,6 +511,8 @@ class SecureOBSManager:
             search_text: Text to search for
             bucket: Bucket name (empty for all buckets)
             route: Object route/prefix
+            output: Output format (table, jsonl, csv or tsv)
+            quiet: Only count matches, without printing them
 
         Returns:
             Number of objects found
@@ -389,60 +531,111 @@ class SecureOBSManager:
         if not search_text:
             raise ValueError("Search text cannot be empty")
 
+        writer = ObjectWriter(SEARCH_FIELDS, output, quiet=quiet, table_formatter=_format_found_object)
         count = 0
 
         try:
             if bucket:
                 # Search in specific bucket
                 bucket, route = self._validate_inputs(bucket, route)
-                count = self._search_in_bucket(bucket, route, search_text)
+                count = self._search_in_bucket(bucket, route, search_text, writer)
             else:
                 # Search in all buckets
                 resp = self.obs_client.listBuckets()
                 if resp.status < 300:
                     for bucket_info in resp.body.buckets:
-                        bucket_count = self._search_in_bucket(bucket_info.name, route, search_text)
+                        bucket_count = self._search_in_bucket(bucket_info.name, route, search_text, writer)
                         count += bucket_count
                 else:
                     print(f"❌ Error listing buckets: {resp.errorMessage}")
 
-            print(f"✅ Total objects found: {count}")
+            writer.close()
+            if output == "table" and not quiet:
+                print(f"✅ Total objects found: {count}")
 
         except Exception as e:
+            writer.close()
             self.logger.error(f"Error searching objects: {e}")
             print(f"❌ Error searching objects: {e}")
             return 0
 
         return count
 
-    def _search_in_bucket(self, bucket: str, route: str, search_text: str) -> int:
+    def _search_in_bucket(self, bucket: str, route: str, search_text: str, writer: Optional[ObjectWriter] = None) -> int:
         """Search for objects in a specific bucket"""
+        writer = writer or ObjectWriter(SEARCH_FIELDS, table_formatter=_format_found_object)
         count = 0
         search_lower = search_text.lower()
 
         try:
             for content in self._paginated_list_objects(bucket, route):
                 if search_lower in content.key.lower():
-                    print(f"🔍 Found: {bucket}/{content.key}")
-                    print(f"   Size: {content.size} bytes")
-                    print(f"   Modified: {content.lastModified}")
-                    print(f"   Storage Class: {content.storageClass}")
-                    print()
+                    writer.write(object_record(content, bucket))
                     count += 1
 
         except Exception as e:
             self.logger.error(f"Error searching in bucket {bucket}: {e}")
+        finally:
+            writer.flush()
 
         return count
 
-    def delete_objects(self, bucket: str, route: str = "", confirm: bool = False) -> int:
+    def _delete_batch(self, bucket: str, keys: List[str], key_stats: TaskStats) -> bool:
+        """
+        Delete one batch of keys and record per-key outcomes
+
+        Args:
+            bucket: Bucket name
+            keys: Up to 1000 object keys
+            key_stats: Per-key counters to update
+
+        Returns:
+            True if every key in the batch was deleted
+        """
+        try:
+            request = DeleteObjectsRequest(quiet=True, objects=[Object(key=key) for key in keys])
+            resp = self.obs_client.deleteObjects(bucketName=bucket, deleteObjectsRequest=request)
+
+            if resp.status >= 300:
+                key_stats.add(failed=len(keys))
+                print(f"❌ Failed to delete batch of {len(keys)} objects: {resp.errorMessage}")
+                return False
+
+            # Quiet mode only reports the keys that could not be deleted
+            errors = (resp.body.error if resp.body else None) or []
+            for error in errors:
+                self.logger.error(f"Failed to delete {error.key}: {error.code} - {error.message}")
+                print(f"❌ Failed to delete {error.key}: {error.code} - {error.message}")
+
+            key_stats.add(succeeded=len(keys) - len(errors), failed=len(errors))
+            print(f"✅ Deleted batch of {len(keys) - len(errors)} objects")
+            return not errors
+
+        except Exception as e:
+            key_stats.add(failed=len(keys))
+            print(f"❌ Error deleting batch of {len(keys)} objects: {e}")
+            return False
+
+    def delete_objects(
+        self,
+        bucket: str,
+        route: str = "",
+        confirm: bool = False,
+        workers: int = None,
+        key_filter: ObjectFilter = None,
+    ) -> int:
         """
         Delete objects from bucket (DESTRUCTIVE level)
 
+        Keys are streamed from the listing into batches of 1000 which are sent
+        as soon as they fill, with up to ``workers`` batches in flight.
+
         Args:
             bucket: Bucket name
             route: Object route/prefix
             confirm: Skip confirmation if True
+            workers: Concurrent batch requests (default: config delete_workers)
+            key_filter: Only delete objects matching this filter (optional)
 
         Returns:
             Number of objects deleted
@@ -471,41 +664,32 @@ class SecureOBSManager:
                 return 0
 
         bucket, route = self._validate_inputs(bucket, route)
+
+        if workers is None:
+            workers = self.config.get("delete_workers", 4)
+
         count = 0
 
         try:
             self.logger.warning(f"DESTRUCTIVE: Deleting objects in bucket: {bucket}, prefix: {route}")
 
-            # Collect objects to delete
-            objects_to_delete = []
-            for content in self._paginated_list_objects(bucket, route):
-                objects_to_delete.append(content.key)
+            key_stats = TaskStats()
+            keys = (content.key for content in self._paginated_list_objects(bucket, route, key_filter=key_filter))
+            run_worker_pool(
+                batched(keys, DELETE_BATCH_SIZE),
+                lambda batch: self._delete_batch(bucket, batch, key_stats),
+                workers=workers,
+            )
 
-            if not objects_to_delete:
+            if not key_stats.processed:
                 print("ℹ️  No objects found to delete")
                 return 0
 
-            print(f"Found {len(objects_to_delete)} objects to delete")
-
-            # Delete objects in batches
-            batch_size = 1000
-            for i in range(0, len(objects_to_delete), batch_size):
-                batch = objects_to_delete[i : i + batch_size]
-
-                # Prepare delete request
-                delete_objects = [{"key": key} for key in batch]
-
-                resp = self.obs_client.deleteObjects(bucketName=bucket, deleteObjects=delete_objects)
-
-                if resp.status < 300:
-                    batch_count = len(batch)
-                    count += batch_count
-                    print(f"✅ Deleted batch of {batch_count} objects")
-                else:
-                    print(f"❌ Failed to delete batch: {resp.errorMessage}")
-
-            self.logger.warning(f"DESTRUCTIVE: Deleted {count} objects")
+            count = key_stats.succeeded
+            self.logger.warning(f"DESTRUCTIVE: Deleted {count} objects ({key_stats.failed} failed)")
             print(f"✅ Total objects deleted: {count}")
+            if key_stats.failed:
+                print(f"❌ Objects that could not be deleted: {key_stats.failed}")
 
         except Exception as e:
             self.logger.error(f"Error deleting objects: {e}")
@@ -0,0 +1,121 @@
+"""
+Metadata helpers for OBS Utils
+Interpret the ETag and timestamp fields returned by OBS listings
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import base64
+import hashlib
+import re
+import time
+from typing import Optional
+
+# The SDK converts listing timestamps to local time in this format
+LAST_MODIFIED_FORMAT = "%Y/%m/%d %H:%M:%S"
+
+_MD5_ETAG = re.compile(r"^[0-9a-fA-F]{32}$")
+
+_ONGOING_REQUEST = re.compile(r'ongoing-request\s*=\s*"?(true|false)"?', re.IGNORECASE)
+
+# Restore states reported by restore_status
+RESTORE_ONGOING = "ongoing"
+RESTORE_COMPLETED = "restored"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def md5_from_etag(etag: Optional[str]) -> Optional[str]:
+    """
+    Return the MD5 hex digest encoded in a single-part ETag
+
+    Args:
+        etag: ETag as returned by OBS (quoted or not)
+
+    Returns:
+        Lowercase MD5 hex digest, or None for multipart/unknown ETags
+    """
+    if not etag:
+        return None
+    etag = etag.strip('"')
+    return etag.lower() if _MD5_ETAG.match(etag) else None
+
+
+def md5_base64(md5_hex: str) -> str:
+    """
+    Encode an MD5 hex digest as expected by the Content-MD5 header
+
+    Args:
+        md5_hex: MD5 hex digest
+
+    Returns:
+        Base64-encoded digest
+    """
+    return base64.b64encode(bytes.fromhex(md5_hex)).decode("ascii")
+
+
+def parse_last_modified(value: Optional[str]) -> Optional[float]:
+    """
+    Convert a listing ``lastModified`` value to a POSIX timestamp
+
+    Args:
+        value: Timestamp as returned by the SDK
+
+    Returns:
+        Seconds since the epoch, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    try:
+        return time.mktime(time.strptime(str(value), LAST_MODIFIED_FORMAT))
+    except ValueError:
+        return None
+
+
+def restore_status(restore: Optional[str]) -> Optional[str]:
+    """
+    Interpret the ``x-obs-restore`` value returned with object metadata
+
+    Args:
+        restore: Header value, e.g. ``ongoing-request="false", expiry-date="..."``
+
+    Returns:
+        RESTORE_ONGOING, RESTORE_COMPLETED, or None if no restore was requested
+    """
+    if not restore:
+        return None
+    match = _ONGOING_REQUEST.search(str(restore))
+    if not match:
+        return None
+    return RESTORE_ONGOING if match.group(1).lower() == "true" else RESTORE_COMPLETED
+
+
+def file_md5(file_path: str) -> str:
+    """
+    Compute the MD5 hex digest of a local file
+
+    Args:
+        file_path: Local file path
+
+    Returns:
+        Lowercase MD5 hex digest
+    """
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -55,6 +55,12 @@ except ImportError:
     print("Warning: config module not found. Please ensure all dependencies are installed.")
     sys.exit(1)
 
+try:
+    from filters import ObjectFilter, parse_date, parse_size
+except ImportError:
+    print("Warning: filters module not found. Please ensure all dependencies are installed.")
+    sys.exit(1)
+
 try:
     from logger import get_logger
 except ImportError:
@@ -75,29 +81,72 @@ except ImportError:
         def __init__(self, config_file):
             print(f"[MOCK MODE] Using mock OBS manager with config: {config_file}")
         
-        def list_objects(self, bucket, prefix=""):
+        def list_objects(self, bucket, prefix="", workers=None, sort=True, output="table", quiet=False, key_filter=None):
             print(f"[MOCK] Would list objects in bucket '{bucket}' with prefix '{prefix}'")
             return 0
         
-        def download_objects(self, bucket, prefix, download_path):
+        def export_objects(self, bucket, prefix, path, export_format=None):
+            print(f"[MOCK] Would export listing of bucket '{bucket}' with prefix '{prefix}' to '{path}'")
+            return 0
+        
+        def download_objects(self, bucket, prefix, download_path, workers=None, part_workers=None, resume=False,
+                             checkpoint_path=None, key_filter=None):
             print(f"[MOCK] Would download from bucket '{bucket}', prefix '{prefix}' to '{download_path}'")
             return 0
         
-        def download_single_file(self, bucket, object_key, download_path):
+        def download_single_file(self, bucket, object_key, download_path, part_workers=None):
             print(f"[MOCK] Would download '{object_key}' from bucket '{bucket}' to '{download_path}'")
             return True
         
-        def search_objects(self, search_text, bucket, prefix):
+        def upload_objects(self, local_dir, bucket, prefix="", workers=None, part_workers=None):
+            print(f"[MOCK] Would upload '{local_dir}' to bucket '{bucket}' with prefix '{prefix}'")
+            return 0
+
+        def copy_objects(self, source_bucket, prefix, dest_bucket, dest_prefix=None, workers=None, part_workers=None):
+            print(f"[MOCK] Would copy bucket '{source_bucket}', prefix '{prefix}' to bucket '{dest_bucket}'")
+            return 0
+
+        def diff_objects(self, bucket, prefix, dest_bucket, dest_prefix=None, output="table", quiet=False):
+            print(f"[MOCK] Would compare bucket '{bucket}', prefix '{prefix}' with bucket '{dest_bucket}'")
+            return 0
+
+        def report_objects(self, bucket, prefix="", depth=None, workers=None, output="table"):
+            print(f"[MOCK] Would report usage of bucket '{bucket}' with prefix '{prefix}'")
+            return 0
+
+        def sync_objects(self, bucket, prefix, download_path, delete_orphans=False, workers=None, manifest_path=None,
+                         direction="download", prefer="newer"):
+            print(f"[MOCK] Would sync bucket '{bucket}', prefix '{prefix}' to '{download_path}'")
+            return 0
+        
+        def build_index(self, bucket, prefix, full=True, index_path=None):
+            print(f"[MOCK] Would index bucket '{bucket}' with prefix '{prefix}'")
+            return 0
+        
+        def search_objects(self, search_text, bucket, prefix, use_index=False, refresh_index=False, index_path=None,
+                           workers=None, output="table", quiet=False):
             print(f"[MOCK] Would search for '{search_text}' in bucket '{bucket}' with prefix '{prefix}'")
             return 0
         
-        def change_storage_class(self, bucket, prefix, storage_class):
+        def change_storage_class(self, bucket, prefix, storage_class, workers=None, rate_limit=None, plan_only=False,
+                                 key_filter=None):
             print(f"[MOCK] Would change storage class to '{storage_class}' for bucket '{bucket}', prefix '{prefix}'")
             return 0
         
-        def restore_objects(self, bucket, prefix, days, tier):
+        def apply_lifecycle(self, bucket, prefix=None, workers=None, rate_limit=None, plan_only=False, rules=None):
+            print(f"[MOCK] Would apply lifecycle rules to bucket '{bucket}'")
+            return 0
+        
+        def restore_objects(self, bucket, prefix, days, tier, plan_only=False, key_filter=None):
             print(f"[MOCK] Would restore objects in bucket '{bucket}', prefix '{prefix}' for {days} days, tier '{tier}'")
             return 0
+
+        def restore_download_objects(self, bucket, prefix, download_path, days, tier, workers=None, part_workers=None,
+                                     poll_interval=None, max_poll_interval=None, max_wait=None, plan_only=False,
+                                     key_filter=None):
+            print(f"[MOCK] Would restore and download objects from bucket '{bucket}', prefix '{prefix}' "
+                  f"to '{download_path}'")
+            return 0
     
     OBSManager = MockOBSManager
 
@@ -291,8 +340,13 @@ def interactive_mode():
             print("Please check your OBS credentials in the configuration file.")
 
 
-def command_line_mode(args):
-    """Run in command line mode with arguments - Cross-platform compatible"""
+def command_line_mode(args, obs_manager=None):
+    """Run in command line mode with arguments - Cross-platform compatible
+
+    Args:
+        args: Parsed command line arguments
+        obs_manager: Manager to run the operation with (default: a new one from --config)
+    """
     logger = get_logger(__name__)
 
     try:
@@ -301,33 +355,106 @@ def command_line_mode(args):
             print("[TEST MODE] Skipping OBS client initialization for CI/CD testing")
             return
 
-        # Use SecureOBSManager if security levels are enabled
-        if hasattr(args, "enable_security_levels") and args.enable_security_levels:
-            try:
-                from obs_manager_secure import SecureOBSManager
-                obs_manager = SecureOBSManager(args.config, enable_security_levels=True)
-                print("[OK] Multi-level security enabled")
-            except ImportError:
-                print("[WARNING] Security levels not available, using standard manager")
+        # A caller such as the daemon may pass its already initialized manager
+        if obs_manager is None:
+            # Use SecureOBSManager if security levels are enabled
+            if hasattr(args, "enable_security_levels") and args.enable_security_levels:
+                try:
+                    from obs_manager_secure import SecureOBSManager
+                    obs_manager = SecureOBSManager(args.config, enable_security_levels=True)
+                    print("[OK] Multi-level security enabled")
+                except ImportError:
+                    print("[WARNING] Security levels not available, using standard manager")
+                    obs_manager = OBSManager(args.config)
+            else:
                 obs_manager = OBSManager(args.config)
-        else:
-            obs_manager = OBSManager(args.config)
 
         count = 0
-
-        if args.operation == "list":
-            count = obs_manager.list_objects(args.bucket, args.prefix or "")
-
-        elif args.operation == "archive":
-            count = obs_manager.change_storage_class(args.bucket, args.prefix or "", "COLD")
-
-        elif args.operation == "warm":
-            count = obs_manager.change_storage_class(args.bucket, args.prefix or "", "WARM")
+        output_options = {"output": args.output, "quiet": args.quiet} if args.output != "table" or args.quiet else {}
+        plan_options = {"plan_only": True} if args.plan else {}
+        key_filter = ObjectFilter(
+            include=args.include,
+            exclude=args.exclude,
+            regex=args.regex,
+            min_size=args.min_size,
+            max_size=args.max_size,
+            modified_after=args.modified_after,
+            modified_before=args.modified_before,
+            storage_classes=args.storage_class,
+        )
+        filter_options = {"key_filter": key_filter} if key_filter else {}
+
+        if args.operation == "list" and args.export:
+            export_path = args.export_path or f"{args.bucket}-listing.{args.export}"
+            count = obs_manager.export_objects(args.bucket, args.prefix or "", export_path, args.export)
+
+        elif args.operation == "list":
+            list_options = {"workers": args.workers} if args.workers is not None else {}
+            if args.unsorted:
+                list_options["sort"] = False
+            count = obs_manager.list_objects(
+                args.bucket, args.prefix or "", **list_options, **output_options, **filter_options
+            )
+
+        elif args.operation in ("archive", "warm"):
+            storage_class = "COLD" if args.operation == "archive" else "WARM"
+            transition_options = {
+                name: value
+                for name, value in (("workers", args.workers), ("rate_limit", args.rate_limit))
+                if value is not None
+            }
+            count = obs_manager.change_storage_class(
+                args.bucket, args.prefix or "", storage_class, **transition_options, **plan_options, **filter_options
+            )
+
+        elif args.operation == "lifecycle":
+            lifecycle_options = {
+                name: value
+                for name, value in (("workers", args.workers), ("rate_limit", args.rate_limit))
+                if value is not None
+            }
+            count = obs_manager.apply_lifecycle(args.bucket, args.prefix, **lifecycle_options, **plan_options)
 
         elif args.operation == "restore":
-            count = obs_manager.restore_objects(args.bucket, args.prefix or "", args.days, args.tier)
+            count = obs_manager.restore_objects(
+                args.bucket, args.prefix or "", args.days, args.tier, **plan_options, **filter_options
+            )
+
+        elif args.operation == "restore-download":
+            download_path = args.download_path or os.path.join(os.getcwd(), "downloads")
+            os.makedirs(download_path, exist_ok=True)
+            restore_options = {
+                name: value
+                for name, value in (
+                    ("workers", args.workers),
+                    ("part_workers", args.part_workers),
+                    ("poll_interval", args.poll_interval),
+                    ("max_wait", args.max_wait),
+                )
+                if value is not None
+            }
+            count = obs_manager.restore_download_objects(
+                args.bucket,
+                args.prefix or "",
+                download_path,
+                args.days,
+                args.tier,
+                **restore_options,
+                **plan_options,
+                **filter_options,
+            )
 
         elif args.operation == "download":
+            # Only forward tuning options that were given, so managers without them keep working
+            transfer_options = {
+                name: value
+                for name, value in (("workers", args.workers), ("part_workers", args.part_workers))
+                if value is not None
+            }
+            resume_options = {"resume": True} if args.resume else {}
+            if args.checkpoint:
+                resume_options["checkpoint_path"] = args.checkpoint
+
             if args.object_key:
                 # Cross-platform safe path handling for single file download
                 download_path = args.download_path
@@ -336,18 +463,98 @@ def command_line_mode(args):
                     if download_dir:
                         os.makedirs(download_dir, exist_ok=True)
                 
-                success = obs_manager.download_single_file(args.bucket, args.object_key, download_path)
+                transfer_options.pop("workers", None)
+                success = obs_manager.download_single_file(args.bucket, args.object_key, download_path, **transfer_options)
                 count = 1 if success else 0
             else:
                 # Cross-platform safe path handling for bulk download
                 download_path = args.download_path or os.path.join(os.getcwd(), "downloads")
                 os.makedirs(download_path, exist_ok=True)
-                count = obs_manager.download_objects(args.bucket, args.prefix or "", download_path)
+                count = obs_manager.download_objects(
+                    args.bucket, args.prefix or "", download_path, **transfer_options, **resume_options, **filter_options
+                )
 
         elif args.operation == "search":
-            count = obs_manager.search_objects(args.search_text, args.bucket or "", args.prefix or "")
-
-        print(f"Operation completed. Items processed: {count}")
+            if args.use_index or args.refresh_index:
+                count = obs_manager.search_objects(
+                    args.search_text,
+                    args.bucket or "",
+                    args.prefix or "",
+                    use_index=True,
+                    refresh_index=args.refresh_index,
+                    index_path=args.index_path,
+                    **output_options,
+                )
+            else:
+                search_options = {"workers": args.workers} if args.workers is not None else {}
+                count = obs_manager.search_objects(
+                    args.search_text, args.bucket or "", args.prefix or "", **search_options, **output_options
+                )
+
+        elif args.operation == "index":
+            count = obs_manager.build_index(
+                args.bucket or "", args.prefix or "", full=not args.incremental, index_path=args.index_path
+            )
+
+        elif args.operation == "sync":
+            download_path = args.local_dir or args.download_path or os.path.join(os.getcwd(), "downloads")
+            os.makedirs(download_path, exist_ok=True)
+            direction_options = {"direction": args.direction} if args.direction != "download" else {}
+            if args.prefer != "newer":
+                direction_options["prefer"] = args.prefer
+            count = obs_manager.sync_objects(
+                args.bucket,
+                args.prefix or "",
+                download_path,
+                delete_orphans=args.delete_orphans,
+                workers=args.workers,
+                manifest_path=args.manifest,
+                **direction_options,
+            )
+
+        elif args.operation == "upload":
+            upload_options = {
+                name: value
+                for name, value in (("workers", args.workers), ("part_workers", args.part_workers))
+                if value is not None
+            }
+            count = obs_manager.upload_objects(args.local_dir, args.bucket, args.prefix or "", **upload_options)
+
+        elif args.operation in ("copy", "replicate"):
+            copy_options = {
+                name: value
+                for name, value in (
+                    ("dest_prefix", args.dest_prefix),
+                    ("workers", args.workers),
+                    ("part_workers", args.part_workers),
+                )
+                if value is not None
+            }
+            count = obs_manager.copy_objects(args.bucket, args.prefix or "", args.dest_bucket, **copy_options)
+
+        elif args.operation == "report":
+            report_options = {
+                name: value
+                for name, value in (("depth", args.depth), ("workers", args.workers))
+                if value is not None
+            }
+            if args.output != "table":
+                report_options["output"] = args.output
+            count = obs_manager.report_objects(args.bucket, args.prefix or "", **report_options)
+
+        elif args.operation == "diff":
+            diff_options = {"dest_prefix": args.dest_prefix} if args.dest_prefix is not None else {}
+            count = obs_manager.diff_objects(
+                args.bucket, args.prefix or "", args.dest_bucket or args.bucket, **diff_options, **output_options
+            )
+
+        if args.quiet:
+            print(count)
+        elif args.output != "table":
+            # Keep stdout machine-readable
+            print(f"Operation completed. Items processed: {count}", file=sys.stderr)
+        else:
+            print(f"Operation completed. Items processed: {count}")
 
     except Exception as e:
         logger.error(f"Error in command line mode: {e}")
@@ -373,9 +580,63 @@ Examples:
   # Download objects
   python obs_utils_improved.py --operation download --bucket my-bucket --prefix folder/
 
+  # Stream a listing as JSON lines into another tool
+  python obs_utils_improved.py --operation list --bucket my-bucket --output jsonl | jq .key
+
+  # Export a listing to Parquet for analytics tools (requires pyarrow)
+  python obs_utils_improved.py --operation list --bucket my-bucket --export parquet --export-path listing.parquet
+
+  # List a large bucket with 8 concurrent partitions
+  python obs_utils_improved.py --operation list --bucket my-bucket --workers 8
+
+  # Download objects with 16 concurrent workers
+  python obs_utils_improved.py --operation download --bucket my-bucket --prefix folder/ --workers 16
+
+  # Resume an interrupted download
+  python obs_utils_improved.py --operation download --bucket my-bucket --prefix folder/ --resume
+
+  # Mirror a prefix, downloading only new or changed objects
+  python obs_utils_improved.py --operation sync --bucket my-bucket --prefix folder/ --download-path ./mirror
+
   # Search objects
   python obs_utils_improved.py --operation search --search-text "report" --bucket my-bucket
 
+  # Build a local index, then search it
+  python obs_utils_improved.py --operation index --bucket my-bucket
+  python obs_utils_improved.py --operation search --search-text "report" --use-index
+
+  # Keep a local tree and a bucket prefix in step in both directions
+  python obs_utils_improved.py --operation sync --bucket my-bucket --prefix projects/ --local-dir ./mirror --direction both
+
+  # Upload a directory, large files in concurrent parts
+  python obs_utils_improved.py --operation upload --local-dir ./backups --bucket my-bucket --prefix backups/ --workers 8
+
+  # Replicate a prefix to another bucket on the server side, skipping objects already there
+  python obs_utils_improved.py --operation replicate --bucket my-bucket --prefix data/ --dest-bucket my-backup --workers 32
+
+  # Usage report: size per storage class, age histogram and totals two directories deep
+  python obs_utils_improved.py --operation report --bucket my-bucket --prefix data/ --depth 2
+
+  # Before a migration, list keys missing, extra or different at the destination
+  python obs_utils_improved.py --operation diff --bucket my-bucket --prefix data/ --dest-bucket my-backup
+
+  # Report the objects and bytes the lifecycle_rules from config would move, then apply them
+  python obs_utils_improved.py --operation lifecycle --bucket my-bucket --plan
+  python obs_utils_improved.py --operation lifecycle --bucket my-bucket --workers 32
+
+  # Archive logs over 100 MB not modified since 2024, except the ones under keep/
+  python obs_utils_improved.py --operation archive --bucket my-bucket --include "logs/*.log" --exclude "logs/keep/*" --min-size 100M --modified-before 2024-01-01
+
+  # Show how many objects actually need a restore before sending any request
+  python obs_utils_improved.py --operation restore --bucket my-bucket --prefix archived/ --plan
+
+  # Restore archived objects and download each one as soon as it is readable
+  python obs_utils_improved.py --operation restore-download --bucket my-bucket --prefix archived/ --workers 8
+
+  # Run many small calls against a daemon that keeps the OBS client warm
+  python obs_daemon.py serve &
+  python obs_daemon.py run --operation list --bucket my-bucket --prefix logs/ --quiet
+
   # Create sample configuration
   python obs_utils_improved.py --create-config
         """
@@ -384,7 +645,8 @@ Examples:
     parser.add_argument("--config", default="obs_config.json", 
                        help="Configuration file path (default: obs_config.json)")
 
-    parser.add_argument("--operation", choices=["list", "download", "search", "archive", "warm", "restore"],
+    parser.add_argument("--operation", choices=["list", "download", "sync", "search", "index", "archive", "warm", "restore",
+                                                "restore-download", "upload", "copy", "replicate", "diff", "report", "lifecycle"],
                        help="Operation to perform")
 
     parser.add_argument("--bucket", help="Bucket name")
@@ -392,9 +654,84 @@ Examples:
     parser.add_argument("--object-key", help="Specific object key for single file operations")
     parser.add_argument("--search-text", help="Text to search for in object names")
     parser.add_argument("--download-path", help="Local download path")
+    parser.add_argument("--local-dir", help="Local directory to upload (or to sync, instead of --download-path)")
+    parser.add_argument("--dest-bucket", help="Destination bucket for copy and replicate, or bucket compared by diff "
+                                              "(default for diff: --bucket)")
+    parser.add_argument("--dest-prefix",
+                       help="With copy, replicate and diff, prefix replacing --prefix in destination keys "
+                            "(default: same keys)")
+    parser.add_argument("--workers", type=int,
+                       help="Number of concurrent requests (default: download_workers/transition_workers/"
+                            "search_workers/list_workers/copy_workers from config)")
+    parser.add_argument("--output", choices=["table", "jsonl", "csv", "tsv"], default="table",
+                       help="Output format for list, search, diff and report (default: table)")
+    parser.add_argument("--export", choices=["parquet", "arrow", "csv.gz"],
+                       help="With list, write the listing to a columnar file instead of printing it")
+    parser.add_argument("--export-path",
+                       help="File written by --export (default: <bucket>-listing.<format>)")
+    parser.add_argument("--depth", type=int,
+                       help="With report, directories below --prefix kept in prefix totals "
+                            "(default: report_prefix_depth from config)")
+    parser.add_argument("--quiet", action="store_true",
+                       help="Only print the final count")
+    parser.add_argument("--unsorted", action="store_true",
+                       help="With list and --workers, print objects as partitions return them instead of in key order")
+    parser.add_argument("--rate-limit", type=float,
+                       help="Maximum requests per second per bucket (default: max_requests_per_second from config)")
+    parser.add_argument("--part-workers", type=int,
+                       help="Concurrent ranged GETs, part uploads or part copies for large objects "
+                            "(default: download_part_workers/upload_part_workers from config)")
+    parser.add_argument("--resume", action="store_true",
+                       help="Resume an interrupted bulk download from its checkpoint")
+    parser.add_argument("--checkpoint",
+                       help="Checkpoint file for bulk downloads (default: <download-path>/.obs_download_checkpoint.jsonl)")
+    parser.add_argument("--delete-orphans", action="store_true",
+                       help="With sync, delete local files whose objects no longer exist")
+    parser.add_argument("--direction", choices=["download", "upload", "both"], default="download",
+                       help="With sync, transfer bucket to directory, directory to bucket, or both ways "
+                            "(default: download)")
+    parser.add_argument("--prefer", choices=["newer", "local", "remote"], default="newer",
+                       help="With sync --direction both, copy kept when a file changed on both sides (default: newer)")
+    parser.add_argument("--manifest",
+                       help="Sync manifest file (default: <download-path>/.obs_manifest.json)")
+    parser.add_argument("--use-index", action="store_true",
+                       help="Search the local object index instead of listing buckets")
+    parser.add_argument("--refresh-index", action="store_true",
+                       help="Append keys listed after the last indexed one to the local object index before "
+                            "searching it (append-only: deletions, overwrites and earlier keys need a full index)")
+    parser.add_argument("--incremental", action="store_true",
+                       help="With index, only add keys after the last indexed one (append-only: deletions, "
+                            "overwrites and earlier keys are only picked up without it)")
+    parser.add_argument("--index-path", help="Local object index file (default: index_path from config)")
     parser.add_argument("--days", type=int, default=1, help="Restore duration in days (default: 1)")
     parser.add_argument("--tier", choices=["Expedited", "Standard", "Bulk"], default="Expedited",
                        help="Restore tier (default: Expedited)")
+    parser.add_argument("--plan", action="store_true",
+                       help="With archive, warm, lifecycle, restore and restore-download, only print how many "
+                            "objects need a request, are pending or are skipped")
+    parser.add_argument("--include", action="append",
+                       help="With list, download, archive, warm, restore and restore-download, only process keys "
+                            "matching this glob (repeatable; * also matches /)")
+    parser.add_argument("--exclude", action="append",
+                       help="Skip keys matching this glob (repeatable)")
+    parser.add_argument("--regex",
+                       help="Only process keys matching this regular expression")
+    parser.add_argument("--min-size", type=parse_size,
+                       help="Only process objects of at least this size, e.g. 1024, 10K, 5MB or 2GiB")
+    parser.add_argument("--max-size", type=parse_size,
+                       help="Only process objects of at most this size")
+    parser.add_argument("--modified-after", type=parse_date,
+                       help="Only process objects modified on or after this date (YYYY-MM-DD[THH:MM:SS])")
+    parser.add_argument("--modified-before", type=parse_date,
+                       help="Only process objects modified before this date (YYYY-MM-DD[THH:MM:SS])")
+    parser.add_argument("--storage-class", action="append", choices=["STANDARD", "WARM", "COLD"],
+                       help="Only process objects currently in this storage class (repeatable)")
+    parser.add_argument("--poll-interval", type=float,
+                       help="With restore-download, initial seconds between restore status checks "
+                            "(default: restore_poll_interval from config)")
+    parser.add_argument("--max-wait", type=float,
+                       help="With restore-download, seconds to wait for restores "
+                            "(default: restore_max_wait from config)")
 
     parser.add_argument("--create-config", action="store_true", 
                        help="Create sample configuration file and exit")
@@ -423,6 +760,80 @@ Examples:
     return parser
 
 
+# Operations that apply the object filter options inside their listing
+FILTER_OPERATIONS = ("list", "download", "archive", "warm", "restore", "restore-download")
+FILTER_OPTIONS = ("include", "exclude", "regex", "min_size", "max_size", "modified_after", "modified_before", "storage_class")
+
+
+def validate_filter_args(args):
+    """Exit with an error if object filter options are given to an operation that would ignore them"""
+    given = [f"--{option.replace('_', '-')}" for option in FILTER_OPTIONS if getattr(args, option) is not None]
+    if not given:
+        return
+
+    if args.operation not in FILTER_OPERATIONS:
+        unsupported = f"the {args.operation} operation"
+    elif args.operation == "list" and args.export:
+        unsupported = "--export"
+    elif args.operation == "download" and args.object_key:
+        unsupported = "--object-key"
+    else:
+        return
+    print(f"Error: {', '.join(given)} not supported with {unsupported}; filters apply to: {', '.join(FILTER_OPERATIONS)}")
+    sys.exit(1)
+
+
+# Operations SecureOBSManager implements, with the options it does not take for each
+SECURE_OPERATIONS = {
+    "list": ("workers", "unsorted", "export"),
+    "download": ("object_key", "part_workers", "resume", "checkpoint"),
+    "search": ("use_index", "refresh_index", "workers"),
+    "archive": (),
+    "warm": (),
+    "restore": (),
+}
+
+
+def validate_secure_args(args):
+    """Exit with an error if --enable-security-levels is used with an operation or option it does not support"""
+    if args.operation not in SECURE_OPERATIONS:
+        print(f"Error: the {args.operation} operation is not available with --enable-security-levels")
+        sys.exit(1)
+
+    for option in SECURE_OPERATIONS[args.operation]:
+        if getattr(args, option) not in (None, False):
+            print(f"Error: --{option.replace('_', '-')} is not available for {args.operation} with --enable-security-levels")
+            sys.exit(1)
+
+
+def validate_operation_args(args):
+    """Exit with an error if arguments required by the operation are missing"""
+    if not args.bucket and args.operation not in ("search", "index"):
+        print("Error: --bucket is required for this operation")
+        sys.exit(1)
+
+    if args.operation == "search" and not args.search_text:
+        print("Error: --search-text is required for search operation")
+        sys.exit(1)
+
+    if args.operation == "upload" and not args.local_dir:
+        print("Error: --local-dir is required for upload operation")
+        sys.exit(1)
+
+    if args.operation in ("copy", "replicate") and not args.dest_bucket:
+        print("Error: --dest-bucket is required for copy and replicate operations")
+        sys.exit(1)
+
+    if args.operation == "diff" and not (args.dest_bucket or args.dest_prefix is not None):
+        print("Error: --dest-bucket or --dest-prefix is required for diff operation")
+        sys.exit(1)
+
+    validate_filter_args(args)
+
+    if getattr(args, "enable_security_levels", False):
+        validate_secure_args(args)
+
+
 def main():
     """Main function - Cross-platform compatible"""
     parser = create_parser()
@@ -502,14 +913,7 @@ def main():
     # Run in appropriate mode
     if args.operation:
         # Command line mode
-        if not args.bucket and args.operation != "search":
-            print("Error: --bucket is required for this operation")
-            sys.exit(1)
-
-        if args.operation == "search" and not args.search_text:
-            print("Error: --search-text is required for search operation")
-            sys.exit(1)
-
+        validate_operation_args(args)
         command_line_mode(args)
     else:
         # Interactive mode
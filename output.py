@@ -0,0 +1,169 @@
+"""
+Output module for OBS Utils
+Buffered writers for object listings in table, JSON-lines, CSV and TSV formats
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import csv
+import io
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+OUTPUT_FORMATS = ("table", "jsonl", "csv", "tsv")
+
+# (record field, table label) pairs in output order
+LIST_FIELDS: List[Tuple[str, str]] = [
+    ("key", "Key"),
+    ("last_modified", "Last Modified"),
+    ("size", "Size"),
+    ("owner", "Owner"),
+    ("storage_class", "Storage Class"),
+]
+SEARCH_FIELDS: List[Tuple[str, str]] = [
+    ("bucket", "Bucket"),
+    ("key", "File"),
+    ("last_modified", "Last Modified"),
+    ("size", "Size"),
+    ("owner", "Owner"),
+    ("storage_class", "Storage Class"),
+]
+DIFF_FIELDS: List[Tuple[str, str]] = [
+    ("status", "Status"),
+    ("key", "Key"),
+    ("size", "Size"),
+    ("dest_size", "Destination Size"),
+    ("etag", "ETag"),
+    ("dest_etag", "Destination ETag"),
+]
+
+# Characters buffered before writing to the stream
+BUFFER_SIZE = 256 * 1024
+
+
+def object_record(content: Any, bucket: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert a listing entry to an output record
+
+    Args:
+        content: Listing entry (from the paginated listing)
+        bucket: Bucket name to include (optional)
+
+    Returns:
+        Record dictionary
+    """
+    owner = getattr(content, "owner", None)
+    record = {
+        "key": content.key,
+        "last_modified": content.lastModified,
+        "size": content.size,
+        "owner": getattr(owner, "owner_name", None) if owner else None,
+        "storage_class": content.storageClass,
+    }
+    if bucket is not None:
+        record = {"bucket": bucket, **record}
+    return record
+
+
+class ObjectWriter:
+    """
+    Write object records to a stream through one buffer
+
+    Records are rendered into an in-memory buffer that is written to the
+    stream in large chunks, so listing millions of keys is not bound by
+    per-line console writes. Quiet mode only counts records. Writers are
+    meant to be used from a single thread.
+    """
+
+    def __init__(
+        self,
+        fields: List[Tuple[str, str]],
+        output: str = "table",
+        quiet: bool = False,
+        stream: Optional[TextIO] = None,
+        table_formatter: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ):
+        """
+        Initialize the writer
+
+        Args:
+            fields: (record field, table label) pairs in output order
+            output: Output format (table, jsonl, csv or tsv)
+            quiet: Count records without writing them
+            stream: Output stream (default: sys.stdout)
+            table_formatter: Custom rendering of one record in table format (optional)
+        """
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output}. Use one of {', '.join(OUTPUT_FORMATS)}")
+
+        self.fields = fields
+        self.output = output
+        self.quiet = quiet
+        self.stream = stream or sys.stdout
+        self.table_formatter = table_formatter
+        self.count = 0
+        self._buffer = io.StringIO()
+        self._csv = None
+
+        if output in ("csv", "tsv") and not quiet:
+            self._csv = csv.writer(self._buffer, delimiter="," if output == "csv" else "\t", lineterminator="\n")
+            self._csv.writerow([name for name, _ in fields])
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Write one record
+
+        Args:
+            record: Record dictionary (see object_record)
+        """
+        self.count += 1
+        if self.quiet:
+            return
+
+        if self.output == "jsonl":
+            self._buffer.write(json.dumps({name: record.get(name) for name, _ in self.fields}, default=str))
+            self._buffer.write("\n")
+        elif self._csv is not None:
+            self._csv.writerow(["" if record.get(name) is None else record.get(name) for name, _ in self.fields])
+        elif self.table_formatter:
+            self._buffer.write(self.table_formatter(record))
+        else:
+            for name, label in self.fields:
+                self._buffer.write(f"{label}: {record.get(name)}\n")
+            self._buffer.write("-" * 50 + "\n")
+
+        if self._buffer.tell() >= BUFFER_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered output to the stream"""
+        if self._buffer.tell():
+            self.stream.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Flush remaining output"""
+        self.flush()
+
+    def __enter__(self) -> "ObjectWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
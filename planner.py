@@ -0,0 +1,140 @@
+"""
+Request planner module for OBS Utils
+Work out which objects actually need a restore or storage class request
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+from logger import get_logger
+from obs_metadata import RESTORE_COMPLETED, RESTORE_ONGOING
+
+logger = get_logger(__name__)
+
+# Plan decisions
+TODO = "todo"
+PENDING = "pending"
+SKIP = "skip"
+
+ARCHIVE_STORAGE_CLASS = "COLD"
+
+# Listings omit the storage class of STANDARD objects
+DEFAULT_STORAGE_CLASS = "STANDARD"
+
+
+class RequestPlanner:
+    """
+    Classify listed objects into requests to send, restores already pending
+    and objects that need nothing
+
+    Storage class decisions come from the listing alone. Restore decisions
+    also need the restore status, which listings do not carry, so archived
+    objects are checked through ``restore_state`` (one metadata request,
+    much cheaper than a redundant restore). Counters are thread-safe.
+    """
+
+    def __init__(self, restore_state: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Initialize the planner
+
+        Args:
+            restore_state: Callable returning RESTORE_ONGOING, RESTORE_COMPLETED or None
+                           for an object key (optional; without it archived objects are always restored)
+        """
+        self.restore_state = restore_state
+        self._lock = threading.Lock()
+        self.counts: Counter = Counter()
+        self.reasons: Counter = Counter()
+
+    def _record(self, decision: str, reason: Optional[str] = None) -> str:
+        """Count a decision and, for skipped objects, its reason"""
+        with self._lock:
+            self.counts[decision] += 1
+            if reason:
+                self.reasons[reason] += 1
+        return decision
+
+    def plan_transition(self, content: Any, storage_class: str) -> str:
+        """
+        Decide whether an object needs a storage class change
+
+        Args:
+            content: Listing entry
+            storage_class: Target storage class
+
+        Returns:
+            TODO or SKIP
+        """
+        if (content.storageClass or DEFAULT_STORAGE_CLASS) == storage_class:
+            return self._record(SKIP, f"already {storage_class}")
+        return self._record(TODO)
+
+    def plan_restore(self, content: Any) -> str:
+        """
+        Decide whether an object needs a restore request
+
+        Args:
+            content: Listing entry
+
+        Returns:
+            TODO, PENDING (restore in progress) or SKIP (not archived or already restored)
+        """
+        if content.storageClass != ARCHIVE_STORAGE_CLASS:
+            return self._record(SKIP, "not archived")
+        if self.restore_state is None:
+            return self._record(TODO)
+
+        try:
+            state = self.restore_state(content.key)
+        except Exception as e:
+            # Without a status the restore request is the safe choice
+            logger.warning(f"Could not check restore status of {content.key}: {e}")
+            state = None
+        if state == RESTORE_ONGOING:
+            return self._record(PENDING)
+        if state == RESTORE_COMPLETED:
+            return self._record(SKIP, "already restored")
+        return self._record(TODO)
+
+    def summary(self) -> Dict[str, int]:
+        """Counts of to-do, pending and skipped objects"""
+        with self._lock:
+            return {"todo": self.counts[TODO], "pending": self.counts[PENDING], "skipped": self.counts[SKIP]}
+
+    def format(self, title: str) -> str:
+        """
+        Render the plan for display
+
+        Args:
+            title: First line, e.g. the operation and location
+
+        Returns:
+            Multi-line plan summary
+        """
+        summary = self.summary()
+        with self._lock:
+            reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.reasons.items()))
+        lines = [
+            title,
+            f"  To do:   {summary['todo']}",
+            f"  Pending: {summary['pending']}",
+            f"  Skipped: {summary['skipped']}" + (f" ({reasons})" if reasons else ""),
+        ]
+        return "\n".join(lines)
@@ -0,0 +1,159 @@
+"""
+Retry module for OBS Utils
+Capped exponential backoff with jitter for OBS requests
+
+Copyright 2025 CCVASS - Lima, Peru
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Contact: contact@ccvass.com
+"""
+
+import http.client
+import random
+import socket
+import time
+from typing import Any, Callable
+
+import requests
+
+from concurrency import THROTTLE_ERROR_CODES, THROTTLE_STATUSES
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# 5xx responses are retried as well
+RETRYABLE_STATUSES = (408,) + THROTTLE_STATUSES
+RETRYABLE_ERROR_CODES = THROTTLE_ERROR_CODES + ("RequestTimeout", "InternalError", "ServiceUnavailable")
+# Connection resets, refused connections, timeouts and truncated HTTP responses,
+# raised directly or by the pooled HTTP sessions of the SDK
+RETRYABLE_EXCEPTIONS = (
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    http.client.HTTPException,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+def is_retryable(resp: Any) -> bool:
+    """Whether an SDK response reports a transient failure"""
+    status = getattr(resp, "status", None)
+    if isinstance(status, int) and (status >= 500 or status in RETRYABLE_STATUSES):
+        return True
+    return getattr(resp, "errorCode", None) in RETRYABLE_ERROR_CODES
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Whether an exception reports a transient connection failure
+
+    The SDK re-raises failures of its pooled sessions wrapped in a plain
+    Exception, so the wrapped error and the exception chain are checked too.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, RETRYABLE_EXCEPTIONS):
+            return True
+        seen.add(id(error))
+        wrapped = error.args[0] if error.args and isinstance(error.args[0], BaseException) else None
+        error = wrapped or error.__cause__ or error.__context__
+    return False
+
+
+class RetryPolicy:
+    """
+    Retry transient failures with capped exponential backoff and full jitter
+
+    The wait before retry ``n`` is drawn uniformly from
+    ``[0, min(max_delay, base_delay * 2 ** (n - 1))]`` so that threads
+    throttled together do not retry together. Each request gets a budget
+    of ``max_attempts`` attempts and ``max_elapsed`` seconds; once either
+    is spent, the last response is returned (or the last error raised) for
+    the caller to handle as before.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.2,
+        max_delay: float = 20.0,
+        max_elapsed: float = 120.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            max_attempts: Attempts per request, including the first one (1 disables retries)
+            base_delay: Upper bound of the first backoff, in seconds
+            max_delay: Cap of the backoff upper bound, in seconds
+            max_elapsed: Seconds a request may spend including retries before giving up
+            sleep: Function used to wait (replaceable in tests)
+        """
+        if max_attempts < 1:
+            raise ValueError("Retry attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (from 1)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def call(self, operation: str, request: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Send a request, retrying transient failures within the budget
+
+        Args:
+            operation: Request name for log messages
+            request: Callable sending the request
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The first non-transient response, or the last response once the budget is spent
+
+        Raises:
+            Exception: Non-retryable errors at once, retryable ones once the budget is spent
+        """
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            error = None
+            try:
+                resp = request(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable_error(e):
+                    raise
+                error = e
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if not is_retryable(resp):
+                    return resp
+                reason = f"{resp.status} {resp.errorCode}"
+
+            delay = self.backoff(attempt)
+            if attempt >= self.max_attempts or time.monotonic() - started + delay > self.max_elapsed:
+                if attempt > 1:
+                    logger.error(f"Giving up {operation} after {attempt} attempts: {reason}")
+                if error is not None:
+                    raise error
+                return resp
+
+            logger.warning(f"Retrying {operation} in {delay:.2f}s after {reason} (attempt {attempt}/{self.max_attempts})")
+            self.sleep(delay)
+            attempt += 1
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for OBS Utils tests
+"""
+
+import json
+import os
+import tempfile
+from unittest.mock import Mock, patch
+
+import pytest
+
+
+def make_listing(keys, size=10, storage_class="STANDARD"):
+    """Build a single-page listObjects response for the given keys"""
+    contents = [
+        Mock(
+            key=key,
+            size=size,
+            etag='"etag"',
+            lastModified="2025/01/01 00:00:00",
+            storageClass=storage_class,
+            owner=Mock(owner_name="owner"),
+        )
+        for key in keys
+    ]
+    return Mock(status=200, body=Mock(contents=contents, is_truncated=False, next_marker=None))
+
+
+@pytest.fixture
+def manager():
+    """OBSManager with a mocked ObsClient"""
+    from obs_manager import OBSManager
+
+    test_config = {
+        "access_key_id": "test",
+        "secret_access_key": "test",
+        "server": "https://test.com",
+        "region": "test",
+    }
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(test_config, f)
+        temp_file = f.name
+
+    try:
+        with patch("obs_manager.ObsClient"):
+            manager = OBSManager(temp_file)
+            # Retry transient failures without waiting
+            manager.retry.sleep = lambda delay: None
+            yield manager
+    finally:
+        os.unlink(temp_file)
+
+
+@pytest.fixture
+def secure_manager():
+    """SecureOBSManager with a mocked ObsClient and no security levels"""
+    from obs_manager_secure import SecureOBSManager
+
+    test_config = {
+        "access_key_id": "test",
+        "secret_access_key": "test",
+        "server": "https://test.com",
+        "region": "test",
+    }
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(test_config, f)
+        temp_file = f.name
+
+    try:
+        with patch("obs_manager_secure.ObsClient"):
+            yield SecureOBSManager(temp_file, enable_security_levels=False)
+    finally:
+        os.unlink(temp_file)
+
+
+@pytest.fixture
+def async_manager():
+    """AsyncOBSManager with a mocked ObsClient"""
+    from obs_manager_async import AsyncOBSManager
+
+    test_config = {
+        "access_key_id": "test",
+        "secret_access_key": "test",
+        "server": "https://test.com",
+        "region": "test",
+    }
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(test_config, f)
+        temp_file = f.name
+
+    try:
+        with patch("obs_manager.ObsClient"):
+            manager = AsyncOBSManager(temp_file, concurrency=4)
+            manager.manager.retry.sleep = lambda delay: None
+            yield manager
+    finally:
+        os.unlink(temp_file)
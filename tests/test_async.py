@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio OBS manager
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from filters import ObjectFilter
+from tests.conftest import make_listing
+from tests.test_listing import fake_bucket
+from tests.test_upload import write_tree
+
+
+async def collect(items):
+    """Consume an async iterator into a list"""
+    return [item async for item in items]
+
+
+class TestFanOut:
+    """Test AsyncOBSManager.fan_out"""
+
+    def test_bounded_by_concurrency(self, async_manager):
+        """No more than ``concurrency`` blocking calls run at once"""
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def blocking(item):
+            with lock:
+                active.append(item)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(item)
+            return item % 3 != 0 or None
+
+        async def worker(item):
+            return await async_manager._call(blocking, item)
+
+        stats = asyncio.run(async_manager.fan_out(range(20), worker))
+
+        assert stats.processed == 20
+        assert stats.skipped == 7
+        assert max(peak) <= async_manager.concurrency
+
+    def test_capped_by_adaptive_maximum(self, async_manager):
+        """The executor is not larger than the adaptive controller lets requests run"""
+        from obs_manager_async import AsyncOBSManager
+
+        with patch("obs_manager.ObsClient"):
+            capped = AsyncOBSManager(async_manager.config.config_file, concurrency=1000)
+
+        assert capped.concurrency == capped.manager.adaptive.maximum == 64
+        assert capped._executor._max_workers == 64
+
+    def test_worker_errors_counted(self, async_manager):
+        """A failing worker is recorded as a failure without stopping the others"""
+
+        async def worker(item):
+            if item == 1:
+                raise RuntimeError("boom")
+            return True
+
+        stats = asyncio.run(async_manager.fan_out(range(3), worker))
+        assert (stats.succeeded, stats.failed) == (2, 1)
+
+
+class TestAsyncOperations:
+    """Test AsyncOBSManager operations"""
+
+    def test_list_objects_pages(self, async_manager):
+        """``async for`` follows markers across pages and applies filters"""
+        async_manager.config.config["max_keys"] = 2
+        async_manager.manager.client.listObjects.side_effect = fake_bucket(["a.log", "b.txt", "c.log", "d.log", "e.txt"])
+
+        keys = asyncio.run(collect(async_manager.list_objects("bucket", key_filter=ObjectFilter(include=["*.log"]))))
+
+        assert [content.key for content in keys] == ["a.log", "c.log", "d.log"]
+        assert async_manager.manager.client.listObjects.call_count == 3
+
+    def test_download_objects(self, async_manager, tmp_path):
+        """Each listed object is downloaded with a single GET"""
+        async_manager.manager.client.listObjects.return_value = make_listing(["a", "dir/b"])
+        async_manager.manager.client.getObject.return_value = Mock(status=200)
+
+        count = asyncio.run(async_manager.download_objects("bucket", "", str(tmp_path)))
+
+        assert count == 2
+        paths = {call.kwargs["downloadPath"] for call in async_manager.manager.client.getObject.call_args_list}
+        assert paths == {str(tmp_path / "a"), str(tmp_path / "dir" / "b")}
+
+    def test_upload_objects(self, async_manager, tmp_path):
+        """Local files are uploaded under the prefix"""
+        write_tree(tmp_path, {"a.txt": b"hello", "sub/b.txt": b"world"})
+        async_manager.manager.client.putFile.return_value = Mock(status=200, body=Mock(etag=None))
+
+        assert asyncio.run(async_manager.upload_objects(str(tmp_path), "bucket", "backup/")) == 2
+        keys = {call.args[1] for call in async_manager.manager.client.putFile.call_args_list}
+        assert keys == {"backup/a.txt", "backup/sub/b.txt"}
+
+    def test_upload_objects_walks_lazily(self, async_manager, tmp_path):
+        """Files are pulled from the directory walk as upload slots free up"""
+        write_tree(tmp_path, {f"{i}.txt": b"x" for i in range(10)})
+        async_manager.manager.client.putFile.return_value = Mock(status=200, body=Mock(etag=None))
+        walked = []
+        local_files = async_manager.manager._local_files
+
+        def tracked(local_dir):
+            for item in local_files(local_dir):
+                walked.append(item)
+                # Never more than one slot's worth ahead of the uploads started
+                assert len(walked) <= async_manager.manager.client.putFile.call_count + async_manager.concurrency + 1
+                yield item
+
+        async_manager.manager._local_files = tracked
+
+        assert asyncio.run(async_manager.upload_objects(str(tmp_path), "bucket")) == 10
+        assert len(walked) == 10
+
+    def test_change_storage_class_skips_target_class(self, async_manager):
+        """Objects already in the target class are not sent a request"""
+        listing = make_listing(["a", "b"], storage_class="STANDARD")
+        listing.body.contents += make_listing(["c"], storage_class="COLD").body.contents
+        async_manager.manager.client.listObjects.return_value = listing
+        async_manager.manager.client.setObjectMetadata.return_value = Mock(status=200)
+
+        assert asyncio.run(async_manager.change_storage_class("bucket", "", "COLD")) == 3
+        assert async_manager.manager.client.setObjectMetadata.call_count == 2
+
+    def test_restore_objects(self, async_manager):
+        """Only archived objects without a restore get a restore request"""
+        listing = make_listing(["cold/a", "cold/b"], storage_class="COLD")
+        listing.body.contents += make_listing(["warm/c"], storage_class="WARM").body.contents
+        async_manager.manager.client.listObjects.return_value = listing
+        async_manager.manager.client.restoreObject.return_value = Mock(status=202)
+
+        def get_metadata(bucket, key):
+            restore = 'ongoing-request="true"' if key == "cold/b" else None
+            return Mock(status=200, body=Mock(restore=restore))
+
+        async_manager.manager.client.getObjectMetadata.side_effect = get_metadata
+
+        assert asyncio.run(async_manager.restore_objects("bucket", "", days=1, tier="Bulk")) == 3
+        async_manager.manager.client.restoreObject.assert_called_once_with("bucket", "cold/a", 1, "Bulk")
+
+    def test_bucket_validated(self, async_manager):
+        """Bucket names are validated and requests use the sanitized name"""
+        with pytest.raises(ValueError):
+            asyncio.run(async_manager.change_storage_class(""))
+
+        async_manager.manager.client.listObjects.return_value = make_listing(["a"], storage_class="STANDARD")
+        async_manager.manager.client.setObjectMetadata.return_value = Mock(status=200)
+        asyncio.run(async_manager.change_storage_class(" bucket ", "", "COLD"))
+
+        assert async_manager.manager.client.setObjectMetadata.call_args.args[0] == "bucket"
+
+    def test_close(self, async_manager):
+        """Closing shuts down the executor and the OBS client"""
+        asyncio.run(async_manager.close())
+        async_manager.manager.client.close.assert_called_once()
@@ -209,6 +209,12 @@ class TestOBSManager:
                 secret_access_key="test_secret",
                 server="https://test.example.com",
                 region="test-region",
+                long_conn_mode=True,
+                timeout=60,
+                chunk_size=262144,
+                max_retry_count=0,
+                use_http_conns=True,
+                pool_size=64,
             )
 
         finally:
@@ -299,6 +305,69 @@ class TestCLI:
         sample_config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "obs_config.json.sample")
         assert os.path.exists(sample_config_path)
 
+    @pytest.mark.parametrize(
+        "argv,message",
+        [
+            (["--operation", "sync", "--exclude", "*.tmp"], "--exclude not supported with the sync operation"),
+            (["--operation", "report", "--min-size", "1M"], "--min-size not supported with the report operation"),
+            (["--operation", "list", "--export", "csv.gz", "--include", "*.log"], "--include not supported with --export"),
+        ],
+    )
+    def test_filters_rejected_where_ignored(self, argv, message, capsys):
+        """Filter options are refused by operations that would silently ignore them"""
+        from obs_utils_improved import create_parser, validate_operation_args
+
+        args = create_parser().parse_args(argv + ["--bucket", "b"])
+
+        with pytest.raises(SystemExit) as exc_info:
+            validate_operation_args(args)
+
+        assert exc_info.value.code == 1
+        assert message in capsys.readouterr().out
+
+    def test_filters_accepted_where_applied(self):
+        """Operations that filter their listing accept the options"""
+        from obs_utils_improved import create_parser, validate_operation_args
+
+        args = create_parser().parse_args(["--operation", "archive", "--bucket", "b", "--exclude", "keep/*"])
+        validate_operation_args(args)
+
+    @pytest.mark.parametrize(
+        "argv,message",
+        [
+            (["--operation", "sync"], "sync operation is not available"),
+            (["--operation", "download", "--part-workers", "4"], "--part-workers is not available for download"),
+            (["--operation", "download", "--object-key", "a.txt"], "--object-key is not available for download"),
+            (["--operation", "download", "--resume"], "--resume is not available for download"),
+            (["--operation", "download", "--checkpoint", "c.jsonl"], "--checkpoint is not available for download"),
+            (["--operation", "search", "--search-text", "x", "--use-index"], "--use-index is not available for search"),
+            (["--operation", "search", "--search-text", "x", "--workers", "4"], "--workers is not available for search"),
+            (["--operation", "list", "--workers", "4"], "--workers is not available for list"),
+            (["--operation", "list", "--unsorted"], "--unsorted is not available for list"),
+            (["--operation", "list", "--export", "csv.gz"], "--export is not available for list"),
+        ],
+    )
+    def test_security_levels_reject_unsupported_arguments(self, argv, message, capsys):
+        """Operations and options SecureOBSManager lacks are refused before it is created"""
+        from obs_utils_improved import create_parser, validate_operation_args
+
+        args = create_parser().parse_args(argv + ["--bucket", "b", "--enable-security-levels"])
+
+        with pytest.raises(SystemExit) as exc_info:
+            validate_operation_args(args)
+
+        assert exc_info.value.code == 1
+        assert message in capsys.readouterr().out
+
+    def test_security_levels_accept_supported_arguments(self):
+        """Supported operations pass validation with security levels"""
+        from obs_utils_improved import create_parser, validate_operation_args
+
+        args = create_parser().parse_args(
+            ["--operation", "archive", "--bucket", "b", "--workers", "4", "--enable-security-levels"]
+        )
+        validate_operation_args(args)
+
 
 @pytest.mark.integration
 class TestIntegration:
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for resumable download checkpoints
+"""
+
+import os
+from unittest.mock import Mock
+
+import pytest
+
+import checkpoint as checkpoint_module
+from checkpoint import DownloadCheckpoint
+from tests.conftest import make_listing
+
+
+class TestDownloadCheckpoint:
+    """Test the checkpoint journal"""
+
+    def test_marker_advances_in_listing_order(self, tmp_path):
+        """The marker only moves past keys whose predecessors are all done"""
+        cp = DownloadCheckpoint(str(tmp_path / "cp.jsonl"), "bucket", "p/")
+        for key in ["a", "b", "c"]:
+            cp.listed(key)
+
+        cp.mark_done("b")
+        assert cp.marker is None
+
+        cp.mark_done("a")
+        assert cp.marker == "b"
+        assert cp.is_done("a") and cp.is_done("b") and not cp.is_done("c")
+        cp.close()
+
+    def test_marker_moves_past_failed_keys(self, tmp_path):
+        """A failed key does not hold the marker, and is retried on resume"""
+        path = str(tmp_path / "cp.jsonl")
+        cp = DownloadCheckpoint(path, "bucket", "")
+        for key in ["a", "b", "c", "d"]:
+            cp.listed(key)
+        cp.mark_done("a")
+        cp.mark_failed("b")
+        cp.mark_done("c")
+        cp.mark_failed("d")
+
+        assert cp.marker == "d"
+        assert len(cp._listed) == 0
+        assert not cp.is_done("b")
+        cp.close()
+
+        resumed = DownloadCheckpoint(path, "bucket", "", resume=True)
+        assert resumed.failed_keys() == ["b", "d"]
+        resumed.mark_done("b")
+        resumed.close()
+
+        assert DownloadCheckpoint(path, "bucket", "", resume=True).failed_keys() == ["d"]
+
+    def test_resume_replays_journal(self, tmp_path):
+        """A resumed checkpoint restores the marker and keys done past it"""
+        path = str(tmp_path / "cp.jsonl")
+        cp = DownloadCheckpoint(path, "bucket", "p/")
+        for key in ["a", "b", "c", "d"]:
+            cp.listed(key)
+        cp.mark_done("a")
+        cp.mark_done("c")
+        cp.close()
+
+        resumed = DownloadCheckpoint(path, "bucket", "p/", resume=True)
+        assert resumed.marker == "a"
+        assert resumed.is_done("c")
+        assert not resumed.is_done("b")
+        resumed.close()
+
+    def test_fresh_run_discards_journal(self, tmp_path):
+        """Without resume an existing journal is started over"""
+        path = str(tmp_path / "cp.jsonl")
+        cp = DownloadCheckpoint(path, "bucket", "")
+        cp.listed("a")
+        cp.mark_done("a")
+        cp.close()
+
+        fresh = DownloadCheckpoint(path, "bucket", "")
+        assert fresh.marker is None
+        assert not fresh.is_done("a")
+        fresh.close()
+
+    def test_job_mismatch_rejected(self, tmp_path):
+        """A checkpoint cannot be resumed for a different bucket"""
+        path = str(tmp_path / "cp.jsonl")
+        DownloadCheckpoint(path, "bucket", "").close()
+
+        with pytest.raises(ValueError):
+            DownloadCheckpoint(path, "other", "", resume=True)
+
+    def test_ranges_survive_restart(self, tmp_path):
+        """Completed ranges are kept for the same ETag and dropped when it changes"""
+        path = str(tmp_path / "cp.jsonl")
+        cp = DownloadCheckpoint(path, "bucket", "")
+        cp.mark_range("big", '"e1"', 300, 0, 99)
+        cp.mark_range("big", '"e1"', 300, 200, 299)
+        cp.close()
+
+        resumed = DownloadCheckpoint(path, "bucket", "", resume=True)
+        assert resumed.pending_ranges("big", '"e1"', 300, 100) == [(100, 199)]
+        assert len(resumed.pending_ranges("big", '"e2"', 300, 100)) == 3
+        resumed.close()
+
+    def test_marker_persisted_periodically(self, tmp_path, monkeypatch):
+        """The marker is appended to the journal while the job runs"""
+        monkeypatch.setattr(checkpoint_module, "MARKER_INTERVAL", 2)
+        path = str(tmp_path / "cp.jsonl")
+        cp = DownloadCheckpoint(path, "bucket", "")
+        for key in ["a", "b"]:
+            cp.listed(key)
+            cp.mark_done(key)
+
+        with open(path, encoding="utf-8") as f:
+            assert '"marker": "b"' in f.read()
+        cp.close()
+
+
+class TestResumableDownload:
+    """Test OBSManager.download_objects with resume"""
+
+    def test_resume_skips_completed_keys(self, manager, tmp_path):
+        """A resumed run only downloads keys that failed or never started"""
+        keys = ["a", "b", "c"]
+        manager.client.listObjects.return_value = make_listing(keys)
+        manager.client.getObject.side_effect = lambda bucket, key, **kwargs: Mock(status=500 if key == "b" else 200)
+
+        manager.download_objects("bucket", "", str(tmp_path), workers=1)
+        checkpoint_file = os.path.join(str(tmp_path), ".obs_download_checkpoint.jsonl")
+        assert os.path.exists(checkpoint_file)
+
+        manager.client.getObject.reset_mock()
+        manager.client.getObject.side_effect = lambda bucket, key, **kwargs: Mock(status=200)
+        manager.client.getObjectMetadata.return_value = Mock(status=200, body=Mock(contentLength=1024, etag="etag"))
+        manager.client.listObjects.return_value = make_listing([])
+
+        count = manager.download_objects("bucket", "", str(tmp_path), workers=1, resume=True)
+
+        # The marker moved past the failed key, which is retried from the journal
+        assert count == 1
+        assert [call.args[1] for call in manager.client.getObject.call_args_list] == ["b"]
+        manager.client.getObjectMetadata.assert_called_once_with("bucket", "b")
+        assert manager.client.listObjects.call_args.kwargs["marker"] == "c"
+        assert not os.path.exists(checkpoint_file)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent bulk operations
+"""
+
+import os
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from concurrency import AdaptiveConcurrency, PollSchedule, TaskStats, is_throttled, merge_concurrent, run_worker_pool
+from tests.conftest import make_listing
+
+
+class TestWorkerPool:
+    """Test the bounded worker pool"""
+
+    def test_counts_outcomes(self):
+        """Success, failure, skip and exceptions are all counted"""
+
+        def worker(item):
+            if item == "boom":
+                raise RuntimeError("boom")
+            return {"ok": True, "bad": False, "skip": None}[item]
+
+        stats = run_worker_pool(["ok", "ok", "bad", "skip", "boom"], worker, workers=3)
+
+        assert stats.processed == 5
+        assert stats.succeeded == 2
+        assert stats.failed == 2
+        assert stats.skipped == 1
+
+    def test_runs_concurrently(self):
+        """Workers process items in parallel"""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def worker(item):
+            with lock:
+                active.append(item)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(item)
+            return True
+
+        stats = run_worker_pool(range(20), worker, workers=4)
+
+        assert stats.succeeded == 20
+        assert max(peak) > 1
+
+    def test_inline_when_single_worker(self):
+        """A single worker runs in the calling thread"""
+        threads = set()
+
+        def worker(item):
+            threads.add(threading.current_thread())
+            return True
+
+        run_worker_pool(range(5), worker, workers=1)
+
+        assert threads == {threading.current_thread()}
+
+    def test_producer_error_propagates(self):
+        """Listing errors stop the pool and are raised to the caller"""
+
+        def items():
+            yield 1
+            raise RuntimeError("listing failed")
+
+        with pytest.raises(RuntimeError):
+            run_worker_pool(items(), lambda item: True, workers=2)
+
+    def test_stats_repr(self):
+        """Stats have a readable representation"""
+        stats = TaskStats()
+        stats.record(True)
+        assert "succeeded=1" in repr(stats)
+
+
+class TestMergeConcurrent:
+    """Test merging concurrent sources"""
+
+    def test_merges_all_items(self):
+        """Every item of every source is yielded with its source name"""
+        sources = [(name, lambda name=name: [f"{name}{i}" for i in range(50)]) for name in "abc"]
+
+        merged = list(merge_concurrent(sources, workers=2))
+
+        assert len(merged) == 150
+        assert ("b", "b7") in merged
+
+    def test_failed_source_reported_separately(self):
+        """A failing source is recorded in errors while others complete"""
+
+        def failing():
+            yield "x"
+            raise RuntimeError("denied")
+
+        errors = {}
+        merged = list(merge_concurrent([("bad", failing), ("good", lambda: ["y", "z"])], workers=2, errors=errors))
+
+        assert ("good", "z") in merged
+        assert list(errors) == ["bad"]
+        assert "denied" in str(errors["bad"])
+
+    def test_early_close_stops_producers(self):
+        """Abandoning the stream does not leave producers blocked"""
+        stream = merge_concurrent([("a", lambda: iter(range(10**6)))], workers=1, queue_size=4)
+
+        assert next(stream) == ("a", 0)
+        stream.close()
+
+        assert not [t for t in threading.enumerate() if t.name.startswith("obs-source")]
+
+
+class TestPollSchedule:
+    """Test the per-item polling backoff"""
+
+    def test_backoff_doubles_up_to_maximum(self):
+        """Unchanged items are checked again after twice their interval, capped"""
+        schedule = PollSchedule(["a"], 0, 0)
+        schedule.max_interval = 4
+        assert schedule.wait(time.monotonic() + 1)
+        assert schedule.due() == [(0, "a")]
+
+        schedule.reschedule(3, "a")
+        assert schedule._heap[0][2] == 4
+        assert schedule.due() == []
+        assert len(schedule) == 1
+
+    def test_reset_and_deadline(self):
+        """reset() returns items to the base interval, and wait() stops at the deadline"""
+        schedule = PollSchedule([], 60, 600)
+        schedule.reschedule(300, "a")
+        schedule.reset()
+        assert schedule._heap[0][2] == 60
+
+        assert not schedule.wait(time.monotonic())
+        assert schedule.items() == ["a"]
+
+
+class TestAdaptiveConcurrency:
+    """Test the AIMD request concurrency controller"""
+
+    def test_additive_increase(self):
+        """About ``limit`` healthy responses raise the limit by one"""
+        controller = AdaptiveConcurrency(initial=4, maximum=8)
+        for _ in range(5):
+            controller.call(lambda: Mock(status=200, errorCode=None))
+
+        assert controller.limit == 5
+        assert controller.decisions[-1]["action"] == "increase"
+
+    def test_throttling_halves_once_per_event(self):
+        """Throttles from requests sent before a cut do not cut again"""
+        controller = AdaptiveConcurrency(initial=16, maximum=64)
+        started = [controller.acquire() for _ in range(3)]
+        for start in started:
+            controller.release(start, throttled=True)
+
+        assert controller.limit == 8
+        assert controller.throttled == 3
+        snapshot = controller.snapshot()
+        assert [d["action"] for d in snapshot["decisions"]] == ["decrease"]
+        assert snapshot["decisions"][0]["from"] == 16
+
+        controller.call(lambda: Mock(status=503, errorCode="SlowDown"))
+        assert controller.limit == 4
+
+    def test_errors_hold_the_limit(self):
+        """Server errors neither raise nor cut the limit, and stop growth while frequent"""
+        controller = AdaptiveConcurrency(initial=2, maximum=8, max_error_rate=0.2)
+        controller.call(lambda: Mock(status=500, errorCode="InternalError"))
+        for _ in range(4):
+            controller.call(lambda: Mock(status=200, errorCode=None))
+
+        assert controller.limit == 2
+        assert controller.error_rate == pytest.approx(0.2)
+
+    def test_slow_responses_hold_the_limit(self):
+        """Average latency above the target stops growth"""
+        controller = AdaptiveConcurrency(initial=2, maximum=8, latency_target=0.001)
+        for _ in range(4):
+            controller.call(lambda: time.sleep(0.005) or Mock(status=200, errorCode=None))
+
+        assert controller.limit == 2
+
+    def test_bounds_requests_in_flight(self):
+        """Threads block while the limit is reached"""
+        controller = AdaptiveConcurrency(initial=2, maximum=2)
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def request():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+            return Mock(status=200, errorCode=None)
+
+        run_worker_pool(range(12), lambda item: controller.call(request) is not None, workers=6)
+
+        assert max(peak) <= 2
+        assert controller.in_flight == 0
+
+    def test_is_throttled(self):
+        """429, 503 and SlowDown error codes are throttling"""
+        assert is_throttled(Mock(status=429, errorCode=None))
+        assert is_throttled(Mock(status=503, errorCode=None))
+        assert is_throttled(Mock(status=400, errorCode="SlowDown"))
+        assert not is_throttled(Mock(status=500, errorCode="InternalError"))
+
+    def test_manager_requests_go_through_controller(self, manager):
+        """OBSManager bulk operations shrink the limit on SlowDown responses"""
+        manager.client.listObjects.return_value = make_listing(["a", "b"], storage_class="STANDARD")
+        manager.client.setObjectMetadata.return_value = Mock(status=503, errorCode="SlowDown", errorMessage="Slow Down")
+        manager.retry.max_attempts = 1
+        initial = manager.adaptive.limit
+
+        manager.change_storage_class("bucket", "", "COLD")
+
+        assert manager.adaptive.limit < initial
+        assert manager.adaptive.throttled == 2
+
+
+class TestConcurrentSearch:
+    """Test OBSManager.search_objects across buckets"""
+
+    def test_searches_buckets_concurrently(self, manager, capsys):
+        """All buckets are scanned and a failing bucket does not hide the others"""
+        buckets = [Mock(), Mock(), Mock()]
+        for bucket, name in zip(buckets, ("one", "two", "broken")):
+            bucket.name = name
+        manager.client.listBuckets.return_value = Mock(status=200, body=Mock(buckets=buckets))
+
+        def list_objects(bucket, **kwargs):
+            if bucket == "broken":
+                return Mock(status=403, errorCode="AccessDenied", errorMessage="denied")
+            return make_listing([f"{bucket}/report.csv", f"{bucket}/image.png"])
+
+        manager.client.listObjects.side_effect = list_objects
+
+        assert manager.search_objects("report", workers=3) == 2
+        assert "✗ Error searching in bucket broken" in capsys.readouterr().out
+
+
+class TestConcurrentDownload:
+    """Test OBSManager.download_objects with workers"""
+
+    def test_download_objects_with_workers(self, manager, tmp_path):
+        """All listed objects are downloaded under the download directory"""
+        keys = [f"folder/file{i}.txt" for i in range(10)]
+        manager.client.listObjects.return_value = make_listing(keys)
+        manager.client.getObject.return_value = Mock(status=200)
+
+        count = manager.download_objects("bucket", "folder/", str(tmp_path), workers=4)
+
+        assert count == 10
+        assert manager.client.getObject.call_count == 10
+        paths = {call.kwargs["downloadPath"] for call in manager.client.getObject.call_args_list}
+        assert os.path.join(str(tmp_path), "folder", "file0.txt") in paths
+
+    def test_download_failures_still_counted(self, manager, tmp_path):
+        """Failed downloads are counted as processed"""
+        manager.client.listObjects.return_value = make_listing(["a", "b"])
+        manager.client.getObject.return_value = Mock(status=404)
+
+        assert manager.download_objects("bucket", "", str(tmp_path), workers=2) == 2
+
+
+class FakeStream:
+    """Minimal stand-in for the SDK response stream"""
+
+    def __init__(self, data):
+        self._data = data
+        self._offset = 0
+
+    def read(self, size):
+        chunk = self._data[self._offset : self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+    def close(self):
+        pass
+
+
+def ranged_get(data):
+    """Build a getObject side effect serving byte ranges of ``data``"""
+
+    def get_object(bucket, key, downloadPath=None, headers=None, **kwargs):
+        start, end = (int(value) for value in headers["range"].split("-"))
+        return Mock(status=206, body=Mock(response=FakeStream(data[start : end + 1])))
+
+    return get_object
+
+
+class TestRangedDownload:
+    """Test parallel ranged downloads of large objects"""
+
+    def test_ranged_download_reassembles_file(self, manager, tmp_path):
+        """Parts are written at their offsets and the file is renamed into place"""
+        import hashlib
+
+        data = os.urandom(1000)
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        manager.config.config.update({"multipart_download_threshold": 100, "download_part_size": 128})
+        manager.client.getObject.side_effect = ranged_get(data)
+
+        local_path = str(tmp_path / "big.bin")
+        assert manager._download_object("bucket", "big.bin", local_path, size=len(data), etag=etag, part_workers=4)
+
+        with open(local_path, "rb") as f:
+            assert f.read() == data
+        assert manager.client.getObject.call_count == 8
+        assert not os.path.exists(local_path + ".obspart")
+
+    def test_ranged_download_rejects_etag_mismatch(self, manager, tmp_path):
+        """A file whose MD5 does not match the ETag is discarded"""
+        data = os.urandom(500)
+        manager.config.config.update({"multipart_download_threshold": 100, "download_part_size": 100})
+        manager.client.getObject.side_effect = ranged_get(data)
+
+        local_path = str(tmp_path / "big.bin")
+        assert not manager._download_object("bucket", "big.bin", local_path, size=500, etag="0" * 32, part_workers=2)
+        assert not os.path.exists(local_path)
+        assert not os.path.exists(local_path + ".obspart")
+
+    def test_single_file_uses_metadata_for_size(self, manager, tmp_path):
+        """download_single_file looks up size and ETag before choosing ranged mode"""
+        data = os.urandom(300)
+        manager.config.config.update({"multipart_download_threshold": 100, "download_part_size": 100})
+        manager.client.getObjectMetadata.return_value = Mock(status=200, body=Mock(contentLength=300, etag='"abc-2"'))
+        manager.client.getObject.side_effect = ranged_get(data)
+
+        local_path = str(tmp_path / "big.bin")
+        assert manager.download_single_file("bucket", "big.bin", local_path, part_workers=3)
+        assert manager.client.getObject.call_count == 3
+        assert manager.client.getObject.call_args.kwargs["headers"]["if_match"] == '"abc-2"'
+
+    def test_md5_from_etag(self):
+        """Only single-part ETags carry an MD5 digest"""
+        from obs_metadata import md5_from_etag
+
+        assert md5_from_etag('"D41D8CD98F00B204E9800998ECF8427E"') == "d41d8cd98f00b204e9800998ecf8427e"
+        assert md5_from_etag('"abc-3"') is None
+        assert md5_from_etag(None) is None
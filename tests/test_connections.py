@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for connection pool and keep-alive options
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from config import Config
+from obs_manager import create_obs_client
+
+CREDENTIALS = {"access_key_id": "key", "secret_access_key": "secret", "server": "https://test.com"}
+
+
+def load_config(tmp_path, **values):
+    """Config loaded from a file holding credentials and the given values"""
+    config_file = tmp_path / "obs_config.json"
+    config_file.write_text(json.dumps(dict(CREDENTIALS, **values)))
+    return Config(str(config_file))
+
+
+class TestClientOptions:
+    """Test Config.client_options"""
+
+    def test_defaults_keep_connections_open(self, tmp_path):
+        """Keep-alive and a pool sized for concurrent jobs by default"""
+        assert load_config(tmp_path).client_options() == {
+            "long_conn_mode": True,
+            "timeout": 60,
+            "chunk_size": 262144,
+            "max_retry_count": 3,
+            "use_http_conns": True,
+            "pool_size": 64,
+        }
+
+    def test_env_overrides(self, tmp_path, monkeypatch):
+        """OBS_* variables override the file"""
+        monkeypatch.setenv("OBS_KEEP_ALIVE", "false")
+        monkeypatch.setenv("OBS_CONNECTION_POOL_SIZE", "128")
+        monkeypatch.setenv("OBS_SOCKET_TIMEOUT", "30")
+
+        options = load_config(tmp_path, keep_alive=True, connection_pool_size=16).client_options()
+
+        assert options["long_conn_mode"] is False
+        assert options["pool_size"] == 128
+        assert options["timeout"] == 30
+
+    def test_pool_disabled(self, tmp_path):
+        """A pool size of 0 leaves the pool options out"""
+        options = load_config(tmp_path, connection_pool_size=0).client_options()
+        assert "use_http_conns" not in options
+        assert "pool_size" not in options
+
+
+class TestCreateClient:
+    """Test create_obs_client"""
+
+    def test_options_passed(self):
+        """Credentials and options reach the client"""
+        client_class = Mock()
+        create_obs_client(client_class, {"server": "s"}, {"timeout": 5, "pool_size": 8, "use_http_conns": True})
+        client_class.assert_called_once_with(server="s", timeout=5, pool_size=8, use_http_conns=True)
+
+    def test_falls_back_without_pool_support(self):
+        """Older SDKs get keep-alive connections without the pool options"""
+
+        def client_class(server, long_conn_mode=False, timeout=60):
+            return Mock(server=server, long_conn_mode=long_conn_mode)
+
+        options = {"long_conn_mode": True, "timeout": 5, "use_http_conns": True, "pool_size": 8}
+        client = create_obs_client(client_class, {"server": "s"}, options)
+
+        assert client.long_conn_mode is True
+
+    def test_other_type_errors_raised(self):
+        """Without pool options a TypeError is not swallowed"""
+        client_class = Mock(side_effect=TypeError("bad argument"))
+        with pytest.raises(TypeError):
+            create_obs_client(client_class, {"server": "s"}, {"timeout": 5})
+        assert client_class.call_count == 1
+
+    def test_secure_manager_uses_options(self, secure_manager):
+        """SecureOBSManager's client is created with the same options"""
+        from obs_manager_secure import ObsClient
+
+        assert ObsClient.call_args.kwargs["pool_size"] == 64
+        assert ObsClient.call_args.kwargs["long_conn_mode"] is True
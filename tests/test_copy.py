@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for server-side copy, diff and the listing merge-join
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from listing_join import merge_join
+from tests.conftest import make_listing
+
+
+def listings(source, destination):
+    """listObjects side effect returning one listing per bucket"""
+
+    def list_objects(bucket, **kwargs):
+        return source if bucket == "src" else destination
+
+    return list_objects
+
+
+class TestMergeJoin:
+    """Test listing_join.merge_join"""
+
+    def test_outer_join(self):
+        """Keys from both sides are paired in order"""
+        left = make_listing(["a", "b", "d"]).body.contents
+        right = make_listing(["b", "c", "d", "e"]).body.contents
+
+        joined = [(key, left is not None, right is not None) for key, left, right in merge_join(left, right)]
+
+        assert joined == [
+            ("a", True, False),
+            ("b", True, True),
+            ("c", False, True),
+            ("d", True, True),
+            ("e", False, True),
+        ]
+
+    def test_unsorted_input_rejected(self):
+        """A listing out of key order raises instead of producing a wrong join"""
+        left = make_listing(["b", "a"]).body.contents
+
+        with pytest.raises(ValueError, match="not sorted"):
+            list(merge_join(left, []))
+
+
+class TestCopyObjects:
+    """Test OBSManager.copy_objects"""
+
+    def test_skips_matching_and_copies_rest(self, manager):
+        """Only keys missing or different at the destination are copied"""
+        destination = make_listing(["p/changed.txt", "p/same.txt"])
+        destination.body.contents[0].etag = '"old"'
+        manager.client.listObjects.side_effect = listings(
+            make_listing(["p/changed.txt", "p/new.txt", "p/same.txt"]), destination
+        )
+        manager.client.copyObject.return_value = Mock(status=200)
+
+        assert manager.copy_objects("src", "p/", "dst", workers=2) == 3
+
+        copied = sorted(call.args for call in manager.client.copyObject.call_args_list)
+        assert copied == [("src", "p/changed.txt", "dst", "p/changed.txt"), ("src", "p/new.txt", "dst", "p/new.txt")]
+
+    def test_dest_prefix_maps_keys(self, manager):
+        """Destination keys replace the source prefix and are matched against it"""
+        manager.client.listObjects.side_effect = listings(make_listing(["p/a.txt", "p/b.txt"]), make_listing(["backup/a.txt"]))
+        manager.client.copyObject.return_value = Mock(status=200)
+
+        manager.copy_objects("src", "p/", "dst", dest_prefix="backup/")
+
+        manager.client.copyObject.assert_called_once_with("src", "p/b.txt", "dst", "backup/b.txt")
+
+    def test_overlapping_prefixes_rejected(self, manager):
+        """Copying a prefix into itself within one bucket is refused"""
+        with pytest.raises(ValueError, match="overlap"):
+            manager.copy_objects("src", "p/", "src", dest_prefix="p/copy/")
+
+    def test_large_object_multipart_copy(self, manager):
+        """Large objects are copied in ranged parts that record the source ETag"""
+        manager.config.config.update(multipart_copy_threshold=100, copy_part_size=400)
+        manager.client.listObjects.side_effect = listings(make_listing(["big key.bin"], size=1000), make_listing([]))
+        manager.client.getObjectMetadata.return_value = Mock(status=200, body=Mock(contentType="video/mp4"))
+        manager.client.initiateMultipartUpload.return_value = Mock(status=200, body=Mock(uploadId="u1"))
+        manager.client.copyPart.side_effect = lambda bucket, key, number, upload_id, source, copySourceRange: Mock(
+            status=200, body=Mock(etag=f"etag{number}")
+        )
+        manager.client.completeMultipartUpload.return_value = Mock(status=200)
+
+        assert manager.copy_objects("src", "", "dst", part_workers=2) == 1
+
+        initiate = manager.client.initiateMultipartUpload.call_args
+        assert initiate.kwargs == {"metadata": {"source-etag": "etag"}, "contentType": "video/mp4"}
+        ranges = sorted(
+            (call.args[2], call.args[4], call.kwargs["copySourceRange"]) for call in manager.client.copyPart.call_args_list
+        )
+        assert ranges == [
+            (1, "src/big key.bin", "0-399"),
+            (2, "src/big key.bin", "400-799"),
+            (3, "src/big key.bin", "800-999"),
+        ]
+        manager.client.copyObject.assert_not_called()
+        manager.client.abortMultipartUpload.assert_not_called()
+
+    def test_multipart_copy_source_not_encoded(self, manager):
+        """Keys with spaces, %, + or non-ASCII characters reach copyPart unencoded, as the SDK encodes them"""
+        key = "informes/año 100%+.bin"
+        manager.config.config.update(multipart_copy_threshold=100, copy_part_size=1000)
+        manager.client.listObjects.side_effect = listings(make_listing([key], size=1000), make_listing([]))
+        manager.client.getObjectMetadata.return_value = Mock(status=200, body=Mock(contentType=None))
+        manager.client.initiateMultipartUpload.return_value = Mock(status=200, body=Mock(uploadId="u1"))
+        manager.client.copyPart.return_value = Mock(status=200, body=Mock(etag="etag1"))
+        manager.client.completeMultipartUpload.return_value = Mock(status=200)
+
+        assert manager.copy_objects("src", "", "dst") == 1
+        assert manager.client.copyPart.call_args.args[4] == f"src/{key}"
+
+    def test_multipart_copy_recognised_by_metadata(self, manager):
+        """A multipart copy with a different ETag is up to date when its metadata holds the source ETag"""
+        manager.config.config.update(multipart_copy_threshold=100)
+        destination = make_listing(["big.bin"], size=1000)
+        destination.body.contents[0].etag = '"copy-etag-2"'
+        manager.client.listObjects.side_effect = listings(make_listing(["big.bin"], size=1000), destination)
+        manager.client.getObjectMetadata.return_value = Mock(status=200, header=[("source-etag", "etag")])
+
+        manager.copy_objects("src", "", "dst")
+
+        manager.client.getObjectMetadata.assert_called_once_with("dst", "big.bin")
+        manager.client.initiateMultipartUpload.assert_not_called()
+
+    def test_failed_part_aborts_copy(self, manager):
+        """A failed part copy aborts the multipart upload"""
+        manager.config.config.update(multipart_copy_threshold=100, copy_part_size=400)
+        manager.client.listObjects.side_effect = listings(make_listing(["big.bin"], size=1000), make_listing([]))
+        manager.client.getObjectMetadata.return_value = Mock(status=200, body=Mock(contentType=None))
+        manager.client.initiateMultipartUpload.return_value = Mock(status=200, body=Mock(uploadId="u1"))
+        manager.client.copyPart.return_value = Mock(status=500, errorCode="InternalError", errorMessage="boom")
+        manager.client.abortMultipartUpload.return_value = Mock(status=204)
+
+        manager.copy_objects("src", "", "dst")
+
+        manager.client.completeMultipartUpload.assert_not_called()
+        manager.client.abortMultipartUpload.assert_called_once_with("dst", "big.bin", "u1")
+
+
+class TestDiffObjects:
+    """Test OBSManager.diff_objects"""
+
+    def test_reports_added_removed_changed(self, manager, capsys):
+        """Each side's extra keys and differing keys are reported; identical keys are only counted"""
+        destination = make_listing(["p/changed", "p/extra", "p/same"])
+        destination.body.contents[0].size = 99
+        manager.client.listObjects.side_effect = listings(make_listing(["p/changed", "p/gone", "p/same"]), destination)
+
+        assert manager.diff_objects("src", "p/", "dst", output="jsonl") == 3
+
+        captured = capsys.readouterr()
+        records = [json.loads(line) for line in captured.out.splitlines()]
+        assert [(record["status"], record["key"]) for record in records] == [
+            ("changed", "p/changed"),
+            ("added", "p/extra"),
+            ("removed", "p/gone"),
+        ]
+        assert records[0]["dest_size"] == 99
+        assert "1 identical" in captured.err
+
+    def test_table_output(self, manager, capsys):
+        """Table output uses diff markers"""
+        manager.client.listObjects.side_effect = listings(make_listing(["a"]), make_listing(["b"]))
+
+        manager.diff_objects("src", "", "dst")
+
+        out = capsys.readouterr().out
+        assert "- a\n" in out
+        assert "+ b\n" in out
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for the daemon mode
+"""
+
+import http.client
+import io
+import json
+import os
+import socket
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from obs_daemon import OBSDaemon, _unix_connect, create_server, forward, status
+
+needs_unix_sockets = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+
+
+def run(daemon, argv, cwd=None):
+    """Run a call on the daemon, returning its exit code and output streams"""
+    events = []
+    code = daemon.run(argv, cwd or os.getcwd(), events.append)
+    stdout = "".join(event["stdout"] for event in events if "stdout" in event)
+    stderr = "".join(event["stderr"] for event in events if "stderr" in event)
+    return code, stdout, stderr
+
+
+@pytest.fixture
+def serving(tmp_path):
+    """Start a daemon with a mocked manager on a Unix socket, yielding the socket path and the manager"""
+    obs_manager = Mock()
+    # Short path: Unix socket paths are limited to about 100 characters
+    socket_path = os.path.join(str(tmp_path), "d.sock")
+    server = create_server(OBSDaemon(obs_manager), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield socket_path, obs_manager
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class TestOBSDaemon:
+    """Test OBSDaemon.run"""
+
+    def test_operation_uses_warm_manager(self):
+        """Calls run on the same manager and their output is captured"""
+        obs_manager = Mock()
+        obs_manager.list_objects.return_value = 3
+        daemon = OBSDaemon(obs_manager)
+
+        for _ in range(2):
+            code, stdout, _ = run(daemon, ["--operation", "list", "--bucket", "my-bucket", "--prefix", "logs/"])
+            assert code == 0
+            assert "Items processed: 3" in stdout
+
+        assert obs_manager.list_objects.call_count == 2
+        obs_manager.list_objects.assert_called_with("my-bucket", "logs/")
+        assert daemon.status()["requests"] == 2
+
+    def test_relative_paths_use_client_cwd(self, tmp_path):
+        """Relative paths resolve against the client's directory, and the daemon's is restored"""
+        obs_manager = Mock()
+        obs_manager.download_objects.return_value = 0
+        before = os.getcwd()
+
+        code, _, _ = run(
+            OBSDaemon(obs_manager), ["--operation", "download", "--bucket", "b", "--download-path", "out"], tmp_path
+        )
+
+        assert code == 0
+        assert (tmp_path / "out").is_dir()
+        assert os.getcwd() == before
+
+    def test_argument_errors_return_exit_codes(self):
+        """Validation and parse errors come back as output and exit codes"""
+        daemon = OBSDaemon(Mock())
+
+        code, stdout, _ = run(daemon, ["--operation", "list"])
+        assert code == 1
+        assert "--bucket is required" in stdout
+
+        code, _, stderr = run(daemon, ["--operation", "bogus"])
+        assert code == 2
+        assert "invalid choice" in stderr
+
+    def test_security_levels_refused(self):
+        """Per-session level passwords cannot be shared through the daemon"""
+        obs_manager = Mock()
+        code, _, stderr = run(OBSDaemon(obs_manager), ["--operation", "list", "--bucket", "b", "--enable-security-levels"])
+        assert code == 1
+        assert "not available through the daemon" in stderr
+        obs_manager.list_objects.assert_not_called()
+
+
+@needs_unix_sockets
+class TestServer:
+    """Test the daemon over its Unix socket"""
+
+    def test_forward_streams_output(self, serving):
+        """The thin client prints the daemon's output and returns its exit code"""
+        socket_path, obs_manager = serving
+        obs_manager.list_objects.return_value = 5
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        code = forward(["--operation", "list", "--bucket", "b"], socket_path=socket_path, stdout=stdout, stderr=stderr)
+
+        assert code == 0
+        assert "Items processed: 5" in stdout.getvalue()
+        assert status(socket_path=socket_path)["requests"] == 1
+
+    def test_invalid_request_rejected(self, serving):
+        """A request without an argument list gets a 400"""
+        socket_path, _ = serving
+        sock = _unix_connect(socket_path)
+        body = json.dumps({"argv": "--operation list"}).encode()
+        sock.sendall(b"POST /run HTTP/1.0\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+        response = b"".join(iter(lambda: sock.recv(4096), b""))
+        sock.close()
+        assert response.startswith(b"HTTP/1.0 400")
+
+    def test_socket_private_to_owner(self, serving):
+        """Only the owner can connect to the socket"""
+        socket_path, _ = serving
+        assert os.stat(socket_path).st_mode & 0o077 == 0
+
+    def test_refuses_second_daemon(self, serving):
+        """A live socket is not replaced"""
+        socket_path, _ = serving
+        with pytest.raises(RuntimeError, match="already listening"):
+            create_server(OBSDaemon(Mock()), socket_path=socket_path)
+
+    def test_stale_socket_replaced(self, tmp_path):
+        """A socket left by a daemon that died is removed"""
+        socket_path = os.path.join(str(tmp_path), "d.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        server = create_server(OBSDaemon(Mock()), socket_path=socket_path)
+        server.server_close()
+
+    def test_daemon_not_running(self, tmp_path):
+        """The client reports a missing daemon instead of raising"""
+        stderr = io.StringIO()
+        code = forward(["--operation", "list"], socket_path=str(tmp_path / "missing.sock"), stderr=stderr)
+        assert code == 1
+        assert "could not reach the daemon" in stderr.getvalue()
+
+
+@pytest.fixture
+def serving_http(tmp_path):
+    """Start a daemon with a mocked manager on a free localhost port, yielding the port, token file and manager"""
+    obs_manager = Mock()
+    token_file = str(tmp_path / "token")
+    server = create_server(OBSDaemon(obs_manager), port=0, token_file=token_file)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1], token_file, obs_manager
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class TestHTTPServer:
+    """Test the daemon on a localhost port"""
+
+    def test_forward_over_tcp(self, serving_http):
+        """The same protocol works over localhost HTTP with the daemon's token"""
+        port, token_file, obs_manager = serving_http
+        obs_manager.search_objects.return_value = 2
+        stdout = io.StringIO()
+
+        code = forward(
+            ["--operation", "search", "--search-text", "report", "--bucket", "b"],
+            port=port,
+            stdout=stdout,
+            token_file=token_file,
+        )
+
+        assert code == 0
+        assert "Items processed: 2" in stdout.getvalue()
+        assert status(port=port, token_file=token_file)["requests"] == 1
+
+    def test_token_file_private_to_owner(self, serving_http):
+        """Only the owner can read the token"""
+        _, token_file, _ = serving_http
+        assert os.stat(token_file).st_mode & 0o077 == 0
+
+    @pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}])
+    @pytest.mark.parametrize("method,path", [("GET", "/status"), ("POST", "/run")])
+    def test_requests_without_token_rejected(self, serving_http, headers, method, path):
+        """Missing or wrong tokens get a 401 and nothing runs"""
+        port, _, obs_manager = serving_http
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        body = json.dumps({"argv": ["--operation", "list", "--bucket", "b"], "cwd": os.getcwd()}) if method == "POST" else None
+        connection.request(method, path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+
+        assert response.status == 401
+        obs_manager.list_objects.assert_not_called()
+
+    def test_missing_token_file(self, tmp_path):
+        """The client reports a missing token file instead of raising"""
+        stderr = io.StringIO()
+        code = forward(["--operation", "list"], port=1, stderr=stderr, token_file=str(tmp_path / "missing"))
+        assert code == 1
+        assert "could not read the daemon token" in stderr.getvalue()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming batch deletes
+"""
+
+from unittest.mock import Mock
+
+from concurrency import batched
+from tests.conftest import make_listing
+
+
+def delete_response(failed_keys=()):
+    """Build a quiet-mode deleteObjects response reporting ``failed_keys``"""
+    errors = [Mock(key=key, code="AccessDenied", message="Access Denied") for key in failed_keys]
+    return Mock(status=200, body=Mock(error=errors))
+
+
+class TestBatched:
+    """Test batching of streamed keys"""
+
+    def test_batches_fill_in_order(self):
+        """Items are grouped in arrival order with a short final batch"""
+        assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_consumes_lazily(self):
+        """A batch is produced before the rest of the input is read"""
+        consumed = []
+
+        def items():
+            for i in range(10):
+                consumed.append(i)
+                yield i
+
+        first = next(batched(items(), 3))
+        assert first == [0, 1, 2]
+        assert len(consumed) == 3
+
+
+class TestStreamingDelete:
+    """Test SecureOBSManager.delete_objects"""
+
+    def test_deletes_in_batches_of_1000(self, secure_manager):
+        """Keys are sent in 1000-key batches"""
+        keys = [f"k{i:05d}" for i in range(2500)]
+        listing = make_listing(keys)
+        listing.body.isTruncated = False
+        secure_manager.obs_client.listObjects.return_value = listing
+        secure_manager.obs_client.deleteObjects.return_value = delete_response()
+
+        count = secure_manager.delete_objects("bucket", "", confirm=True, workers=3)
+
+        assert count == 2500
+        batch_sizes = sorted(
+            len(call.kwargs["deleteObjectsRequest"]["objects"])
+            for call in secure_manager.obs_client.deleteObjects.call_args_list
+        )
+        assert batch_sizes == [500, 1000, 1000]
+
+    def test_per_key_errors_reported(self, secure_manager):
+        """Keys reported in the batch response are not counted as deleted"""
+        listing = make_listing(["a", "b", "c"])
+        listing.body.isTruncated = False
+        secure_manager.obs_client.listObjects.return_value = listing
+        secure_manager.obs_client.deleteObjects.return_value = delete_response(["b"])
+
+        assert secure_manager.delete_objects("bucket", "", confirm=True) == 2
+
+    def test_nothing_to_delete(self, secure_manager):
+        """An empty listing sends no requests"""
+        listing = make_listing([])
+        listing.body.isTruncated = False
+        secure_manager.obs_client.listObjects.return_value = listing
+
+        assert secure_manager.delete_objects("bucket", "", confirm=True) == 0
+        secure_manager.obs_client.deleteObjects.assert_not_called()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar listing exports
+"""
+
+import csv
+import gzip
+from unittest.mock import Mock, patch
+
+import pytest
+
+import export
+from tests.conftest import make_listing
+
+
+def paged_listing(pages):
+    """listObjects side effect serving ``pages`` (lists of keys) one request at a time"""
+    responses = [make_listing(keys) for keys in pages]
+    for number, response in enumerate(responses[:-1]):
+        response.body.is_truncated = True
+        response.body.next_marker = pages[number][-1]
+    return responses
+
+
+class TestExportObjects:
+    """Test OBSManager.export_objects"""
+
+    def test_csv_gz(self, manager, tmp_path):
+        """Every page is appended to a gzipped CSV with a header row"""
+        manager.client.listObjects.side_effect = paged_listing([["a", "b"], ["c d"]])
+        path = str(tmp_path / "listing.csv.gz")
+
+        assert manager.export_objects("bucket", "", path) == 3
+
+        with gzip.open(path, "rt", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == export.EXPORT_COLUMNS
+        assert [row[0] for row in rows[1:]] == ["a", "b", "c d"]
+        assert rows[1][1:] == ["10", "2025/01/01 00:00:00", '"etag"', "STANDARD", "owner"]
+
+    def test_parquet_one_row_group_per_page(self, manager, tmp_path):
+        """Parquet exports write a row group per page with a timestamp column"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        manager.client.listObjects.side_effect = paged_listing([["a", "b"], ["c"]])
+        path = str(tmp_path / "listing.parquet")
+
+        manager.export_objects("bucket", "", path)
+
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.metadata.num_row_groups == 2
+        table = parquet_file.read()
+        assert table.column("key").to_pylist() == ["a", "b", "c"]
+        assert str(table.schema.field("last_modified").type) == "timestamp[ms]"
+
+    def test_arrow(self, manager, tmp_path):
+        """Arrow exports are readable IPC files"""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+
+        manager.client.listObjects.side_effect = paged_listing([["a"], ["b"]])
+        path = str(tmp_path / "listing.arrow")
+
+        manager.export_objects("bucket", "", path)
+
+        reader = pa.ipc.open_file(path)
+        assert reader.num_record_batches == 2
+        assert reader.read_all().column("size").to_pylist() == [10, 10]
+
+    def test_columnar_without_pyarrow(self, tmp_path):
+        """A clear error explains that pyarrow is needed"""
+        with patch.object(export, "pa", None):
+            with pytest.raises(ImportError, match="pip install pyarrow"):
+                export.ListingExporter(str(tmp_path / "listing.parquet"))
+
+    def test_unknown_format(self, tmp_path):
+        """File names without a known extension need an explicit format"""
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            export.ListingExporter(str(tmp_path / "listing.txt"))
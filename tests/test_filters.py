@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for listing filters
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from filters import ObjectFilter, parse_date, parse_size
+from tests.conftest import make_listing
+from tests.test_delete import delete_response
+from tests.test_listing import fake_bucket
+
+
+def entry(key, size=10, storage_class="STANDARD", last_modified="2025/01/01 00:00:00"):
+    """Listing entry with the given attributes"""
+    content = make_listing([key], size=size, storage_class=storage_class).body.contents[0]
+    content.lastModified = last_modified
+    return content
+
+
+class TestParsing:
+    """Test size and date arguments"""
+
+    def test_parse_size(self):
+        """Plain bytes and binary suffixes, with or without B/iB"""
+        assert parse_size("1024") == 1024
+        assert parse_size("10K") == 10 * 1024
+        assert parse_size("5MB") == 5 * 1024**2
+        assert parse_size("2GiB") == 2 * 1024**3
+        assert parse_size("1.5k") == 1536
+        with pytest.raises(ValueError, match="Invalid size"):
+            parse_size("10X")
+
+    def test_parse_date(self):
+        """Dates with and without a time"""
+        assert parse_date("2025-01-31") == time.mktime((2025, 1, 31, 0, 0, 0, 0, 0, -1))
+        assert parse_date("2025-01-31T12:30:00") - parse_date("2025-01-31") == 12.5 * 3600
+        with pytest.raises(ValueError, match="Invalid date"):
+            parse_date("31/01/2025")
+
+
+class TestObjectFilter:
+    """Test ObjectFilter criteria"""
+
+    def test_empty_filter_is_false(self):
+        """A filter without criteria is falsy so callers can skip it"""
+        assert not ObjectFilter()
+        assert ObjectFilter(min_size=0)
+
+    def test_include_and_exclude_globs(self):
+        """Keys must match an include glob and no exclude glob; * crosses /"""
+        key_filter = ObjectFilter(include=["logs/*.log", "*.gz"], exclude=["logs/keep/*"])
+        keys = ["logs/a.log", "logs/2025/b.log", "logs/keep/c.log", "data/d.gz", "data/e.txt"]
+        assert [key for key in keys if key_filter.matches(entry(key))] == ["logs/a.log", "logs/2025/b.log", "data/d.gz"]
+
+    def test_regex_searches_key(self):
+        """The regular expression is searched anywhere in the key"""
+        key_filter = ObjectFilter(regex=r"2024-0[1-6]")
+        assert key_filter.matches(entry("reports/2024-03.csv"))
+        assert not key_filter.matches(entry("reports/2024-09.csv"))
+
+    def test_size_range_is_inclusive(self):
+        """Both bounds are inclusive"""
+        key_filter = ObjectFilter(min_size=10, max_size=20)
+        assert [key_filter.matches(entry("k", size=size)) for size in (9, 10, 20, 21)] == [False, True, True, False]
+
+    def test_modified_range(self):
+        """modified_after is inclusive, modified_before exclusive; unknown dates never match"""
+        key_filter = ObjectFilter(modified_after=parse_date("2025-01-01"), modified_before=parse_date("2025-02-01"))
+        assert key_filter.matches(entry("k", last_modified="2025/01/01 00:00:00"))
+        assert key_filter.matches(entry("k", last_modified="2025/01/31 23:59:59"))
+        assert not key_filter.matches(entry("k", last_modified="2025/02/01 00:00:00"))
+        assert not key_filter.matches(entry("k", last_modified="2024/12/31 23:59:59"))
+        assert not key_filter.matches(entry("k", last_modified=None))
+
+    def test_storage_class(self):
+        """Objects without a storage class count as STANDARD"""
+        key_filter = ObjectFilter(storage_classes=["standard", "WARM"])
+        assert key_filter.matches(entry("a", storage_class=None))
+        assert key_filter.matches(entry("b", storage_class="WARM"))
+        assert not key_filter.matches(entry("c", storage_class="COLD"))
+
+
+class TestFilteredOperations:
+    """Test filters applied by the listing generators"""
+
+    def test_paginated_listing_filtered(self, manager):
+        """Filtered entries are dropped page by page"""
+        manager.client.listObjects.return_value = make_listing(["a.log", "b.txt", "c.log"])
+        key_filter = ObjectFilter(include=["*.log"])
+
+        keys = [content.key for content in manager._paginated_list_objects("bucket", key_filter=key_filter)]
+        assert keys == ["a.log", "c.log"]
+
+    def test_parallel_listing_filtered_after_merge(self, manager):
+        """Partitions still stop at their range end when most keys are filtered out"""
+        keys = [f"{letter}{i:03d}" for letter in "abcdef" for i in range(50)]
+        manager.client.listObjects.side_effect = fake_bucket(keys)
+        key_filter = ObjectFilter(regex=r"0[0-4]$")
+
+        listed = [
+            content.key
+            for content in manager._parallel_list_objects("bucket", workers=4, sort=True, partitions=3, key_filter=key_filter)
+        ]
+        assert listed == [key for key in sorted(keys) if key_filter.regex.search(key)]
+
+    def test_change_storage_class_skips_filtered(self, manager):
+        """No request is sent for objects the filter rejects"""
+        manager.client.listObjects.return_value = make_listing(["big", "small"])
+        manager.client.listObjects.return_value.body.contents[0].size = 1000
+        manager.client.setObjectMetadata.return_value = Mock(status=200)
+
+        count = manager.change_storage_class("bucket", "", "COLD", key_filter=ObjectFilter(min_size=100))
+
+        assert count == 1
+        manager.client.setObjectMetadata.assert_called_once()
+        assert manager.client.setObjectMetadata.call_args.args[1] == "big"
+
+    def test_plan_counts_only_matching(self, manager, capsys):
+        """Plans only count objects that pass the filter"""
+        manager.client.listObjects.return_value = make_listing(["a.log", "b.txt", "c.log"])
+        key_filter = ObjectFilter(exclude=["*.txt"])
+
+        assert manager.change_storage_class("bucket", "", "COLD", plan_only=True, key_filter=key_filter) == 2
+        assert "b.txt" not in capsys.readouterr().out
+        manager.client.setObjectMetadata.assert_not_called()
+
+    def test_secure_delete_filtered(self, secure_manager):
+        """Only matching keys are batched for deletion"""
+        listing = make_listing(["keep/a", "tmp/b", "tmp/c"])
+        listing.body.isTruncated = False
+        secure_manager.obs_client.listObjects.return_value = listing
+        secure_manager.obs_client.deleteObjects.return_value = delete_response()
+
+        count = secure_manager.delete_objects("bucket", "", confirm=True, key_filter=ObjectFilter(include=["tmp/*"]))
+
+        assert count == 2
+        request = secure_manager.obs_client.deleteObjects.call_args.kwargs["deleteObjectsRequest"]
+        assert [item.key for item in request.objects] == ["tmp/b", "tmp/c"]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the usage report
+"""
+
+import json
+import time
+
+from inventory import InventoryReport
+from tests.conftest import make_listing
+
+
+def entry(key, size, storage_class=None, days_old=0.5, now=None):
+    """Listing entry modified ``days_old`` days before ``now``"""
+    content = make_listing([key], size=size, storage_class=storage_class).body.contents[0]
+    content.lastModified = time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(now - days_old * 86400))
+    return content
+
+
+class TestInventoryReport:
+    """Test InventoryReport aggregation"""
+
+    def test_totals_classes_and_ages(self):
+        """One pass yields totals, storage classes and the age histogram"""
+        now = time.time()
+        report = InventoryReport(now=now)
+        report.add(entry("a", 100, None, 0.5, now))
+        report.add(entry("b", 200, "COLD", 40, now))
+        report.add(entry("c", 300, "COLD", 400, now))
+
+        data = report.to_dict()
+        assert (data["objects"], data["bytes"]) == (3, 600)
+        assert data["storage_classes"] == {"COLD": {"objects": 2, "bytes": 500}, "STANDARD": {"objects": 1, "bytes": 100}}
+        assert data["ages"] == {
+            "< 1 day": {"objects": 1, "bytes": 100},
+            "30-90 days": {"objects": 1, "bytes": 200},
+            "> 1 year": {"objects": 1, "bytes": 300},
+        }
+
+    def test_prefix_depth(self):
+        """Keys are grouped by at most ``depth`` directories below the prefix, spaces included"""
+        report = InventoryReport("logs/", depth=2)
+
+        assert report.prefix_of("logs/2025/01/app log.txt") == "logs/2025/01/"
+        assert report.prefix_of("logs/2025/summary.txt") == "logs/2025/"
+        assert report.prefix_of("logs/top level.txt") == "logs/"
+
+
+class TestReportObjects:
+    """Test OBSManager.report_objects"""
+
+    def test_json_report(self, manager, capsys):
+        """jsonl output prints the report as one JSON document"""
+        manager.client.listObjects.return_value = make_listing(["p/a/1", "p/a/2", "p/b/1"], size=10)
+
+        assert manager.report_objects("bucket", "p/", output="jsonl") == 3
+
+        data = json.loads(capsys.readouterr().out)
+        assert data["bucket"] == "bucket"
+        assert data["prefixes"] == {"p/a/": {"objects": 2, "bytes": 20}, "p/b/": {"objects": 1, "bytes": 10}}
+
+    def test_csv_prefix_rows(self, manager, capsys):
+        """csv output prints the per-prefix totals"""
+        manager.client.listObjects.return_value = make_listing(["x/1", "y/1"], size=5)
+
+        manager.report_objects("bucket", output="csv")
+
+        assert capsys.readouterr().out.splitlines() == ["prefix,objects,bytes", "x/,1,5", "y/,1,5"]
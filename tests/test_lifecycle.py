@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for age-based lifecycle policies
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from lifecycle import LifecyclePolicy
+from tests.conftest import make_listing
+
+RULES = [
+    {"prefix": "logs/", "days": 30, "storage_class": "WARM"},
+    {"prefix": "logs/", "days": 90, "storage_class": "COLD"},
+]
+
+
+def listing(entries, now):
+    """Listing of (key, days old, storage class) entries"""
+    resp = make_listing([key for key, _, _ in entries], size=100)
+    for content, (_, days_old, storage_class) in zip(resp.body.contents, entries):
+        content.lastModified = time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(now - days_old * 86400))
+        content.storageClass = storage_class
+    return resp
+
+
+class TestLifecyclePolicy:
+    """Test LifecyclePolicy decisions"""
+
+    def test_coldest_applicable_rule_wins(self):
+        """Objects move to the coldest class whose age they reached, never to a warmer one"""
+        now = time.time()
+        policy = LifecyclePolicy.from_config(RULES, now=now)
+        contents = listing(
+            [
+                ("logs/a", 10, None),
+                ("logs/b", 40, None),
+                ("logs/c", 100, "WARM"),
+                ("logs/d", 40, "COLD"),
+                ("other", 400, None),
+            ],
+            now,
+        ).body.contents
+
+        assert [policy.target(content) for content in contents] == [None, "WARM", "COLD", None, None]
+        assert policy.listing_prefix() == "logs/"
+
+    def test_invalid_rules(self):
+        """Rules need days and a cold storage class"""
+        with pytest.raises(ValueError, match="storage class"):
+            LifecyclePolicy.from_config([{"prefix": "", "days": 1, "storage_class": "STANDARD"}])
+        with pytest.raises(ValueError, match="required"):
+            LifecyclePolicy.from_config([{"prefix": ""}])
+        with pytest.raises(ValueError, match="No lifecycle rules"):
+            LifecyclePolicy.from_config([])
+
+
+class TestApplyLifecycle:
+    """Test OBSManager.apply_lifecycle"""
+
+    def test_plan_reports_bytes_per_class(self, manager, capsys):
+        """A dry run counts objects and bytes per target class without requests"""
+        now = time.time()
+        manager.config.config["lifecycle_rules"] = RULES
+        manager.client.listObjects.return_value = listing(
+            [("logs/a", 40, None), ("logs/b", 100, None), ("logs/c", 200, None)], now
+        )
+
+        assert manager.apply_lifecycle("bucket", plan_only=True) == 3
+
+        out = capsys.readouterr().out
+        assert "To COLD: 2 objects, 200 B" in out
+        assert "To WARM: 1 objects, 100 B" in out
+        assert manager.client.listObjects.call_args.kwargs["prefix"] == "logs/"
+        manager.client.setObjectMetadata.assert_not_called()
+
+    def test_applies_transitions(self, manager):
+        """One pass sends a request only for objects that must move"""
+        now = time.time()
+        manager.config.config["lifecycle_rules"] = RULES
+        manager.client.listObjects.return_value = listing([("logs/a", 5, None), ("logs/b", 100, None)], now)
+        manager.client.setObjectMetadata.return_value = Mock(status=200)
+
+        assert manager.apply_lifecycle("bucket", workers=2) == 2
+
+        manager.client.setObjectMetadata.assert_called_once()
+        call = manager.client.setObjectMetadata.call_args
+        assert call.args[1] == "logs/b"
+        assert call.kwargs["headers"].storageClass == "COLD"
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for partitioned parallel listing
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from concurrency import prefetch_ordered
+from tests.conftest import make_listing
+
+
+def fake_bucket(keys):
+    """listObjects side effect serving ``keys`` with prefix, marker and delimiter support"""
+    keys = sorted(keys)
+
+    def list_objects(bucket, prefix="", marker=None, max_keys=1000, delimiter=None):
+        matching = [key for key in keys if key.startswith(prefix) and (marker is None or key > marker)]
+        if delimiter:
+            common = sorted(
+                {
+                    prefix + key[len(prefix) :].split(delimiter)[0] + delimiter
+                    for key in matching
+                    if delimiter in key[len(prefix) :]
+                }
+            )
+            direct = [key for key in matching if delimiter not in key[len(prefix) :]]
+            resp = make_listing(direct[:max_keys])
+            resp.body.commonPrefixs = [Mock(prefix=value) for value in common]
+            resp.body.is_truncated = len(direct) + len(common) > max_keys
+            return resp
+        page = matching[:max_keys]
+        resp = make_listing(page)
+        resp.body.is_truncated = len(matching) > max_keys
+        resp.body.next_marker = page[-1] if page else None
+        return resp
+
+    return list_objects
+
+
+class TestPrefetchOrdered:
+    """Test ordered concurrent consumption"""
+
+    def test_yields_sources_in_order(self):
+        """Items come out source by source regardless of finishing order"""
+        sources = [lambda i=i: range(i * 100, i * 100 + 100) for i in range(6)]
+
+        assert list(prefetch_ordered(sources, workers=3, queue_size=8)) == list(range(600))
+
+    def test_source_error_raised(self):
+        """A failing source raises when the consumer reaches it"""
+
+        def failing():
+            raise RuntimeError("denied")
+
+        with pytest.raises(RuntimeError):
+            list(prefetch_ordered([lambda: [1], failing], workers=2))
+        assert not [t for t in threading.enumerate() if t.name.startswith("obs-source")]
+
+
+class TestParallelListing:
+    """Test OBSManager._parallel_list_objects"""
+
+    def test_prefix_partitions_sorted(self, manager):
+        """Top-level prefixes are listed concurrently and merged in key order"""
+        keys = [f"{top}/{i:03d}" for top in ("a", "b", "c") for i in range(30)] + ["a.txt", "z.txt"]
+        manager.config.config["max_keys"] = 7
+        manager.client.listObjects.side_effect = fake_bucket(keys)
+
+        listed = [content.key for content in manager._parallel_list_objects("bucket", workers=3, sort=True)]
+
+        assert listed == sorted(keys)
+
+    def test_flat_key_space_split_by_ranges(self, manager):
+        """A flat prefix is split into marker ranges without gaps or duplicates"""
+        keys = [f"logs/{c}{i}" for c in "0Aaz_" for i in range(20)] + ["logs/3", "logs/~"]
+        manager.config.config["max_keys"] = 10
+        manager.client.listObjects.side_effect = fake_bucket(keys)
+
+        unsorted = [content.key for content in manager._parallel_list_objects("bucket", "logs/", workers=4)]
+        ordered = [content.key for content in manager._parallel_list_objects("bucket", "logs/", workers=4, sort=True)]
+
+        assert sorted(unsorted) == sorted(keys)
+        assert ordered == sorted(keys)
+
+    def test_list_objects_with_workers(self, manager):
+        """list_objects counts every object when listing concurrently"""
+        manager.client.listObjects.side_effect = fake_bucket([f"{top}/k" for top in "abcd"])
+
+        assert manager.list_objects("bucket", workers=2) == 4
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the local object index
+"""
+
+from unittest.mock import Mock
+
+from object_index import ObjectIndex
+from tests.conftest import make_listing
+
+
+class TestObjectIndex:
+    """Test ObjectIndex"""
+
+    def test_search_is_case_insensitive_substring(self, tmp_path):
+        """Keys containing the text match regardless of case"""
+        index = ObjectIndex(str(tmp_path / "index.sqlite3"))
+        index.refresh("bucket", "", make_listing(["logs/Report-2025.csv", "logs/other.txt"]).body.contents)
+
+        assert [row["key"] for row in index.search("report")] == ["logs/Report-2025.csv"]
+        assert [row["key"] for row in index.search("tx")] == ["logs/other.txt"]
+        index.close()
+
+    def test_full_refresh_drops_deleted_objects(self, tmp_path):
+        """Objects missing from a full listing are removed from the prefix only"""
+        index = ObjectIndex(str(tmp_path / "index.sqlite3"))
+        index.refresh("bucket", "", make_listing(["a/1", "a/2", "b/1"]).body.contents)
+        index.refresh("bucket", "a/", make_listing(["a/1"]).body.contents)
+
+        assert sorted(row["key"] for row in index.search("/1")) == ["a/1", "b/1"]
+        assert index.count("bucket") == 2
+        index.close()
+
+    def test_incremental_refresh_keeps_last_key(self, tmp_path):
+        """Incremental refreshes add rows and advance the last indexed key"""
+        index = ObjectIndex(str(tmp_path / "index.sqlite3"))
+        index.refresh("bucket", "", make_listing(["a", "b"]).body.contents)
+        index.refresh("bucket", "", make_listing(["c"]).body.contents, full=False)
+
+        assert index.last_key("bucket") == "c"
+        assert index.count() == 3
+        index.close()
+
+    def test_incremental_refresh_is_append_only(self, tmp_path):
+        """Deleted objects stay in the index until the next full refresh"""
+        index = ObjectIndex(str(tmp_path / "index.sqlite3"))
+        index.refresh("bucket", "", make_listing(["a", "b"]).body.contents)
+        index.refresh("bucket", "", make_listing(["c"]).body.contents, full=False)
+        assert index.count() == 3
+
+        index.refresh("bucket", "", make_listing(["b", "c"]).body.contents)
+        assert index.count() == 2
+        index.close()
+
+
+class TestIndexedSearch:
+    """Test OBSManager.build_index and indexed search"""
+
+    def test_search_uses_index_without_listing(self, manager, tmp_path):
+        """An indexed search does not list the bucket again"""
+        index_path = str(tmp_path / "index.sqlite3")
+        manager.client.listObjects.return_value = make_listing(["backup/db.sql", "img/logo.png"])
+
+        assert manager.build_index("bucket", index_path=index_path) == 2
+
+        manager.client.listObjects.reset_mock()
+        assert manager.search_objects("BACKUP", "bucket", use_index=True, index_path=index_path) == 1
+        manager.client.listObjects.assert_not_called()
+
+    def test_refresh_index_lists_after_last_key(self, manager, tmp_path):
+        """Refreshing before a search only lists keys after the last indexed one"""
+        index_path = str(tmp_path / "index.sqlite3")
+        manager.client.listObjects.return_value = make_listing(["a.log", "b.log"])
+        manager.build_index("bucket", index_path=index_path)
+
+        manager.client.listObjects.return_value = make_listing(["c.log"])
+        count = manager.search_objects("log", "bucket", use_index=True, refresh_index=True, index_path=index_path)
+
+        assert count == 3
+        assert manager.client.listObjects.call_args.kwargs["marker"] == "b.log"
+
+    def test_index_all_buckets(self, manager, tmp_path):
+        """Without a bucket every bucket is indexed"""
+        index_path = str(tmp_path / "index.sqlite3")
+        buckets = [Mock(), Mock()]
+        buckets[0].name, buckets[1].name = "one", "two"
+        manager.client.listBuckets.return_value = Mock(status=200, body=Mock(buckets=buckets))
+        manager.client.listObjects.return_value = make_listing(["k"])
+
+        assert manager.build_index(index_path=index_path) == 2
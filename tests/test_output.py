@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for structured output
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from output import LIST_FIELDS, ObjectWriter
+from tests.conftest import make_listing
+
+
+def records(count):
+    return [
+        {"key": f"k{i}", "last_modified": "2025/01/01 00:00:00", "size": i, "owner": "o", "storage_class": "STANDARD"}
+        for i in range(count)
+    ]
+
+
+class TestObjectWriter:
+    """Test ObjectWriter formats"""
+
+    def test_jsonl(self):
+        """Each record is one JSON object per line"""
+        stream = io.StringIO()
+        with ObjectWriter(LIST_FIELDS, "jsonl", stream=stream) as writer:
+            for record in records(3):
+                writer.write(record)
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[1])["size"] == 1
+
+    @pytest.mark.parametrize("output, delimiter", [("csv", ","), ("tsv", "\t")])
+    def test_delimited_with_header(self, output, delimiter):
+        """Delimited output starts with a header row"""
+        stream = io.StringIO()
+        with ObjectWriter(LIST_FIELDS, output, stream=stream) as writer:
+            for record in records(2):
+                writer.write(record)
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue()), delimiter=delimiter))
+        assert rows[0] == [name for name, _ in LIST_FIELDS]
+        assert rows[2][0] == "k1"
+
+    def test_buffers_until_flush(self):
+        """Records are written to the stream in chunks, not per record"""
+        stream = io.StringIO()
+        writer = ObjectWriter(LIST_FIELDS, "jsonl", stream=stream)
+        writer.write(records(1)[0])
+
+        assert stream.getvalue() == ""
+        writer.close()
+        assert stream.getvalue()
+
+    def test_quiet_only_counts(self):
+        """Quiet mode writes nothing"""
+        stream = io.StringIO()
+        with ObjectWriter(LIST_FIELDS, "csv", quiet=True, stream=stream) as writer:
+            for record in records(5):
+                writer.write(record)
+
+        assert writer.count == 5
+        assert stream.getvalue() == ""
+
+    def test_unknown_format(self):
+        """Unsupported formats are rejected"""
+        with pytest.raises(ValueError):
+            ObjectWriter(LIST_FIELDS, "xml")
+
+
+class TestManagerOutput:
+    """Test list and search output through the managers"""
+
+    def test_list_objects_jsonl(self, manager, capsys):
+        """list_objects writes JSON lines"""
+        manager.client.listObjects.return_value = make_listing(["a", "b"])
+
+        assert manager.list_objects("bucket", output="jsonl") == 2
+        keys = [json.loads(line)["key"] for line in capsys.readouterr().out.splitlines()]
+        assert keys == ["a", "b"]
+
+    def test_search_quiet(self, manager, capsys):
+        """Quiet search prints nothing per match"""
+        manager.client.listObjects.return_value = make_listing(["report.csv", "image.png"])
+
+        assert manager.search_objects("report", "bucket", quiet=True) == 1
+        assert capsys.readouterr().out == ""
+
+    def test_secure_search_csv(self, secure_manager, capsys):
+        """SecureOBSManager writes delimited search results without the table summary"""
+        listing = make_listing(["report.csv"])
+        listing.body.isTruncated = False
+        secure_manager.obs_client.listObjects.return_value = listing
+
+        assert secure_manager.search_objects("report", "bucket", output="csv") == 1
+        rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+        assert rows[1][:2] == ["bucket", "report.csv"]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the restore and transition planner
+"""
+
+from unittest.mock import Mock
+
+from planner import PENDING, SKIP, TODO, RequestPlanner
+from tests.conftest import make_listing
+
+
+def restore_metadata(states):
+    """getObjectMetadata side effect returning the restore header for each key"""
+    headers = {"ongoing": 'ongoing-request="true"', "restored": 'ongoing-request="false"', None: None}
+
+    def get_metadata(bucket, key):
+        return Mock(status=200, body=Mock(restore=headers[states.get(key)]))
+
+    return get_metadata
+
+
+class TestRequestPlanner:
+    """Test RequestPlanner decisions"""
+
+    def test_transition(self):
+        """Objects already in the target class are skipped; missing class means STANDARD"""
+        planner = RequestPlanner()
+
+        assert planner.plan_transition(Mock(storageClass="COLD"), "COLD") == SKIP
+        assert planner.plan_transition(Mock(storageClass=None), "STANDARD") == SKIP
+        assert planner.plan_transition(Mock(storageClass="WARM"), "COLD") == TODO
+        assert planner.summary() == {"todo": 1, "pending": 0, "skipped": 2}
+
+    def test_restore(self):
+        """Only archived objects without a restore need a request"""
+        states = {"a": None, "b": "ongoing", "c": "restored"}
+        planner = RequestPlanner(lambda key: states[key])
+
+        decisions = [planner.plan_restore(Mock(key=key, storageClass="COLD")) for key in "abc"]
+        decisions.append(planner.plan_restore(Mock(key="d", storageClass="STANDARD")))
+
+        assert decisions == [TODO, PENDING, SKIP, SKIP]
+        assert "already restored: 1" in planner.format("Plan")
+        assert "not archived: 1" in planner.format("Plan")
+
+
+class TestManagerPlanning:
+    """Test planning through the managers"""
+
+    def test_restore_skips_redundant_requests(self, manager):
+        """OBSManager only restores archived objects without a restore"""
+        listing = make_listing(["new", "ongoing", "done"], storage_class="COLD")
+        listing.body.contents += make_listing(["hot"]).body.contents
+        manager.client.listObjects.return_value = listing
+        manager.client.getObjectMetadata.side_effect = restore_metadata({"ongoing": "ongoing", "done": "restored"})
+        manager.client.restoreObject.return_value = Mock(status=202)
+
+        assert manager.restore_objects("bucket") == 4
+        manager.client.restoreObject.assert_called_once_with("bucket", "new", 30, "Expedited")
+
+    def test_transition_skips_objects_in_target_class(self, manager):
+        """OBSManager does not rewrite objects already in the target class"""
+        listing = make_listing(["cold"], storage_class="COLD")
+        listing.body.contents += make_listing(["hot"]).body.contents
+        manager.client.listObjects.return_value = listing
+        manager.client.setObjectMetadata.return_value = Mock(status=200)
+
+        manager.change_storage_class("bucket", "", "COLD")
+
+        assert [call.args[1] for call in manager.client.setObjectMetadata.call_args_list] == ["hot"]
+
+    def test_plan_sends_no_requests(self, manager, capsys):
+        """plan_only prints the counts without restoring anything"""
+        manager.client.listObjects.return_value = make_listing(["a", "b"], storage_class="COLD")
+        manager.client.getObjectMetadata.side_effect = restore_metadata({"b": "ongoing"})
+
+        assert manager.restore_objects("bucket", plan_only=True) == 1
+        manager.client.restoreObject.assert_not_called()
+        out = capsys.readouterr().out
+        assert "To do:   1" in out
+        assert "Pending: 1" in out
+
+    def test_secure_restore_skips_ongoing(self, secure_manager):
+        """SecureOBSManager skips restores already in progress"""
+        listing = make_listing(["a", "b"], storage_class="COLD")
+        listing.body.isTruncated = False
+        secure_manager.obs_client.listObjects.return_value = listing
+        secure_manager.obs_client.getObjectMetadata.side_effect = restore_metadata({"b": "ongoing"})
+        secure_manager.obs_client.restoreObject.return_value = Mock(status=202)
+
+        assert secure_manager.restore_objects("bucket") == 1
+        assert secure_manager.obs_client.restoreObject.call_count == 1
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the restore-then-download pipeline
+"""
+
+from unittest.mock import Mock
+
+from obs_metadata import RESTORE_COMPLETED, RESTORE_ONGOING, restore_status
+from tests.conftest import make_listing
+
+
+class TestRestoreStatus:
+    """Test parsing of the x-obs-restore value"""
+
+    def test_states(self):
+        """Ongoing, completed and missing restores are told apart"""
+        assert restore_status('ongoing-request="true"') == RESTORE_ONGOING
+        assert restore_status('ongoing-request="false", expiry-date="Wed, 7 Nov 2025 00:00:00 GMT"') == RESTORE_COMPLETED
+        assert restore_status(None) is None
+
+
+class TestRestoreDownload:
+    """Test OBSManager.restore_download_objects"""
+
+    def test_downloads_as_restores_complete(self, manager, tmp_path):
+        """Readable objects download at once and archived ones after their restore completes"""
+        listing = make_listing(["cold/a", "cold/b"], storage_class="COLD")
+        listing.body.contents += make_listing(["warm/c"], storage_class="WARM").body.contents
+        manager.client.listObjects.return_value = listing
+        manager.client.restoreObject.return_value = Mock(status=202)
+
+        checks = {"cold/a": 0, "cold/b": 0}
+
+        def get_metadata(bucket, key):
+            checks[key] += 1
+            if checks[key] == 1:
+                # Planning: no restore requested yet
+                return Mock(status=200, body=Mock(restore=None))
+            # cold/a restores on the first poll, cold/b on the third
+            done = checks[key] >= (2 if key == "cold/a" else 4)
+            value = 'ongoing-request="false"' if done else 'ongoing-request="true"'
+            return Mock(status=200, body=Mock(restore=value))
+
+        manager.client.getObjectMetadata.side_effect = get_metadata
+        downloaded = []
+        manager.client.getObject.side_effect = lambda bucket, key, **kwargs: downloaded.append(key) or Mock(status=200)
+
+        count = manager.restore_download_objects(
+            "bucket", "", str(tmp_path), workers=2, poll_interval=0.01, max_poll_interval=0.02, max_wait=5
+        )
+
+        assert count == 3
+        assert sorted(downloaded) == ["cold/a", "cold/b", "warm/c"]
+        assert downloaded.index("cold/a") < downloaded.index("cold/b")
+        assert manager.client.restoreObject.call_count == 2
+
+    def test_gives_up_after_max_wait(self, manager, tmp_path, capsys):
+        """Restores still pending at the deadline are reported and not downloaded"""
+        manager.client.listObjects.return_value = make_listing(["cold/a"], storage_class="COLD")
+        manager.client.restoreObject.return_value = Mock(status=202)
+        manager.client.getObjectMetadata.side_effect = [Mock(status=200, body=Mock(restore=None))] + [
+            Mock(status=200, body=Mock(restore='ongoing-request="true"'))
+        ] * 20
+
+        count = manager.restore_download_objects("bucket", "", str(tmp_path), poll_interval=0.01, max_wait=0.05)
+
+        assert count == 0
+        manager.client.getObject.assert_not_called()
+        assert "Restore not completed" in capsys.readouterr().out
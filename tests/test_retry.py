@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for request retries
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from retry import RetryPolicy, is_retryable, is_retryable_error
+from tests.conftest import make_listing
+from tests.test_export import paged_listing
+
+
+def policy(**kwargs):
+    """Retry policy that records its waits instead of sleeping"""
+    waits = []
+    return RetryPolicy(sleep=waits.append, **kwargs), waits
+
+
+class TestRetryPolicy:
+    """Test RetryPolicy"""
+
+    def test_retries_transient_responses(self):
+        """5xx and throttling responses are retried until one succeeds"""
+        retry, waits = policy()
+        request = Mock(side_effect=[Mock(status=503, errorCode="SlowDown"), Mock(status=500), Mock(status=200)])
+
+        assert retry.call("getObject", request, "bucket", "key").status == 200
+        assert request.call_count == 3
+        assert len(waits) == 2
+        request.assert_called_with("bucket", "key")
+
+    def test_client_errors_not_retried(self):
+        """A 404 is returned at once"""
+        retry, waits = policy()
+        request = Mock(return_value=Mock(status=404, errorCode="NoSuchKey"))
+
+        assert retry.call("getObject", request).status == 404
+        assert request.call_count == 1
+        assert waits == []
+
+    def test_last_response_returned_when_attempts_spent(self):
+        """Once the budget is spent the caller sees the failure as before"""
+        retry, waits = policy(max_attempts=3)
+        request = Mock(return_value=Mock(status=500, errorCode="InternalError"))
+
+        assert retry.call("setObjectMetadata", request).status == 500
+        assert request.call_count == 3
+
+    def test_connection_reset_retried_then_raised(self):
+        """Connection errors are retried and re-raised when the budget is spent"""
+        retry, _ = policy(max_attempts=2)
+        request = Mock(side_effect=ConnectionResetError("reset by peer"))
+
+        with pytest.raises(ConnectionResetError):
+            retry.call("restoreObject", request)
+        assert request.call_count == 2
+
+    def test_wrapped_session_errors_retried(self):
+        """Connection errors of the SDK's pooled sessions arrive wrapped in a plain Exception"""
+        retry, _ = policy()
+        wrapped = Exception(requests.exceptions.ConnectionError("Max retries exceeded"))
+        request = Mock(side_effect=[wrapped, Mock(status=200)])
+
+        assert retry.call("listObjects", request).status == 200
+        assert request.call_count == 2
+        assert not is_retryable_error(Exception("server is not set correctly"))
+
+    def test_other_errors_not_retried(self):
+        """Programming errors propagate at once"""
+        retry, _ = policy()
+        request = Mock(side_effect=ValueError("bad argument"))
+
+        with pytest.raises(ValueError):
+            retry.call("getObject", request)
+        assert request.call_count == 1
+
+    def test_backoff_capped_with_jitter(self):
+        """Waits are jittered below an exponential bound capped at max_delay"""
+        retry = RetryPolicy(base_delay=1, max_delay=5)
+        for attempt, bound in ((1, 1), (2, 2), (3, 4), (4, 5), (10, 5)):
+            waits = [retry.backoff(attempt) for _ in range(50)]
+            assert all(0 <= wait <= bound for wait in waits)
+            assert len(set(waits)) > 1
+
+    def test_elapsed_budget(self):
+        """No retry is attempted whose wait would exceed the time budget"""
+        retry, waits = policy(base_delay=10, max_delay=10, max_elapsed=0)
+        request = Mock(return_value=Mock(status=503, errorCode="SlowDown"))
+
+        assert retry.call("getObject", request).status == 503
+        assert request.call_count == 1
+        assert waits == []
+
+    def test_is_retryable(self):
+        """Retryable statuses and error codes"""
+        assert is_retryable(Mock(status=502, errorCode=None))
+        assert is_retryable(Mock(status=429, errorCode=None))
+        assert is_retryable(Mock(status=400, errorCode="RequestTimeout"))
+        assert not is_retryable(Mock(status=403, errorCode="AccessDenied"))
+
+
+class TestManagerRetries:
+    """Test retries in OBSManager"""
+
+    def test_listing_resumes_from_last_good_marker(self, manager):
+        """A failed page is requested again with the same marker"""
+        first, second = paged_listing([["a", "b"], ["c"]])
+        manager.client.listObjects.side_effect = [first, Mock(status=503, errorCode="SlowDown"), second]
+
+        keys = [content.key for content in manager._paginated_list_objects("bucket")]
+
+        assert keys == ["a", "b", "c"]
+        markers = [call.kwargs["marker"] for call in manager.client.listObjects.call_args_list]
+        assert markers == [None, "b", "b"]
+
+    def test_listing_raises_instead_of_partial_results(self, manager):
+        """A page that keeps failing ends the listing with an error naming the marker"""
+        first, _ = paged_listing([["a", "b"], ["c"]])
+        manager.retry.max_attempts = 2
+        manager.client.listObjects.side_effect = [first] + [Mock(status=500, errorCode="InternalError")] * 2
+
+        listing = manager._paginated_list_objects("bucket")
+        assert [next(listing).key, next(listing).key] == ["a", "b"]
+        with pytest.raises(RuntimeError, match="after marker 'b'"):
+            next(listing)
+
+    def test_transition_retried(self, manager):
+        """Per-object requests are retried before being counted as failures"""
+        manager.client.listObjects.return_value = make_listing(["a"], storage_class="STANDARD")
+        manager.client.setObjectMetadata.side_effect = [ConnectionResetError("reset"), Mock(status=200)]
+
+        assert manager.change_storage_class("bucket", "", "COLD") == 1
+        assert manager.client.setObjectMetadata.call_count == 2
+
+
+class TestSDKRetries:
+    """Test that SDK retries do not stack on the retry policy"""
+
+    def client_options(self, tmp_path, **values):
+        """Keyword arguments ObsClient is created with for the given config values"""
+        config_file = tmp_path / "obs_config.json"
+        config_file.write_text(
+            json.dumps(dict({"access_key_id": "k", "secret_access_key": "s", "server": "https://test.com"}, **values))
+        )
+        from obs_manager import OBSManager
+
+        with patch("obs_manager.ObsClient") as client_class:
+            OBSManager(str(config_file))
+        return client_class.call_args.kwargs
+
+    def test_sdk_retries_disabled_with_retry_policy(self, tmp_path):
+        """The retry policy is the only retry layer"""
+        assert self.client_options(tmp_path, sdk_max_retry_count=3)["max_retry_count"] == 0
+
+    def test_sdk_retries_kept_without_retry_policy(self, tmp_path):
+        """With retries disabled the SDK setting applies"""
+        assert self.client_options(tmp_path, retry_max_attempts=1, sdk_max_retry_count=3)["max_retry_count"] == 3
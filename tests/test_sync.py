@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental sync
+"""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+from manifest import SyncManifest
+from obs_metadata import file_md5, parse_last_modified
+from tests.conftest import make_listing
+
+LAST_MODIFIED = "2025/01/01 00:00:00"
+
+
+def fake_get_object(data=b"0123456789"):
+    """getObject side effect that writes ``data`` to the download path"""
+
+    def get_object(bucket, key, downloadPath=None, **kwargs):
+        with open(downloadPath, "wb") as f:
+            f.write(data)
+        return Mock(status=200)
+
+    return get_object
+
+
+class TestSyncManifest:
+    """Test the manifest file"""
+
+    def test_round_trip(self, tmp_path):
+        """Entries survive a save and reload"""
+        path = str(tmp_path / "manifest.json")
+        manifest = SyncManifest(path)
+        manifest.update("a", size=1, etag='"e"')
+        manifest.save()
+
+        assert SyncManifest(path).get("a") == {"size": 1, "etag": '"e"'}
+
+    def test_corrupt_manifest_starts_empty(self, tmp_path):
+        """An unreadable manifest is ignored"""
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json")
+
+        assert len(SyncManifest(str(path))) == 0
+
+    def test_saved_periodically(self, tmp_path):
+        """Updates reach the file every SAVE_INTERVAL entries, before save()"""
+        path = str(tmp_path / "manifest.json")
+        manifest = SyncManifest(path)
+        with patch("manifest.SAVE_INTERVAL", 2):
+            manifest.update("a", size=1)
+            assert not os.path.exists(path)
+            manifest.update("b", size=2)
+
+        assert len(SyncManifest(path)) == 2
+
+
+class TestSyncObjects:
+    """Test OBSManager.sync_objects"""
+
+    def test_second_run_skips_unchanged(self, manager, tmp_path):
+        """Objects already mirrored are not downloaded again"""
+        manager.client.listObjects.return_value = make_listing(["p/a.txt", "p/b.txt"])
+        manager.client.getObject.side_effect = fake_get_object()
+
+        assert manager.sync_objects("bucket", "p/", str(tmp_path)) == 2
+        local_mtime = os.stat(tmp_path / "p" / "a.txt").st_mtime
+        assert int(local_mtime) == int(parse_last_modified(LAST_MODIFIED))
+
+        manager.client.getObject.reset_mock()
+        assert manager.sync_objects("bucket", "p/", str(tmp_path)) == 0
+        manager.client.getObject.assert_not_called()
+
+    def test_changed_etag_downloads_again(self, manager, tmp_path):
+        """A changed ETag in the listing triggers a new download"""
+        manager.client.listObjects.return_value = make_listing(["a.txt"])
+        manager.client.getObject.side_effect = fake_get_object()
+        manager.sync_objects("bucket", "", str(tmp_path))
+
+        listing = make_listing(["a.txt"])
+        listing.body.contents[0].etag = '"changed"'
+        manager.client.listObjects.return_value = listing
+
+        assert manager.sync_objects("bucket", "", str(tmp_path)) == 1
+
+    def test_without_manifest_uses_size_and_mtime(self, manager, tmp_path):
+        """A file with matching size and mtime is unchanged even without a manifest"""
+        local_file = tmp_path / "a.txt"
+        local_file.write_bytes(b"0123456789")
+        remote_mtime = parse_last_modified(LAST_MODIFIED)
+        os.utime(local_file, (remote_mtime, remote_mtime))
+        manager.client.listObjects.return_value = make_listing(["a.txt"])
+
+        assert manager.sync_objects("bucket", "", str(tmp_path)) == 0
+        manager.client.getObject.assert_not_called()
+
+    def test_orphans_deleted_only_when_requested(self, manager, tmp_path):
+        """Local files missing from the bucket are kept unless delete_orphans is set"""
+        (tmp_path / "p").mkdir()
+        orphan = tmp_path / "p" / "gone.txt"
+        orphan.write_text("old")
+        outside = tmp_path / "other.txt"
+        outside.write_text("not synced")
+        manager.client.listObjects.return_value = make_listing([])
+
+        manager.sync_objects("bucket", "p/", str(tmp_path))
+        assert orphan.exists()
+
+        manager.sync_objects("bucket", "p/", str(tmp_path), delete_orphans=True)
+        assert not orphan.exists()
+        assert outside.exists()
+
+
+class TestBidirectionalSync:
+    """Test sync_objects in the upload and both directions"""
+
+    def put_file(self, etags):
+        """putFile side effect recording the ETag returned for each key"""
+
+        def put_file(bucket, key, file_path, headers=None):
+            etags[key] = f'"{key}-v{len(etags)}"'
+            return Mock(status=200, body=Mock(etag=etags[key]))
+
+        return put_file
+
+    def listing_for(self, etags):
+        """Listing of the uploaded keys with the ETags putFile returned"""
+        listing = make_listing(sorted(etags))
+        for content in listing.body.contents:
+            content.etag = etags[content.key]
+        return listing
+
+    def test_upload_only_transfers_difference(self, manager, tmp_path):
+        """New files are uploaded once; unchanged files are neither uploaded nor rehashed"""
+        (tmp_path / "p").mkdir()
+        (tmp_path / "p" / "a.txt").write_text("one")
+        (tmp_path / "p" / "b.txt").write_text("two")
+        etags = {}
+        manager.client.putFile.side_effect = self.put_file(etags)
+        manager.client.listObjects.return_value = make_listing([])
+
+        assert manager.sync_objects("bucket", "p/", str(tmp_path), direction="upload") == 2
+
+        manager.client.listObjects.return_value = self.listing_for(etags)
+        manager.client.putFile.reset_mock()
+        with patch("obs_manager.file_md5", wraps=file_md5) as md5:
+            assert manager.sync_objects("bucket", "p/", str(tmp_path), direction="upload") == 0
+        manager.client.putFile.assert_not_called()
+        md5.assert_not_called()
+
+    def test_touched_identical_file_not_uploaded(self, manager, tmp_path):
+        """A file whose mtime changed but content did not is only rehashed"""
+        (tmp_path / "a.txt").write_text("same")
+        etags = {}
+        manager.client.putFile.side_effect = self.put_file(etags)
+        manager.client.listObjects.return_value = make_listing([])
+        manager.sync_objects("bucket", "", str(tmp_path), direction="upload")
+
+        os.utime(tmp_path / "a.txt", (time.time() + 100, time.time() + 100))
+        manager.client.listObjects.return_value = self.listing_for(etags)
+        manager.client.putFile.reset_mock()
+
+        assert manager.sync_objects("bucket", "", str(tmp_path), direction="both") == 0
+        manager.client.putFile.assert_not_called()
+
+    def test_both_directions(self, manager, tmp_path):
+        """Local edits go up and remote edits come down"""
+        (tmp_path / "local.txt").write_text("v1")
+        (tmp_path / "remote.txt").write_text("v1")
+        etags = {}
+        manager.client.putFile.side_effect = self.put_file(etags)
+        manager.client.listObjects.return_value = make_listing([])
+        manager.sync_objects("bucket", "", str(tmp_path), direction="both")
+
+        (tmp_path / "local.txt").write_text("v2 local")
+        listing = self.listing_for(etags)
+        listing.body.contents[1].etag = '"changed-remotely"'
+        manager.client.listObjects.return_value = listing
+        manager.client.getObject.side_effect = fake_get_object()
+        manager.client.putFile.reset_mock()
+
+        assert manager.sync_objects("bucket", "", str(tmp_path), direction="both") == 2
+        assert [call.args[1] for call in manager.client.putFile.call_args_list] == ["local.txt"]
+        assert manager.client.getObject.call_args.args[1] == "remote.txt"
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent storage class transitions
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from concurrency import RateLimiter, bucket_rate_limiter
+from tests.conftest import make_listing
+
+
+class TestRateLimiter:
+    """Test the token bucket rate limiter"""
+
+    def test_limits_rate(self):
+        """Requests beyond the burst are spaced at the configured rate"""
+        limiter = RateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+
+    def test_invalid_rate(self):
+        """A non-positive rate is rejected"""
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+    def test_shared_per_bucket(self):
+        """Operations on the same bucket share one limiter"""
+        assert bucket_rate_limiter("bucket", 10) is bucket_rate_limiter("bucket", 10)
+        assert bucket_rate_limiter("bucket", 10) is not bucket_rate_limiter("other", 10)
+        assert bucket_rate_limiter("bucket", 0) is None
+
+
+class TestChangeStorageClass:
+    """Test transitions in both managers"""
+
+    def test_obs_manager_concurrent_transition(self, manager):
+        """Every object gets a setObjectMetadata request with the target class"""
+        manager.client.listObjects.return_value = make_listing([f"log{i}" for i in range(20)])
+        manager.client.setObjectMetadata.return_value = Mock(status=200)
+
+        count = manager.change_storage_class("bucket", "", "COLD", workers=5)
+
+        assert count == 20
+        assert manager.client.setObjectMetadata.call_count == 20
+        headers = manager.client.setObjectMetadata.call_args.kwargs["headers"]
+        assert headers["storageClass"] == "COLD"
+
+    def test_obs_manager_counts_failures(self, manager):
+        """Failed requests are still counted as processed"""
+        manager.client.listObjects.return_value = make_listing(["a", "b"])
+        manager.client.setObjectMetadata.side_effect = [Mock(status=200), Exception("reset")]
+
+        assert manager.change_storage_class("bucket", "", "WARM", workers=2) == 2
+
+    def test_secure_manager_skips_target_class(self, secure_manager):
+        """Objects already in the target class are not copied"""
+        listing = make_listing(["a", "b", "c"])
+        listing.body.contents[1].storageClass = "COLD"
+        listing.body.isTruncated = False
+        secure_manager.obs_client.listObjects.return_value = listing
+        secure_manager.obs_client.copyObject.return_value = Mock(status=200)
+
+        count = secure_manager.change_storage_class("bucket", "", "COLD", workers=3, rate_limit=1000)
+
+        assert count == 2
+        assert secure_manager.obs_client.copyObject.call_count == 2
+        headers = secure_manager.obs_client.copyObject.call_args.kwargs["headers"]
+        assert headers["storageClass"] == "COLD"
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the upload engine
+"""
+
+import base64
+import hashlib
+from unittest.mock import Mock
+
+
+def write_tree(root, files):
+    """Create files (relative path -> bytes) under ``root``"""
+    for relative, data in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+class TestUploadObjects:
+    """Test OBSManager.upload_objects"""
+
+    def test_small_files_with_checksums(self, manager, tmp_path):
+        """Small files are uploaded with putFile under the prefix with a Content-MD5 header"""
+        write_tree(tmp_path, {"a.txt": b"hello", "sub/b.txt": b"world", ".obs_manifest.json": b"{}"})
+        manager.client.putFile.return_value = Mock(status=200, body=Mock(etag=None))
+
+        assert manager.upload_objects(str(tmp_path), "bucket", "backup/", workers=2) == 2
+
+        calls = {call.args[1]: call for call in manager.client.putFile.call_args_list}
+        assert set(calls) == {"backup/a.txt", "backup/sub/b.txt"}
+        expected = base64.b64encode(hashlib.md5(b"hello").digest()).decode()
+        assert calls["backup/a.txt"].kwargs["headers"].md5 == expected
+
+    def test_etag_mismatch_fails(self, manager, tmp_path, capsys):
+        """An ETag that does not match the local MD5 is reported as a failure"""
+        write_tree(tmp_path, {"a.txt": b"hello"})
+        manager.client.putFile.return_value = Mock(status=200, body=Mock(etag='"' + "0" * 32 + '"'))
+
+        manager.upload_objects(str(tmp_path), "bucket")
+
+        assert "✗ Failed" in capsys.readouterr().out
+
+    def test_large_file_multipart(self, manager, tmp_path):
+        """Large files are split into concurrently uploaded parts and completed in order"""
+        write_tree(tmp_path, {"big.bin": b"x" * 1000})
+        manager.config.config.update(multipart_upload_threshold=100, upload_part_size=300)
+        manager.client.initiateMultipartUpload.return_value = Mock(status=200, body=Mock(uploadId="u1"))
+        manager.client.uploadPart.side_effect = lambda bucket, key, number, upload_id, **kwargs: Mock(
+            status=200, body=Mock(etag=f"etag{number}")
+        )
+        manager.client.completeMultipartUpload.return_value = Mock(status=200)
+
+        assert manager.upload_objects(str(tmp_path), "bucket", part_workers=3) == 1
+
+        sizes = sorted(
+            (call.args[2], call.kwargs["offset"], call.kwargs["partSize"]) for call in manager.client.uploadPart.call_args_list
+        )
+        assert sizes == [(1, 0, 300), (2, 300, 300), (3, 600, 300), (4, 900, 100)]
+        assert all(call.kwargs["isAttachMd5"] for call in manager.client.uploadPart.call_args_list)
+        request = manager.client.completeMultipartUpload.call_args.args[3]
+        assert [part.etag for part in request.parts] == ["etag1", "etag2", "etag3", "etag4"]
+        manager.client.abortMultipartUpload.assert_not_called()
+
+    def test_failed_part_aborts_upload(self, manager, tmp_path):
+        """A failed part aborts the multipart upload instead of completing it"""
+        write_tree(tmp_path, {"big.bin": b"x" * 1000})
+        manager.config.config.update(multipart_upload_threshold=100, upload_part_size=300)
+        manager.client.initiateMultipartUpload.return_value = Mock(status=200, body=Mock(uploadId="u1"))
+        manager.client.uploadPart.side_effect = lambda bucket, key, number, upload_id, **kwargs: Mock(
+            status=500 if number == 2 else 200, body=Mock(etag="e"), errorCode="InternalError", errorMessage="boom"
+        )
+
+        manager.upload_objects(str(tmp_path), "bucket")
+
+        manager.client.completeMultipartUpload.assert_not_called()
+        manager.client.abortMultipartUpload.assert_called_once_with("bucket", "big.bin", "u1")